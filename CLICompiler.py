@@ -1,21 +1,36 @@
-import sys
+import argparse
 
 from parsing.Parser import parse_script
-from parsing.Tokenizer import Tokenizer
+from parsing.Tokenizer import StreamTokenizer
 from backend.wasm.WASMCompiler import compile_script as compile_to_wasm, emit_module_code
 from compilation.IRCompiler import compile_script as compile_to_ir
+from compilation.Memoization import memoize_pure_functions
+from compilation.Optimizer import DEFAULT_PASSES, optimize_script
+from compilation.ShortCircuit import lower_short_circuit
 
 
 def main():
-    source_path = sys.argv[1]
-    target_path = sys.argv[2]
+    arguments_parser = argparse.ArgumentParser()
+    arguments_parser.add_argument("-O", dest="optimize", action="store_true")
+    arguments_parser.add_argument("--short-circuit", dest="short_circuit", action="store_true")
+    arguments_parser.add_argument("--memoize", dest="memoize", action="store_true")
+    arguments_parser.add_argument("source_path")
+    arguments_parser.add_argument("target_path")
+    arguments = arguments_parser.parse_args()
 
-    with open(source_path) as source_file:
-        source_text = source_file.read()
-        tokenizer = Tokenizer(source_text)
+    with open(arguments.source_path) as source_file:
+        tokenizer = StreamTokenizer(source_file)
         tokenizer.advance()
-        compiled = emit_module_code(compile_to_wasm(compile_to_ir(parse_script(tokenizer))))
-        with open(target_path, "w") as target_file:
+        passes = []
+        if arguments.short_circuit:
+            passes.append(lower_short_circuit)
+        if arguments.optimize:
+            passes.extend(DEFAULT_PASSES)
+        if arguments.memoize:
+            passes.append(memoize_pure_functions)
+        script_ir = optimize_script(compile_to_ir(parse_script(tokenizer)), passes)
+        compiled = emit_module_code(compile_to_wasm(script_ir))
+        with open(arguments.target_path, "w") as target_file:
             target_file.write(compiled)
 
 
@@ -1,4 +1,5 @@
 from compilation.IRNodes import *
+from compilation.IRTraversal import block_completes_normally, local_declarations
 
 from backend.jvm.bytecodewriter.bytecompiler import ClassFile, CodeAttribute
 from backend.jvm.bytecodewriter.byteassembler import assemble
@@ -29,6 +30,10 @@ def get_field_name(index):
     return "f%s" % index
 
 
+def _get_table_field_name(index):
+    return "t%s" % index
+
+
 def _get_method_name(index):
     return "m%s" % index
 
@@ -39,6 +44,8 @@ class Compiler:
         self._class_name = class_name
         self._clazz = ClassFile(class_name)
         self._subroutine_parameters_count = 0
+        self._loop_labels = dict()
+        self._block_labels = dict()
 
     def gen_label(self):
         self._label_counter += 1
@@ -46,8 +53,9 @@ class Compiler:
 
     def compile(self, script: ScriptIR):
         self._compile_global_variables(script.global_variables_count)
+        self._compile_tables(script.tables)
         self._compile_subroutines(script.subroutines)
-        self._compile_script_statements(script.statements)
+        self._compile_script_statements(script.statements, self._compile_tables_allocation(script.tables))
 
         return self._clazz
 
@@ -55,6 +63,27 @@ class Compiler:
         for var_index in range(global_variables_count):
             self._clazz.field(get_field_name(var_index), "I", ["private", "static"])
 
+    def _compile_tables(self, tables):
+        for table in tables:
+            self._clazz.field(_get_table_field_name(table.index), "[I", ["private", "static"])
+
+    def _compile_table_ref(self, table: TableDeclarationIR):
+        class_ref = self._clazz.qpool("class", self._class_name)
+        return self._clazz.qpool("field", class_ref, _get_table_field_name(table.index), "[I")
+
+    def _compile_tables_allocation(self, tables):
+        return list(itertools.chain.from_iterable(
+            [self._compile_integer(IntegerIR(table.size)) +
+             ["newarray int", "putstatic %d" % self._compile_table_ref(table)] for table in tables]))
+
+    def _compile_table_load(self, expr: TableLoadIR):
+        return ["getstatic %d" % self._compile_table_ref(expr.table)] + self._compile_expr(expr.position) + \
+               ["iaload"]
+
+    def _compile_table_store_statement(self, statement: TableStoreStatementIR):
+        return ["getstatic %d" % self._compile_table_ref(statement.table)] + \
+               self._compile_expr(statement.position) + self._compile_expr(statement.value) + ["iastore"]
+
     def _compile_integer(self, expr: IntegerIR):
         match expr.val:
             case -1:
@@ -99,6 +128,8 @@ class Compiler:
                 return ["ior"]
             case BinaryOperatorKind.AND:
                 return ["iand"]
+            case BinaryOperatorKind.SHL:
+                return ["ishl"]
             case _:
                 l1 = self.gen_label()
                 l2 = self.gen_label()
@@ -117,8 +148,12 @@ class Compiler:
                 return self._compile_binary_operation(expr)
             case UnaryOperationIR():
                 return self._compile_unary_operation(expr)
+            case ConditionalIR():
+                return self._compile_conditional(expr)
             case CallIR():
                 return self._compile_call(expr)
+            case TableLoadIR():
+                return self._compile_table_load(expr)
             case VariableReferenceIR():
                 return self._compile_variable_read(expr.declaration)
             case _:
@@ -131,6 +166,12 @@ class Compiler:
     def _compile_unary_operation(self, expr: UnaryOperationIR):
         return self._compile_expr(expr.operand) + self._compile_unary_operator(expr.kind)
 
+    def _compile_conditional(self, expr: ConditionalIR):
+        l1 = self.gen_label()
+        l2 = self.gen_label()
+        return self._compile_expr(expr.condition) + ["ifeq %s" % l1] + self._compile_expr(expr.then_value) + \
+               ["goto %s" % l2, "%s:" % l1] + self._compile_expr(expr.else_value) + ["%s:" % l2]
+
     def _compile_call(self, call: CallIR):
         arguments = list(itertools.chain.from_iterable([self._compile_expr(arg) for arg in call.args]))
         class_ref = self._clazz.qpool("class", self._class_name)
@@ -174,9 +215,27 @@ class Compiler:
             return expr + ["ifeq %s" % l] + then_stmts + ["%s:" % l]
         else_stmts = self._compile_statements(statement.else_block)
         l1 = self.gen_label()
+        if not block_completes_normally(statement.then_block):
+            return expr + ["ifeq %s" % l1] + then_stmts + ["%s:" % l1] + else_stmts
         l2 = self.gen_label()
         return expr + ["ifeq %s" % l1] + then_stmts + ["goto %s" % l2] + ["%s:" % l1] + else_stmts + ["%s:" % l2]
 
+    def _compile_loop_statement(self, statement: LoopStatementIR):
+        label = self.gen_label()
+        self._loop_labels[statement.index] = label
+        return ["%s:" % label] + self._compile_statements(statement.body)
+
+    def _compile_continue_statement(self, statement: ContinueStatementIR):
+        return ["goto %s" % self._loop_labels[statement.loop.index]]
+
+    def _compile_block_statement(self, statement: BlockStatementIR):
+        label = self.gen_label()
+        self._block_labels[statement.index] = label
+        return self._compile_statements(statement.body) + ["%s:" % label]
+
+    def _compile_break_statement(self, statement: BreakStatementIR):
+        return ["goto %s" % self._block_labels[statement.block.index]]
+
     def _compile_var_assign(self, var, value):
         rvalue = self._compile_expr(value)
         match var:
@@ -211,12 +270,22 @@ class Compiler:
         match statement:
             case IfStatementIR():
                 return self._compile_if_statement(statement)
+            case LoopStatementIR():
+                return self._compile_loop_statement(statement)
+            case ContinueStatementIR():
+                return self._compile_continue_statement(statement)
+            case BlockStatementIR():
+                return self._compile_block_statement(statement)
+            case BreakStatementIR():
+                return self._compile_break_statement(statement)
             case AssignStatementIR():
                 return self._compile_assign_statement(statement)
             case ReturnStatementIR():
                 return self._compile_return_statement(statement)
             case CallStatementIR():
                 return self._compile_call_statement(statement)
+            case TableStoreStatementIR():
+                return self._compile_table_store_statement(statement)
             case GlobalVariableDeclarationIR():
                 return self._compile_global_var_init(statement)
             case LocalVariableDeclarationIR():
@@ -228,21 +297,25 @@ class Compiler:
         return list(
             itertools.chain.from_iterable([self._compile_statement(statement) for statement in statements]))
 
+    def _max_locals(self, statements):
+        return max([self._subroutine_parameters_count] +
+                   [self._subroutine_parameters_count + local.index + 1 for local in local_declarations(statements)])
+
     def _compile_subroutine(self, subroutine: SubroutineDeclarationIR):
         self._subroutine_parameters_count = len(subroutine.parameters)
         code = self._compile_statements(subroutine.statements)
         if subroutine.subroutine_kind == SubroutineKind.PROCEDURE:
             code.append("return")
-        while ":" in code[len(code) - 1]:
-            code.pop()
         self._clazz.method("m%d" % subroutine.index, _create_method_descriptor(subroutine), ["private", "static"],
-                           [CodeAttribute(assemble("\n".join(code)))])
+                           [CodeAttribute(assemble("\n".join(code)),
+                                          max_locals=self._max_locals(subroutine.statements))])
 
     def _compile_subroutines(self, subroutines: list):
         for subroutine in subroutines:
             self._compile_subroutine(subroutine)
 
-    def _compile_script_statements(self, statements):
+    def _compile_script_statements(self, statements, prologue):
         self._subroutine_parameters_count = 0
-        code = self._compile_statements(statements)
-        self._clazz.method("main", "()I", ["public", "static"], [CodeAttribute(assemble("\n".join(code)))])
+        code = prologue + self._compile_statements(statements)
+        self._clazz.method("main", "()I", ["public", "static"],
+                           [CodeAttribute(assemble("\n".join(code)), max_locals=self._max_locals(statements))])
@@ -104,7 +104,7 @@ class CodeAttribute(Attribute):
     def _data(self):
         d = b""
         d += self.max_stack.to_bytes(2, "big")
-        d += self.max_stack.to_bytes(2, "big")
+        d += self.max_locals.to_bytes(2, "big")
         d += len(self.code).to_bytes(4, "big")
         d += self.code
         d += len(self.exceptions).to_bytes(2, "big")
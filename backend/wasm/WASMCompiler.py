@@ -1,13 +1,30 @@
 import backend.wasm.WasmNodes
 from compilation.IRNodes import *
+from compilation.IRTraversal import local_declarations
 from backend.wasm.WasmNodes import *
 
+_I32_SIZE = 4
+_PAGE_SIZE = 65536
+
 
 def compile_global_variables_declaration(global_variables_count: int):
     return [GlobalI32(_get_global_var_name(index), is_mutable=True, init_val=I32Const(0)) for index in
             range(global_variables_count)]
 
 
+def compile_tables_declaration(tables: list):
+    declarations = []
+    offset = 0
+    for table in tables:
+        declarations.append(GlobalI32(_get_table_name(table.index), is_mutable=False, init_val=I32Const(offset)))
+        offset += table.size * _I32_SIZE
+    return declarations
+
+
+def _get_memory_pages(tables: list):
+    return -(-sum(table.size for table in tables) * _I32_SIZE // _PAGE_SIZE)
+
+
 def _get_global_var_name(index: int):
     return "global_%d" % index
 
@@ -24,8 +41,20 @@ def _get_func_name(index: int):
     return "func_%d" % index
 
 
+def _get_loop_label(index: int):
+    return "loop_%d" % index
+
+
+def _get_block_label(index: int):
+    return "block_%d" % index
+
+
+def _get_table_name(index: int):
+    return "table_%d" % index
+
+
 def compile_script_statements(statements: list):
-    return Function("main", [], False, WasmType.I32, [],
+    return Function("main", [], False, WasmType.I32, compile_local_variables_declaration(statements),
                     compile_statements(statements) + [_create_explicit_stub_return()])
 
 
@@ -42,6 +71,22 @@ def compile_if_statement(statement: IfStatementIR):
               [] if statement.else_block is None else compile_statements(statement.else_block))
 
 
+def compile_loop_statement(statement: LoopStatementIR):
+    return Loop(_get_loop_label(statement.index), compile_statements(statement.body))
+
+
+def compile_continue_statement(statement: ContinueStatementIR):
+    return Br(_get_loop_label(statement.loop.index))
+
+
+def compile_block_statement(statement: BlockStatementIR):
+    return Block(_get_block_label(statement.index), compile_statements(statement.body))
+
+
+def compile_break_statement(statement: BreakStatementIR):
+    return Br(_get_block_label(statement.block.index))
+
+
 def _get_wasm_variable_name(variable_decl):
     match variable_decl:
         case GlobalVariableDeclarationIR():
@@ -95,6 +140,8 @@ def _to_wasm_binary_operator(kind: BinaryOperatorKind):
             return WasmBinaryOperationKind.I32_OR
         case BinaryOperatorKind.AND:
             return WasmBinaryOperationKind.I32_AND
+        case BinaryOperatorKind.SHL:
+            return WasmBinaryOperationKind.I32_SHL
 
 
 def compile_binary_operation(expr: BinaryOperationIR):
@@ -113,11 +160,31 @@ def compile_unary_operation(expr: UnaryOperationIR):
             raise ValueError(expr)
 
 
+def compile_conditional(expr: ConditionalIR):
+    return If(compile_expr(expr.condition), [compile_expr(expr.then_value)], [compile_expr(expr.else_value)],
+              WasmType.I32)
+
+
 def compile_call(expr: CallIR):
     return backend.wasm.WasmNodes.Call(_get_func_name(expr.subroutine.declaration.index),
                                        [compile_expr(arg) for arg in expr.args])
 
 
+def _compile_table_address(table: TableDeclarationIR, position):
+    return WasmBinaryOperation(GetGlobal(_get_table_name(table.index)),
+                               WasmBinaryOperation(compile_expr(position), I32Const(_I32_SIZE),
+                                                   WasmBinaryOperationKind.I32_MUL),
+                               WasmBinaryOperationKind.I32_ADD)
+
+
+def compile_table_load(expr: TableLoadIR):
+    return Load(_compile_table_address(expr.table, expr.position))
+
+
+def compile_table_store_statement(statement: TableStoreStatementIR):
+    return Store(_compile_table_address(statement.table, statement.position), compile_expr(statement.value))
+
+
 def compile_variable_read(variable_decl):
     match variable_decl:
         case GlobalVariableDeclarationIR():
@@ -138,8 +205,12 @@ def compile_expr(expr):
             return compile_binary_operation(expr)
         case UnaryOperationIR():
             return compile_unary_operation(expr)
+        case ConditionalIR():
+            return compile_conditional(expr)
         case CallIR():
             return compile_call(expr)
+        case TableLoadIR():
+            return compile_table_load(expr)
         case VariableReferenceIR():
             return compile_variable_read(expr.declaration)
         case _:
@@ -168,12 +239,22 @@ def compile_statement(statement):
     match statement:
         case IfStatementIR():
             return compile_if_statement(statement)
+        case LoopStatementIR():
+            return compile_loop_statement(statement)
+        case ContinueStatementIR():
+            return compile_continue_statement(statement)
+        case BlockStatementIR():
+            return compile_block_statement(statement)
+        case BreakStatementIR():
+            return compile_break_statement(statement)
         case AssignStatementIR():
             return compile_assign_statement(statement)
         case ReturnStatementIR():
             return compile_return_statement(statement)
         case CallStatementIR():
             return compile_call_statement(statement)
+        case TableStoreStatementIR():
+            return compile_table_store_statement(statement)
         case GlobalVariableDeclarationIR():
             return compile_global_var_init(statement)
         case LocalVariableDeclarationIR():
@@ -186,8 +267,9 @@ def compile_statements(statements: list):
     return [compile_statement(statement) for statement in statements]
 
 
-def compile_local_variables_declaration(local_variables_count):
-    return [Local(_get_local_var_name(index), WasmType.I32) for index in range(local_variables_count)]
+def compile_local_variables_declaration(statements: list):
+    indices = sorted({local.index for local in local_declarations(statements)})
+    return [Local(_get_local_var_name(index), WasmType.I32) for index in indices]
 
 
 def compile_subroutine(subroutine: SubroutineDeclarationIR):
@@ -199,7 +281,7 @@ def compile_subroutine(subroutine: SubroutineDeclarationIR):
         return_type = None
     return Function(_get_func_name(subroutine.index), compile_parameters(subroutine.parameters),
                     is_void, return_type,
-                    compile_local_variables_declaration(subroutine.local_variables_count),
+                    compile_local_variables_declaration(subroutine.statements),
                     compile_statements(subroutine.statements) + [_create_explicit_stub_return()])
 
 
@@ -212,9 +294,10 @@ def _create_main_export():
 
 
 def compile_script(script: ScriptIR):
-    return Module(compile_global_variables_declaration(script.global_variables_count),
+    return Module(compile_global_variables_declaration(script.global_variables_count) +
+                  compile_tables_declaration(script.tables),
                   compile_subroutines(script.subroutines) + [compile_script_statements(script.statements)],
-                  [_create_main_export()])
+                  [_create_main_export()], _get_memory_pages(script.tables))
 
 
 def stringify_type(wasm_type: WasmType):
@@ -254,10 +337,23 @@ def stringify_function_header(function: Function):
 def stringify_if(instruction: If):
     cond_instructions = stringify_instruction(instruction.condition)
     then_instructions = stringify_instructions(instruction.then_instructions)
+    if_instruction = "if" if instruction.result_type is None else "if (result %s)" % instruction.result_type.value
     if instruction.else_instructions is None:
-        return cond_instructions + ["if"] + then_instructions + ["end"]
+        return cond_instructions + [if_instruction] + then_instructions + ["end"]
     else_instructions = stringify_instructions(instruction.else_instructions)
-    return cond_instructions + ["if"] + then_instructions + ["else"] + else_instructions + ["end"]
+    return cond_instructions + [if_instruction] + then_instructions + ["else"] + else_instructions + ["end"]
+
+
+def stringify_loop(instruction: Loop):
+    return ["loop $%s" % instruction.label] + stringify_instructions(instruction.instructions) + ["end"]
+
+
+def stringify_block(instruction: Block):
+    return ["block $%s" % instruction.label] + stringify_instructions(instruction.instructions) + ["end"]
+
+
+def stringify_br(instruction: Br):
+    return ["br $%s" % instruction.label]
 
 
 def stringify_binary_operation(instruction: WasmBinaryOperation):
@@ -273,7 +369,17 @@ def stringify_call(instruction: Call):
     return arg_instructions + ["call $%s" % instruction.name]
 
 
+def stringify_load(instruction: Load):
+    return stringify_instruction(instruction.address) + ["i32.load"]
+
+
+def stringify_store(instruction: Store):
+    return stringify_instruction(instruction.address) + stringify_instruction(instruction.value) + ["i32.store"]
+
+
 def stringify_return(instruction: Return):
+    if instruction.value is None:
+        return ["return"]
     return stringify_instruction(instruction.value) + ["return"]
 
 
@@ -306,10 +412,20 @@ def stringify_instruction(instruction):
             return [stringify_i32_const(instruction)]
         case If():
             return stringify_if(instruction)
+        case Loop():
+            return stringify_loop(instruction)
+        case Block():
+            return stringify_block(instruction)
+        case Br():
+            return stringify_br(instruction)
         case WasmBinaryOperation():
             return stringify_binary_operation(instruction)
         case Call():
             return stringify_call(instruction)
+        case Load():
+            return stringify_load(instruction)
+        case Store():
+            return stringify_store(instruction)
         case Return():
             return stringify_return(instruction)
         case SetLocal():
@@ -335,6 +451,8 @@ def stringify_function(function: Function):
 
 def emit_module_code(module: Module):
     lines = ["(module"]
+    if module.memory_pages > 0:
+        lines.append("\t(memory %d)" % module.memory_pages)
     for global_var in module.globals:
         lines.append("\t" + stringify_global(global_var))
     for function in module.functions:
@@ -2,10 +2,11 @@ from enum import Enum
 
 
 class Module:
-    def __init__(self, global_variables: list, functions: list, exports: list):
+    def __init__(self, global_variables: list, functions: list, exports: list, memory_pages: int = 0):
         self.globals = global_variables
         self.functions = functions
         self.exports = exports
+        self.memory_pages = memory_pages
 
 
 class WasmType(Enum):
@@ -41,6 +42,7 @@ class WasmBinaryOperationKind(Enum):
     I32_LT_S = "i32.lt_s"
     I32_OR = "i32.or"
     I32_AND = "i32.and"
+    I32_SHL = "i32.shl"
 
 
 class Function:
@@ -71,10 +73,28 @@ class Export:
 
 
 class If:
-    def __init__(self, condition, then_statements: list, else_statements: list):
+    def __init__(self, condition, then_statements: list, else_statements: list, result_type: WasmType = None):
         self.condition = condition
         self.then_instructions = then_statements
         self.else_instructions = else_statements
+        self.result_type = result_type
+
+
+class Loop:
+    def __init__(self, label: str, instructions: list):
+        self.label = label
+        self.instructions = instructions
+
+
+class Block:
+    def __init__(self, label: str, instructions: list):
+        self.label = label
+        self.instructions = instructions
+
+
+class Br:
+    def __init__(self, label: str):
+        self.label = label
 
 
 class WasmBinaryOperation:
@@ -90,6 +110,17 @@ class Call:
         self.arguments = arguments
 
 
+class Load:
+    def __init__(self, address):
+        self.address = address
+
+
+class Store:
+    def __init__(self, address, value):
+        self.address = address
+        self.value = value
+
+
 class Return:
     def __init__(self, value):
         self.value = value
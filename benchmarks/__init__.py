@@ -0,0 +1,53 @@
+import timeit
+
+import wasmtime
+
+from backend.wasm.WASMCompiler import compile_script as compile_to_wasm, emit_module_code
+from compilation.IRCompiler import compile_script as compile_to_ir
+from compilation.Optimizer import optimize_script
+from parsing.Parser import parse_script
+from parsing.Tokenizer import Tokenizer
+
+REPEATS = 5
+
+
+def compile_ir(text, passes):
+    tokenizer = Tokenizer(text)
+    tokenizer.advance()
+    return optimize_script(compile_to_ir(parse_script(tokenizer)), passes)
+
+
+def instantiate(text, passes):
+    engine = wasmtime.Engine()
+    store = wasmtime.Store(engine)
+    module_code = emit_module_code(compile_to_wasm(compile_ir(text, passes)))
+    instance = wasmtime.Instance(store, wasmtime.Module(engine, module_code), [])
+    main_function = instance.exports(store)["main"]
+    return lambda: main_function(store)
+
+
+def measure(run, repeats=REPEATS):
+    return min(timeit.repeat(run, number=1, repeat=repeats)) * 1000
+
+
+def print_modes(text, modes, repeats=REPEATS):
+    print("%12s %10s %12s" % ("mode", "time, ms", "result"))
+    for name, passes in modes:
+        run = instantiate(text, passes)
+        print("%12s %10.2f %12d" % (name, measure(run, repeats), run()))
+
+
+def print_sizes(size_name, sizes, text_for_size, modes, repeats=REPEATS, fresh_instances=False):
+    print("%8s" % size_name + "".join(" %12s" % ("%s, ms" % name) for name, _ in modes))
+    for size in sizes:
+        timings = []
+        for _, passes in modes:
+            try:
+                if fresh_instances:
+                    elapsed = min(measure(instantiate(text_for_size(size), passes), 1) for _ in range(repeats))
+                else:
+                    elapsed = measure(instantiate(text_for_size(size), passes), repeats)
+                timings.append("%.3f" % elapsed)
+            except wasmtime.Trap:
+                timings.append("overflow")
+        print("%8d" % size + "".join(" %12s" % timing for timing in timings))
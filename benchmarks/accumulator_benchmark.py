@@ -0,0 +1,27 @@
+from benchmarks import print_sizes
+from compilation.AccumulatorTransformation import introduce_accumulators
+
+SOURCE = """function sum(n) {
+    if n <= 0 {
+        return 0;
+    }
+    return n + sum(n - 1);
+}
+function power(n) {
+    if n == 0 {
+        return 1;
+    }
+    return 3 * power(n - 1);
+}
+return sum(%d) + power(%d);
+"""
+DEPTHS = [1000, 10000, 1000000]
+MODES = [("calls", []), ("loop", [introduce_accumulators])]
+
+
+def main():
+    print_sizes("depth", DEPTHS, lambda depth: SOURCE % (depth, depth), MODES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from benchmarks import print_modes
+from compilation.AlgebraicSimplification import simplify_algebraically
+from compilation.ConstantFolding import fold_constants
+from compilation.TailCallElimination import eliminate_tail_calls
+
+SOURCE = """function count(i, acc) {
+    if !(i > 0) {
+        return acc;
+    }
+    if !(i < 100 | acc > 50000) & (!(i == acc)) {
+        return count(i - 1 + 0, acc + -(-1) * 1);
+    }
+    return count(i - 1, acc - (i - i) + 2);
+}
+return count(%d, 0);
+"""
+ITERATIONS = 10000000
+MODES = [("folded", [fold_constants, eliminate_tail_calls]),
+         ("simplified", [fold_constants, simplify_algebraically, eliminate_tail_calls])]
+
+
+def main():
+    print_modes(SOURCE % ITERATIONS, MODES)
+
+
+if __name__ == "__main__":
+    main()
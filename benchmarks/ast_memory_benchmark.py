@@ -0,0 +1,26 @@
+import gc
+import tracemalloc
+
+from benchmarks.lazy_parsing_benchmark import SNIPPET
+from parsing.Parser import parse_script
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
+
+FUNCTIONS_COUNT = 20000
+
+
+def main():
+    text = "".join(SNIPPET % (index, index, max(index - 1, 0)) for index in range(FUNCTIONS_COUNT))
+    buffer = tokenize(text)
+    gc.collect()
+    tracemalloc.start()
+    tokenizer = BufferedTokenizer(buffer)
+    tokenizer.advance()
+    script = parse_script(tokenizer)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("source: %.1f MiB, resident AST: %.1f MiB (%d top-level elements)"
+          % (len(text) / 2 ** 20, size / 2 ** 20, len(script.body)))
+
+
+if __name__ == "__main__":
+    main()
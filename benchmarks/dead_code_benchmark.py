@@ -0,0 +1,46 @@
+from backend.jvm.JVMCompiler import Compiler as JvmCompiler
+from backend.wasm.WASMCompiler import compile_script as compile_to_wasm, emit_module_code
+from benchmarks import compile_ir, instantiate, measure
+from compilation.ConstantFolding import fold_constants
+from compilation.DeadCodeElimination import eliminate_dead_code
+from compilation.TailCallElimination import eliminate_tail_calls
+
+SOURCE = """var debug = 0;
+var trace = 0;
+function step(i, acc) {
+    if i <= 0 {
+        return acc;
+    }
+    if debug == 1 {
+        acc = acc + i * i * i - i * i + 17;
+        if trace == 1 {
+            return step(i - 2, acc * 3);
+        }
+    } else {
+        acc = acc + i;
+    }
+    if trace > 0 & debug > 0 {
+        return acc * 31 - i;
+    }
+    return step(i - 1, acc);
+    acc = 0;
+}
+return step(%d, 0);
+"""
+ITERATIONS = 10000000
+MODES = [("folded", [fold_constants, eliminate_tail_calls]),
+         ("eliminated", [fold_constants, eliminate_dead_code, eliminate_tail_calls])]
+
+
+def main():
+    text = SOURCE % ITERATIONS
+    print("%10s %10s %10s %10s %12s" % ("mode", "wat, B", "class, B", "time, ms", "result"))
+    for name, passes in MODES:
+        module_size = len(emit_module_code(compile_to_wasm(compile_ir(text, passes))))
+        class_size = len(JvmCompiler("Main").compile(compile_ir(text, passes)).serialize())
+        run = instantiate(text, passes)
+        print("%10s %10d %10d %10.2f %12d" % (name, module_size, class_size, measure(run), run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from benchmarks import print_modes
+from compilation.Inliner import inline_subroutines
+from compilation.Optimizer import DEFAULT_PASSES
+
+SOURCE = """function intersect(a1, b1, a2, b2) {
+    if (a2 <= b1 & b2 >= a1) {
+        return 1;
+    }
+    return 0;
+}
+function count(i, found) {
+    if i <= 0 {
+        return found;
+    }
+    return count(i - 1, found + intersect(0, i, 100, 200) + intersect(i, i + 5, 0, 10));
+}
+return count(%d, 0);
+"""
+ITERATIONS = 1000000
+MODES = [("calls", [optimization for optimization in DEFAULT_PASSES if optimization is not inline_subroutines]),
+         ("inlined", DEFAULT_PASSES)]
+
+
+def main():
+    print_modes(SOURCE % ITERATIONS, MODES)
+
+
+if __name__ == "__main__":
+    main()
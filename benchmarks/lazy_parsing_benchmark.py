@@ -0,0 +1,45 @@
+import timeit
+import tracemalloc
+
+from compilation.IRCompiler import compile_script
+from parsing.Parser import parse_script
+from parsing.Tokenizer import Tokenizer
+
+SNIPPET = """function f%d(a, b) {
+    var c = 0;
+    c = a * 31 + b;
+    if a <= b & (b >= 10 | !(c == 0)) {
+        return f%d(b, a - 1) * -c;
+    }
+    return c + f%d(a, b);
+}
+"""
+FUNCTIONS_COUNT = 2000
+REPEATS = 3
+
+
+def generate_source():
+    library = "".join(SNIPPET % (index, index, max(index - 1, 0)) for index in range(FUNCTIONS_COUNT))
+    return library + "return f3(1, 2);\n"
+
+
+def cold_compile(text, lazy):
+    tokenizer = Tokenizer(text)
+    tokenizer.advance()
+    return compile_script(parse_script(tokenizer, lazy_bodies=lazy), skip_unused_subroutines=lazy)
+
+
+def main():
+    text = generate_source()
+    print("%8s %10s %14s" % ("mode", "time, ms", "peak memory, KiB"))
+    for name, lazy in [("eager", False), ("lazy", True)]:
+        elapsed = min(timeit.repeat(lambda: cold_compile(text, lazy), number=1, repeat=REPEATS))
+        tracemalloc.start()
+        cold_compile(text, lazy)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("%8s %10.1f %14d" % (name, elapsed * 1000, peak // 1024))
+
+
+if __name__ == "__main__":
+    main()
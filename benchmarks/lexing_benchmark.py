@@ -0,0 +1,45 @@
+import timeit
+
+from parsing.TokenBuffer import tokenize
+from parsing.VectorizedTokenizer import tokenize_vectorized
+
+SNIPPET = "function f%d(a, b) {\n\tif a <= b & b >= 10 { return a * 31 + b; }\n\treturn f%d(b, a - 1) == 0;\n}\n"
+SIZES = [2 ** power for power in range(6, 22, 2)]
+REPEATS = 5
+
+
+def generate_source(size):
+    parts = []
+    length = 0
+    index = 0
+    while length < size:
+        part = SNIPPET % (index, index)
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return "".join(parts)[:size]
+
+
+def measure(function, text):
+    number = max(1, 2 ** 16 // max(len(text), 1))
+    return min(timeit.repeat(lambda: function(text), number=number, repeat=REPEATS)) / number
+
+
+def main():
+    crossover = None
+    print("%10s %14s %14s %8s" % ("size", "scalar, ms", "vectorized, ms", "speedup"))
+    for size in SIZES:
+        text = generate_source(size)
+        scalar = measure(tokenize, text)
+        vectorized = measure(tokenize_vectorized, text)
+        if crossover is None and vectorized < scalar:
+            crossover = size
+        print("%10d %14.3f %14.3f %8.2f" % (size, scalar * 1000, vectorized * 1000, scalar / vectorized))
+    if crossover is None:
+        print("vectorized lexing did not win for any measured size")
+    else:
+        print("vectorized lexing wins from about %d characters" % crossover)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from benchmarks import print_sizes
+from compilation.Memoization import memoize_pure_functions
+
+SOURCE = """function fib(n) {
+    if n < 2 {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+function paths(n, k) {
+    if n == 0 | k == 0 {
+        return 1;
+    }
+    return paths(n - 1, k) + paths(n, k - 1);
+}
+return fib(%d) + paths(%d, %d);
+"""
+SIZES = [10, 20, 25]
+MODES = [("plain", []), ("memo", [memoize_pure_functions])]
+REPEATS = 3
+
+
+def main():
+    print_sizes("size", SIZES, lambda size: SOURCE % (size, size // 2, size // 2), MODES, REPEATS,
+                fresh_instances=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import timeit
+
+from parsing import Parser, IterativeParser, TableDrivenParser, GeneratedParser
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
+
+SNIPPET = """function f%d(a, b) {
+    var c = a * 31 + b;
+    if a <= b & (b >= 10 | !(c == 0)) {
+        return f%d(b, a - 1) * -c;
+    } else {
+        c = c - 1;
+    }
+    print(c, a + b * (c - 2));
+    return c;
+}
+"""
+FUNCTIONS_COUNT = 500
+REPEATS = 5
+PARSERS = [("recursive", Parser), ("iterative", IterativeParser), ("table-driven", TableDrivenParser),
+           ("generated", GeneratedParser)]
+
+
+def measure(module, buffer):
+    def run():
+        tokenizer = BufferedTokenizer(buffer)
+        tokenizer.advance()
+        module.parse_script(tokenizer)
+
+    return min(timeit.repeat(run, number=1, repeat=REPEATS))
+
+
+def main():
+    buffer = tokenize("".join(SNIPPET % (index, index) for index in range(FUNCTIONS_COUNT)))
+    baseline = None
+    print("%14s %10s %10s" % ("parser", "time, ms", "relative"))
+    for name, module in PARSERS:
+        elapsed = measure(module, buffer)
+        if baseline is None:
+            baseline = elapsed
+        print("%14s %10.1f %10.2f" % (name, elapsed * 1000, elapsed / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import time
+
+from benchmarks import compile_ir, instantiate, measure
+from compilation.Optimizer import DEFAULT_PASSES, optimize_script
+from compilation.PartialEvaluation import evaluate_partially
+
+RESOURCES = ["count_intersections", "fact7", "number_of_roots", "simplest", "sum_from_1_to_n"]
+SUM_OF_SQUARES = """function squares(n, acc) {
+    if n == 0 {
+        return acc;
+    }
+    return squares(n - 1, acc + n * n);
+}
+return squares(2000, 0) + squares(1000, 1);
+"""
+MODES = [("run", [optimization for optimization in DEFAULT_PASSES if optimization is not evaluate_partially]),
+         ("evaluated", DEFAULT_PASSES)]
+REPEATS = 20
+
+
+def main():
+    print("%20s %14s %14s %14s" % ("script", "run, us", "evaluated, us", "passes, ms"))
+    sources = []
+    for name in RESOURCES:
+        with open("test/resources/%s.mas" % name) as file:
+            sources.append((name, file.read()))
+    sources.append(("sum_of_squares", SUM_OF_SQUARES))
+    for name, text in sources:
+        timings = [measure(instantiate(text, passes), REPEATS) * 1000 for _, passes in MODES]
+        script_ir = compile_ir(text, [])
+        started = time.perf_counter()
+        optimize_script(script_ir, DEFAULT_PASSES)
+        optimization_time = time.perf_counter() - started
+        print("%20s %14.2f %14.2f %14.2f" % (name, timings[0], timings[1], optimization_time * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from benchmarks import print_modes
+from compilation.ShortCircuit import lower_short_circuit
+
+SOURCE = """function depth(n) {
+    if n <= 0 {
+        return 0;
+    }
+    return depth(n - 1) + 1;
+}
+function count(i, found) {
+    if i <= 0 {
+        return found;
+    }
+    if i > 990 & depth(1000) > 3 | i == 1 {
+        return count(i - 1, found + 1);
+    }
+    return count(i - 1, found);
+}
+return count(1000, 0);
+"""
+MODES = [("eager", []), ("short", [lower_short_circuit])]
+
+
+def main():
+    print_modes(SOURCE, MODES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from benchmarks import print_modes
+from compilation.Optimizer import DEFAULT_PASSES
+from compilation.Specialization import specialize_constant_arguments
+
+SOURCE = """function poly(x, a, b, c, d, mode) {
+    if mode == 0 {
+        return a * x * x * x + b * x * x + c * x + d;
+    }
+    if mode == 1 {
+        return ((a * x + b) * x + c) * x + d;
+    }
+    if mode == 2 {
+        return (a * x + b) * (c * x + d);
+    }
+    return a + b + c + d;
+}
+function sum(i, acc) {
+    if i <= 0 {
+        return acc;
+    }
+    return sum(i - 1, acc + poly(i, 3, 0, 2, 1, 2) + poly(i, 1, 1, 1, 1, 1));
+}
+return sum(%d, 0);
+"""
+ITERATIONS = 1000000
+MODES = [("generic", [optimization for optimization in DEFAULT_PASSES
+                      if optimization is not specialize_constant_arguments]),
+         ("specialized", DEFAULT_PASSES)]
+
+
+def main():
+    print_modes(SOURCE % ITERATIONS, MODES)
+
+
+if __name__ == "__main__":
+    main()
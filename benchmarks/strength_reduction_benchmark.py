@@ -0,0 +1,22 @@
+from benchmarks import print_modes
+from compilation.StrengthReduction import reduce_strength
+from compilation.TailCallElimination import eliminate_tail_calls
+
+SOURCE = """function mix(i, acc) {
+    if i <= 0 {
+        return acc;
+    }
+    return mix(i - 1, acc * 9 + i * 8 - i * 3 + acc * 16);
+}
+return mix(%d, 1);
+"""
+ITERATIONS = 10000000
+MODES = [("mul", [eliminate_tail_calls]), ("reduced", [eliminate_tail_calls, reduce_strength])]
+
+
+def main():
+    print_modes(SOURCE % ITERATIONS, MODES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import timeit
+
+from compilation.IRCompiler import compile_script
+from parsing.Parser import parse_script
+from parsing.Tokenizer import Tokenizer
+
+SUBROUTINE = """function f%d(a, b) {
+    var c = 0;
+    c = %s;
+    if c > a & b < g%d {
+        return c + a * b;
+    }
+    return c - b;
+}
+"""
+SUBROUTINES_COUNT = 200
+REFERENCES_PER_SUBROUTINE = 50
+GLOBALS_COUNTS = [100, 1000, 5000]
+REPEATS = 3
+
+
+def generate_source(globals_count):
+    declarations = "".join("var g%d = %d;\n" % (index, index) for index in range(globals_count))
+    subroutines = []
+    for index in range(SUBROUTINES_COUNT):
+        references = " + ".join("g%d" % ((index * REFERENCES_PER_SUBROUTINE + offset) % globals_count)
+                                for offset in range(REFERENCES_PER_SUBROUTINE))
+        subroutines.append(SUBROUTINE % (index, references, index % globals_count))
+    return declarations + "".join(subroutines) + "return f0(1, 2);\n"
+
+
+def main():
+    print("%8s %10s" % ("globals", "time, ms"))
+    for globals_count in GLOBALS_COUNTS:
+        tokenizer = Tokenizer(generate_source(globals_count))
+        tokenizer.advance()
+        script = parse_script(tokenizer)
+        elapsed = min(timeit.repeat(lambda: compile_script(script), number=1, repeat=REPEATS))
+        print("%8d %10.1f" % (globals_count, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    main()
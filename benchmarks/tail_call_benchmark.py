@@ -0,0 +1,27 @@
+from benchmarks import print_sizes
+from compilation.TailCallElimination import eliminate_tail_calls
+
+SOURCE = """function sum(n, acc) {
+    if n <= 0 {
+        return acc;
+    }
+    return sum(n - 1, acc + n);
+}
+function fib(n, a, b) {
+    if n == 0 {
+        return a;
+    }
+    return fib(n - 1, b, a + b);
+}
+return sum(%d, 0) + fib(%d, 0, 1);
+"""
+DEPTHS = [1000, 10000, 1000000]
+MODES = [("calls", []), ("loop", [eliminate_tail_calls])]
+
+
+def main():
+    print_sizes("depth", DEPTHS, lambda depth: SOURCE % (depth, depth), MODES)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from compilation.IRTraversal import *
+from compilation.TailCallElimination import TailCallRewriter
+
+_IDENTITIES = {BinaryOperatorKind.PLUS: 0, BinaryOperatorKind.MUL: 1}
+
+
+class _AccumulatorRewriter(TailCallRewriter):
+    def __init__(self, subroutine: SubroutineDeclarationIR, kind: BinaryOperatorKind, reassigned):
+        super(_AccumulatorRewriter, self).__init__(subroutine)
+        self.kind = kind
+        self.reassigned = reassigned
+        self.accumulator = LocalVariableDeclarationIR(self.next_local_index, IntegerIR(_IDENTITIES[kind]))
+        self.next_local_index += 1
+
+    def is_accumulable(self, expr):
+        for node in walk_ir([expr]):
+            if isinstance(node, CallIR) or isinstance(node, TableLoadIR):
+                return False
+            if isinstance(node, VariableReferenceIR) and id(node.declaration) in self.reassigned and \
+                    isinstance(node.declaration, GlobalVariableDeclarationIR):
+                return False
+        return True
+
+    def split(self, expr):
+        if self.is_self_call(expr):
+            return expr, []
+        if isinstance(expr, BinaryOperationIR) and expr.kind == self.kind:
+            for inner, operand in [(expr.left_op, expr.right_op), (expr.right_op, expr.left_op)]:
+                split = self.split(inner)
+                if split is not None and self.is_accumulable(operand):
+                    return split[0], split[1] + [operand]
+        return None
+
+    def is_applicable(self):
+        if self.subroutine.subroutine_kind != SubroutineKind.FUNCTION:
+            return False
+        self_calls = 0
+        matched_calls = 0
+        accumulates = False
+        for node in walk_ir(self.subroutine.statements):
+            if self.is_self_call(node):
+                self_calls += 1
+            elif isinstance(node, ReturnStatementIR):
+                split = self.split(node.return_value)
+                if split is not None:
+                    matched_calls += 1
+                    accumulates = accumulates or len(split[1]) > 0
+        return accumulates and self_calls == matched_calls
+
+    def accumulate(self, operands):
+        value = VariableReferenceIR(self.accumulator)
+        for operand in operands:
+            value = BinaryOperationIR(value, operand, self.kind)
+        return value
+
+    def rewrite_block(self, statements, is_tail=True):
+        result = []
+        for statement in statements:
+            match statement:
+                case ReturnStatementIR():
+                    split = self.split(statement.return_value)
+                    if split is None:
+                        statement.return_value = self.accumulate([statement.return_value])
+                        result.append(statement)
+                    else:
+                        call, operands = split
+                        if operands:
+                            result.append(AssignStatementIR(VariableReferenceIR(self.accumulator),
+                                                            self.accumulate(operands)))
+                        result += self.jump_back(call)
+                case IfStatementIR():
+                    statement.then_block = self.rewrite_block(statement.then_block)
+                    if statement.else_block is not None:
+                        statement.else_block = self.rewrite_block(statement.else_block)
+                    result.append(statement)
+                case LoopStatementIR() | BlockStatementIR():
+                    statement.body = self.rewrite_block(statement.body)
+                    result.append(statement)
+                case _:
+                    result.append(statement)
+        return result
+
+
+def introduce_accumulators(script: ScriptIR):
+    reassigned = assigned_declarations([script])
+    for subroutine in script.subroutines:
+        for kind in _IDENTITIES:
+            rewriter = _AccumulatorRewriter(subroutine, kind, reassigned)
+            if rewriter.is_applicable():
+                rewriter.loop.body = rewriter.rewrite_block(subroutine.statements)
+                subroutine.statements = [rewriter.accumulator, rewriter.loop]
+                subroutine.local_variables_count += 1
+                break
+    return script
@@ -0,0 +1,152 @@
+from compilation.IRTraversal import *
+
+_NEGATED_COMPARISONS = {
+    BinaryOperatorKind.LESS: BinaryOperatorKind.GEQ,
+    BinaryOperatorKind.LEQ: BinaryOperatorKind.GREATER,
+    BinaryOperatorKind.GREATER: BinaryOperatorKind.LEQ,
+    BinaryOperatorKind.GEQ: BinaryOperatorKind.LESS,
+}
+_DUAL_OPERATORS = {BinaryOperatorKind.AND: BinaryOperatorKind.OR, BinaryOperatorKind.OR: BinaryOperatorKind.AND}
+_INTEGER_CONSTANTS = {BinaryOperatorKind.AND: (-1, 0), BinaryOperatorKind.OR: (0, -1)}
+_BOOLEAN_CONSTANTS = {BinaryOperatorKind.AND: (1, 0), BinaryOperatorKind.OR: (0, 1)}
+
+
+def _is_constant(expr, value: int):
+    return isinstance(expr, IntegerIR) and expr.val == value
+
+
+def _is_not(expr):
+    return isinstance(expr, UnaryOperationIR) and expr.kind == UnaryOperatorKind.NOT
+
+
+def _is_negation(expr):
+    return isinstance(expr, UnaryOperationIR) and expr.kind == UnaryOperatorKind.MINUS
+
+
+def _is_boolean(expr):
+    match expr:
+        case IntegerIR():
+            return expr.val in (0, 1)
+        case UnaryOperationIR():
+            return expr.kind == UnaryOperatorKind.NOT
+        case BinaryOperationIR() if expr.kind in _DUAL_OPERATORS:
+            return _is_boolean(expr.left_op) and _is_boolean(expr.right_op)
+        case BinaryOperationIR():
+            return expr.kind in _NEGATED_COMPARISONS or expr.kind == BinaryOperatorKind.EQ
+        case ConditionalIR():
+            return _is_boolean(expr.then_value) and _is_boolean(expr.else_value)
+    return False
+
+
+def _same_value(left, right):
+    match left:
+        case IntegerIR():
+            return isinstance(right, IntegerIR) and left.val == right.val
+        case VariableReferenceIR():
+            return isinstance(right, VariableReferenceIR) and left.declaration is right.declaration
+        case UnaryOperationIR():
+            return isinstance(right, UnaryOperationIR) and left.kind == right.kind and \
+                   _same_value(left.operand, right.operand)
+        case BinaryOperationIR():
+            return isinstance(right, BinaryOperationIR) and left.kind == right.kind and \
+                   _same_value(left.left_op, right.left_op) and _same_value(left.right_op, right.right_op)
+    return False
+
+
+def _negate(expr):
+    match expr:
+        case IntegerIR() if expr.val in (0, 1):
+            return IntegerIR(1 - expr.val)
+        case UnaryOperationIR() if _is_not(expr) and _is_boolean(expr.operand):
+            return expr.operand
+        case BinaryOperationIR() if expr.kind in _NEGATED_COMPARISONS:
+            return BinaryOperationIR(expr.left_op, expr.right_op, _NEGATED_COMPARISONS[expr.kind])
+        case BinaryOperationIR() if expr.kind in _DUAL_OPERATORS and _is_boolean(expr):
+            left = _negate(expr.left_op)
+            right = _negate(expr.right_op)
+            if left is not None and right is not None:
+                return BinaryOperationIR(left, right, _DUAL_OPERATORS[expr.kind])
+    return None
+
+
+def _simplify_binary_operation(expr: BinaryOperationIR):
+    left, right = expr.left_op, expr.right_op
+    match expr.kind:
+        case BinaryOperatorKind.PLUS:
+            if _is_constant(right, 0):
+                return left
+            if _is_constant(left, 0):
+                return right
+            if _is_negation(right):
+                return BinaryOperationIR(left, right.operand, BinaryOperatorKind.MINUS)
+        case BinaryOperatorKind.MINUS:
+            if _is_constant(right, 0):
+                return left
+            if _is_constant(left, 0):
+                return UnaryOperationIR(right, UnaryOperatorKind.MINUS)
+            if _is_negation(right):
+                return BinaryOperationIR(left, right.operand, BinaryOperatorKind.PLUS)
+            if _same_value(left, right) and not has_side_effects(left):
+                return IntegerIR(0)
+        case BinaryOperatorKind.MUL:
+            if _is_constant(right, 1):
+                return left
+            if _is_constant(left, 1):
+                return right
+            if (_is_constant(right, 0) or _is_constant(left, 0)) and not has_side_effects(expr):
+                return IntegerIR(0)
+        case BinaryOperatorKind.AND | BinaryOperatorKind.OR:
+            for (neutral, absorbing), is_applicable in [(_INTEGER_CONSTANTS[expr.kind], lambda _: True),
+                                                        (_BOOLEAN_CONSTANTS[expr.kind], _is_boolean)]:
+                for constant, operand in [(right, left), (left, right)]:
+                    if _is_constant(constant, neutral) and is_applicable(operand):
+                        return operand
+                    if _is_constant(constant, absorbing) and is_applicable(operand) and \
+                            not has_side_effects(operand):
+                        return IntegerIR(absorbing)
+            if _same_value(left, right) and not has_side_effects(left):
+                return left
+            if _is_not(left) and _is_not(right) and _is_boolean(left.operand) and _is_boolean(right.operand):
+                return UnaryOperationIR(BinaryOperationIR(left.operand, right.operand, _DUAL_OPERATORS[expr.kind]),
+                                        UnaryOperatorKind.NOT)
+        case BinaryOperatorKind.EQ:
+            if _same_value(left, right) and not has_side_effects(left):
+                return IntegerIR(1)
+    return expr
+
+
+def _simplify_expr(expr):
+    match expr:
+        case BinaryOperationIR():
+            return _simplify_binary_operation(expr)
+        case UnaryOperationIR() if _is_negation(expr) and _is_negation(expr.operand):
+            return expr.operand.operand
+        case UnaryOperationIR() if _is_not(expr):
+            negated = _negate(expr.operand)
+            if negated is not None:
+                return negated
+        case ConditionalIR() if _is_not(expr.condition):
+            return ConditionalIR(expr.condition.operand, expr.else_value, expr.then_value)
+    return expr
+
+
+def _simplify_branches(statements):
+    for statement in statements:
+        match statement:
+            case IfStatementIR():
+                _simplify_branches(statement.then_block)
+                if statement.else_block is not None:
+                    _simplify_branches(statement.else_block)
+                if _is_not(statement.condition):
+                    statement.condition = statement.condition.operand
+                    statement.then_block, statement.else_block = statement.else_block or [], statement.then_block
+            case LoopStatementIR() | BlockStatementIR():
+                _simplify_branches(statement.body)
+
+
+def simplify_algebraically(script: ScriptIR):
+    transform_script_expressions(script, _simplify_expr)
+    for subroutine in script.subroutines:
+        _simplify_branches(subroutine.statements)
+    _simplify_branches(script.statements)
+    return script
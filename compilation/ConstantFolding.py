@@ -0,0 +1,115 @@
+from compilation.IRTraversal import *
+
+
+def wrap_i32(value: int):
+    return (value + 0x80000000) % 0x100000000 - 0x80000000
+
+
+def evaluate_binary_operation(kind: BinaryOperatorKind, left: int, right: int):
+    match kind:
+        case BinaryOperatorKind.MUL:
+            return wrap_i32(left * right)
+        case BinaryOperatorKind.PLUS:
+            return wrap_i32(left + right)
+        case BinaryOperatorKind.MINUS:
+            return wrap_i32(left - right)
+        case BinaryOperatorKind.EQ:
+            return int(left == right)
+        case BinaryOperatorKind.GEQ:
+            return int(left >= right)
+        case BinaryOperatorKind.GREATER:
+            return int(left > right)
+        case BinaryOperatorKind.LEQ:
+            return int(left <= right)
+        case BinaryOperatorKind.LESS:
+            return int(left < right)
+        case BinaryOperatorKind.AND:
+            return left & right
+        case BinaryOperatorKind.OR:
+            return left | right
+        case BinaryOperatorKind.SHL:
+            return wrap_i32(left << (right & 31))
+        case _:
+            raise ValueError(kind)
+
+
+def evaluate_unary_operation(kind: UnaryOperatorKind, operand: int):
+    match kind:
+        case UnaryOperatorKind.MINUS:
+            return wrap_i32(-operand)
+        case UnaryOperatorKind.NOT:
+            return int(operand == 0)
+        case _:
+            raise ValueError(kind)
+
+
+def _fold_expr(expr, constants):
+    match expr:
+        case BinaryOperationIR():
+            expr.left_op = _fold_expr(expr.left_op, constants)
+            expr.right_op = _fold_expr(expr.right_op, constants)
+            if isinstance(expr.left_op, IntegerIR) and isinstance(expr.right_op, IntegerIR):
+                return IntegerIR(evaluate_binary_operation(expr.kind, expr.left_op.val, expr.right_op.val))
+        case UnaryOperationIR():
+            expr.operand = _fold_expr(expr.operand, constants)
+            if isinstance(expr.operand, IntegerIR):
+                return IntegerIR(evaluate_unary_operation(expr.kind, expr.operand.val))
+        case ConditionalIR():
+            expr.condition = _fold_expr(expr.condition, constants)
+            if isinstance(expr.condition, IntegerIR):
+                return _fold_expr(expr.then_value if expr.condition.val != 0 else expr.else_value, constants)
+            expr.then_value = _fold_expr(expr.then_value, constants)
+            expr.else_value = _fold_expr(expr.else_value, constants)
+        case CallIR():
+            expr.args = [_fold_expr(arg, constants) for arg in expr.args]
+        case TableLoadIR():
+            expr.position = _fold_expr(expr.position, constants)
+        case VariableReferenceIR():
+            if id(expr.declaration) in constants:
+                return IntegerIR(constants[id(expr.declaration)])
+    return expr
+
+
+def _fold_block(statements, constants, reassigned):
+    constants = dict(constants)
+    for statement in statements:
+        match statement:
+            case LocalVariableDeclarationIR() | GlobalVariableDeclarationIR():
+                statement.init_value = _fold_expr(statement.init_value, constants)
+                if isinstance(statement.init_value, IntegerIR) and id(statement) not in reassigned:
+                    constants[id(statement)] = statement.init_value.val
+            case AssignStatementIR():
+                statement.value = _fold_expr(statement.value, constants)
+            case ReturnStatementIR():
+                if statement.return_value is not None:
+                    statement.return_value = _fold_expr(statement.return_value, constants)
+            case CallStatementIR():
+                statement.call = _fold_expr(statement.call, constants)
+            case TableStoreStatementIR():
+                statement.position = _fold_expr(statement.position, constants)
+                statement.value = _fold_expr(statement.value, constants)
+            case IfStatementIR():
+                statement.condition = _fold_expr(statement.condition, constants)
+                _fold_block(statement.then_block, constants, reassigned)
+                if statement.else_block is not None:
+                    _fold_block(statement.else_block, constants, reassigned)
+            case LoopStatementIR() | BlockStatementIR():
+                _fold_block(statement.body, constants, reassigned)
+            case ContinueStatementIR() | BreakStatementIR():
+                pass
+            case _:
+                raise ValueError(statement)
+    return constants
+
+
+def fold_subroutine_constants(subroutine: SubroutineDeclarationIR, reassigned):
+    _fold_block(subroutine.statements, dict(), reassigned)
+    return subroutine
+
+
+def fold_constants(script: ScriptIR):
+    reassigned = assigned_declarations([script])
+    global_constants = _fold_block(script.statements, dict(), reassigned)
+    for subroutine in script.subroutines:
+        _fold_block(subroutine.statements, global_constants, reassigned)
+    return script
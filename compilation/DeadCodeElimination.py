@@ -0,0 +1,57 @@
+from compilation.IRTraversal import *
+
+
+def _is_break_target(block: BlockStatementIR):
+    return any(isinstance(node, BreakStatementIR) and node.block is block for node in walk_ir(block.body))
+
+
+def _live_statements(statement):
+    match statement:
+        case IfStatementIR() if isinstance(statement.condition, IntegerIR):
+            if statement.condition.val != 0:
+                return _eliminate_dead_statements(statement.then_block)
+            if statement.else_block is None:
+                return []
+            return _eliminate_dead_statements(statement.else_block)
+        case IfStatementIR():
+            statement.then_block = _eliminate_dead_statements(statement.then_block)
+            if statement.else_block is not None:
+                statement.else_block = _eliminate_dead_statements(statement.else_block) or None
+            if not statement.then_block and statement.else_block is None and \
+                    not has_side_effects(statement.condition):
+                return []
+        case LoopStatementIR():
+            statement.body = _eliminate_dead_statements(statement.body)
+        case BlockStatementIR():
+            statement.body = _eliminate_dead_statements(statement.body)
+            if not _is_break_target(statement):
+                return statement.body
+    return [statement]
+
+
+def _eliminate_dead_statements(statements):
+    result = []
+    for statement in statements:
+        for live in _live_statements(statement):
+            result.append(live)
+            if not completes_normally(live):
+                return result
+    return result
+
+
+def _eliminate_dead_body(statements):
+    declarations = local_declarations(statements)
+    live = _eliminate_dead_statements(statements)
+    declared = {id(local) for local in local_declarations(live)}
+    referenced = {id(node.declaration) for node in walk_ir(live) if isinstance(node, VariableReferenceIR)}
+    restored = [local for local in declarations if id(local) not in declared and id(local) in referenced]
+    for local in restored:
+        local.init_value = IntegerIR(0)
+    return restored + live
+
+
+def eliminate_dead_code(script: ScriptIR):
+    for subroutine in script.subroutines:
+        subroutine.statements = _eliminate_dead_body(subroutine.statements)
+    script.statements = _eliminate_dead_body(script.statements)
+    return script
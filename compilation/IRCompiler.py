@@ -1,3 +1,4 @@
+from compilation.DeadCodeElimination import eliminate_dead_code
 from compilation.IRNodes import *
 
 
@@ -29,6 +30,10 @@ class Type(Enum):
 
 
 def _end_location(location: Location):
+    if location is None:
+        return None
+    if location.line_index is not None:
+        return Location.from_offsets(location.line_index, location.end, location.end)
     return Location(location.line_end, location.column_end, location.line_end, location.column_end)
 
 
@@ -117,11 +122,19 @@ class ResultOfFunctionCallIgnored(CompilationException):
             return self.location == other.location
 
 
+def _lookup_variable(name: str, script_context: ScriptContext, subroutine_context: SubroutineContext):
+    if subroutine_context is not None:
+        declaration = subroutine_context.variables.get(name)
+        if declaration is not None:
+            return declaration
+    return script_context.variables.get(name)
+
+
 def compile_parameters(param_list: ParametersList, script_context: ScriptContext,
                        subroutine_context: SubroutineContext):
     res = []
     for index, parameter in enumerate(param_list.parameters):
-        if parameter.name in dict(script_context.variables, **subroutine_context.variables):
+        if _lookup_variable(parameter.name, script_context, subroutine_context) is not None:
             raise DuplicateDeclaration(parameter.name, parameter.location)
         param_ir = ParameterDeclarationIR(index)
         res.append(param_ir)
@@ -198,10 +211,9 @@ def compile_call(call: Call, script_context: ScriptContext, subroutine_context:
 
 def compile_variable_reference(identifier: Identifier, script_context: ScriptContext,
                                subroutine_context: SubroutineContext):
-    all_variables = script_context.variables if subroutine_context is None else dict(script_context.variables,
-                                                                                     **subroutine_context.variables)
-    if identifier.name in all_variables:
-        return VariableReferenceIR(all_variables[identifier.name])
+    declaration = _lookup_variable(identifier.name, script_context, subroutine_context)
+    if declaration is not None:
+        return VariableReferenceIR(declaration)
     raise DeclarationNotFound(identifier.name, identifier.location)
 
 
@@ -312,7 +324,7 @@ def compile_variable_decl(var_declaration: VariableDeclaration, script_context:
         script_context.variables[var_name] = global_var_decl
         return global_var_decl
     else:
-        if var_name in dict(script_context.variables, **subroutine_context.variables):
+        if _lookup_variable(var_name, script_context, subroutine_context) is not None:
             raise DuplicateDeclaration(var_name, var_declaration.var.location)
         init_value, init_value_type = compile_expr(var_declaration.init_expr, script_context)
         if init_value_type != Type.INT:
@@ -336,13 +348,44 @@ def compile_statement(statement, script_context: ScriptContext, subroutine_conte
             return compile_call_statement(statement, script_context, subroutine_context)
 
 
-def compile_script(script: Script):
+def _called_subroutines(nodes):
+    names = set()
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Call):
+            names.add(node.subroutine.name)
+        stack.extend(children(node))
+    return names
+
+
+def _reachable_subroutines(script: Script):
+    declarations = dict()
+    for script_elem in script.body:
+        if isinstance(script_elem, SubroutineDecl):
+            declarations.setdefault(script_elem.name.name, []).append(script_elem)
+    reachable = set()
+    pending = list(_called_subroutines(elem for elem in script.body if not isinstance(elem, SubroutineDecl)))
+    while pending:
+        name = pending.pop()
+        if name in reachable or name not in declarations:
+            continue
+        reachable.add(name)
+        for declaration in declarations[name]:
+            pending.extend(_called_subroutines([declaration.body]))
+    return reachable
+
+
+def compile_script(script: Script, skip_unused_subroutines=False):
     subroutines = []
     statements = []
     script_context = ScriptContext()
     global_var_count = 0
+    reachable = _reachable_subroutines(script) if skip_unused_subroutines else None
     for script_elem in script.body:
         if isinstance(script_elem, SubroutineDecl):
+            if reachable is not None and script_elem.name.name not in reachable:
+                continue
             subroutines.append(compile_subroutine_declaration(script_elem, script_context))
         else:
             statements.append(compile_statement(script_elem, script_context))
@@ -350,4 +393,4 @@ def compile_script(script: Script):
                 global_var_count += 1
     if not _always_returns(statements):
         raise MissingReturnStatement(_end_location(script.end_location))
-    return ScriptIR(subroutines, statements, global_var_count)
+    return eliminate_dead_code(ScriptIR(subroutines, statements, global_var_count))
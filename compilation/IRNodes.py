@@ -45,6 +45,16 @@ class UnaryOperationIR:
         return _equals(self, other)
 
 
+class ConditionalIR:
+    def __init__(self, condition, then_value, else_value):
+        self.condition = condition
+        self.then_value = then_value
+        self.else_value = else_value
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
 class IfStatementIR:
     def __init__(self, condition, then_block, else_block):
         self.condition = condition
@@ -55,6 +65,40 @@ class IfStatementIR:
         return _equals(self, other)
 
 
+class LoopStatementIR:
+    def __init__(self, index: int, body: list):
+        self.index = index
+        self.body = body
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
+class ContinueStatementIR:
+    def __init__(self, loop: LoopStatementIR):
+        self.loop = loop
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
+class BlockStatementIR:
+    def __init__(self, index: int, body: list):
+        self.index = index
+        self.body = body
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
+class BreakStatementIR:
+    def __init__(self, block: BlockStatementIR):
+        self.block = block
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
 class ReturnStatementIR:
     def __init__(self, return_value):
         self.return_value = return_value
@@ -99,6 +143,7 @@ class SubroutineDeclarationIR:
         self.statements = statements
         self.index = index
         self.local_variables_count = local_variables_count
+        self.is_pure = False
 
     def __eq__(self, other):
         return _equals(self, other)
@@ -129,11 +174,40 @@ class CallStatementIR:
         return _equals(self, other)
 
 
+class TableDeclarationIR:
+    def __init__(self, index: int, size: int):
+        self.index = index
+        self.size = size
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
+class TableLoadIR:
+    def __init__(self, table: TableDeclarationIR, position):
+        self.table = table
+        self.position = position
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
+class TableStoreStatementIR:
+    def __init__(self, table: TableDeclarationIR, position, value):
+        self.table = table
+        self.position = position
+        self.value = value
+
+    def __eq__(self, other):
+        return _equals(self, other)
+
+
 class ScriptIR:
-    def __init__(self, subroutines: list, statements: list, global_variables_count: int):
+    def __init__(self, subroutines: list, statements: list, global_variables_count: int, tables: list = None):
         self.subroutines = subroutines
         self.statements = statements
         self.global_variables_count = global_variables_count
+        self.tables = [] if tables is None else tables
 
     def __eq__(self, other):
         return _equals(self, other)
@@ -187,10 +261,22 @@ def _equality_traverse(node, other, visited):
                                                                                               other.right_op, visited)
     if isinstance(node, UnaryOperationIR):
         return node.kind == other.kind and _equality_traverse(node.operand, other.operand, visited)
+    if isinstance(node, ConditionalIR):
+        return _equality_traverse(node.condition, other.condition, visited) and \
+               _equality_traverse(node.then_value, other.then_value, visited) and \
+               _equality_traverse(node.else_value, other.else_value, visited)
     if isinstance(node, IfStatementIR):
         return _equality_traverse(node.condition, other.condition, visited) and \
                _nodes_lists_equals(node.then_block, other.then_block, visited) and \
                _nodes_lists_equals(node.else_block, other.else_block, visited)
+    if isinstance(node, LoopStatementIR):
+        return node.index == other.index and _nodes_lists_equals(node.body, other.body, visited)
+    if isinstance(node, ContinueStatementIR):
+        return _equality_traverse(node.loop, other.loop, visited)
+    if isinstance(node, BlockStatementIR):
+        return node.index == other.index and _nodes_lists_equals(node.body, other.body, visited)
+    if isinstance(node, BreakStatementIR):
+        return _equality_traverse(node.block, other.block, visited)
     if isinstance(node, ReturnStatementIR):
         return _equality_traverse(node.return_value, other.return_value, visited)
     if isinstance(node, AssignStatementIR):
@@ -212,8 +298,18 @@ def _equality_traverse(node, other, visited):
                _nodes_lists_equals(node.args, other.args, visited)
     if isinstance(node, CallStatementIR):
         return _equality_traverse(node.call, other.call, visited)
+    if isinstance(node, TableDeclarationIR):
+        return node.index == other.index and node.size == other.size
+    if isinstance(node, TableLoadIR):
+        return _equality_traverse(node.table, other.table, visited) and \
+               _equality_traverse(node.position, other.position, visited)
+    if isinstance(node, TableStoreStatementIR):
+        return _equality_traverse(node.table, other.table, visited) and \
+               _equality_traverse(node.position, other.position, visited) and \
+               _equality_traverse(node.value, other.value, visited)
     if isinstance(node, ScriptIR):
         return node.global_variables_count == other.global_variables_count and \
+               _nodes_lists_equals(node.tables, other.tables, visited) and \
                _nodes_lists_equals(node.subroutines, other.subroutines, visited) and \
                _nodes_lists_equals(node.statements, other.statements, visited)
     raise ValueError(node)
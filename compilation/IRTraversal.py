@@ -0,0 +1,177 @@
+from compilation.IRNodes import *
+
+
+def ir_children(node):
+    match node:
+        case ScriptIR():
+            return node.subroutines + node.statements
+        case SubroutineDeclarationIR():
+            return node.statements
+        case IfStatementIR():
+            return [node.condition] + node.then_block + ([] if node.else_block is None else node.else_block)
+        case LoopStatementIR() | BlockStatementIR():
+            return node.body
+        case ReturnStatementIR():
+            return [] if node.return_value is None else [node.return_value]
+        case AssignStatementIR():
+            return [node.var, node.value]
+        case LocalVariableDeclarationIR() | GlobalVariableDeclarationIR():
+            return [node.init_value]
+        case CallStatementIR():
+            return [node.call]
+        case CallIR():
+            return [node.subroutine] + node.args
+        case BinaryOperationIR():
+            return [node.left_op, node.right_op]
+        case UnaryOperationIR():
+            return [node.operand]
+        case ConditionalIR():
+            return [node.condition, node.then_value, node.else_value]
+        case TableLoadIR():
+            return [node.position]
+        case TableStoreStatementIR():
+            return [node.position, node.value]
+        case _:
+            return []
+
+
+def walk_ir(nodes):
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(ir_children(node)))
+
+
+def has_side_effects(expr):
+    return any(isinstance(node, CallIR) for node in walk_ir([expr]))
+
+
+def local_declarations(statements):
+    return [node for node in walk_ir(statements) if isinstance(node, LocalVariableDeclarationIR)]
+
+
+def nested_local_declarations(statements):
+    top_level = {id(statement) for statement in statements}
+    return [local for local in local_declarations(statements) if id(local) not in top_level]
+
+
+def free_local_index(statements, parameters_count=0):
+    return max([parameters_count] + [local.index + 1 for local in local_declarations(statements)])
+
+
+def next_local_index(subroutine: SubroutineDeclarationIR):
+    return free_local_index(subroutine.statements, len(subroutine.parameters))
+
+
+def next_loop_index(statements):
+    return max([0] + [node.index + 1 for node in walk_ir(statements) if isinstance(node, LoopStatementIR)])
+
+
+def next_block_index(statements):
+    return max([0] + [node.index + 1 for node in walk_ir(statements) if isinstance(node, BlockStatementIR)])
+
+
+def completes_normally(statement):
+    match statement:
+        case ReturnStatementIR() | ContinueStatementIR() | BreakStatementIR():
+            return False
+        case IfStatementIR():
+            return block_completes_normally(statement.then_block) or statement.else_block is None or \
+                   block_completes_normally(statement.else_block)
+        case LoopStatementIR():
+            return block_completes_normally(statement.body)
+        case BlockStatementIR():
+            return block_completes_normally(statement.body) or any(
+                isinstance(node, BreakStatementIR) and node.block is statement for node in walk_ir(statement.body))
+    return True
+
+
+def block_completes_normally(statements):
+    return all(completes_normally(statement) for statement in statements)
+
+
+def is_recursive(subroutine: SubroutineDeclarationIR):
+    visited = set()
+    stack = [subroutine]
+    while stack:
+        current = stack.pop()
+        for node in walk_ir(current.statements):
+            if isinstance(node, CallIR):
+                callee = node.subroutine.declaration
+                if callee is subroutine:
+                    return True
+                if id(callee) not in visited:
+                    visited.add(id(callee))
+                    stack.append(callee)
+    return False
+
+
+def assigned_declarations(nodes):
+    return {id(node.var.declaration) for node in walk_ir(nodes) if isinstance(node, AssignStatementIR)}
+
+
+def shared_declarations(statements):
+    shared = dict()
+    for node in walk_ir(statements):
+        match node:
+            case VariableReferenceIR() if isinstance(node.declaration, GlobalVariableDeclarationIR):
+                shared[id(node.declaration)] = node.declaration
+            case SubroutineReferenceIR():
+                shared[id(node.declaration)] = node.declaration
+            case TableLoadIR() | TableStoreStatementIR():
+                shared[id(node.table)] = node.table
+    return shared
+
+
+def transform_expr(expr, transform):
+    match expr:
+        case BinaryOperationIR():
+            expr.left_op = transform_expr(expr.left_op, transform)
+            expr.right_op = transform_expr(expr.right_op, transform)
+        case UnaryOperationIR():
+            expr.operand = transform_expr(expr.operand, transform)
+        case ConditionalIR():
+            expr.condition = transform_expr(expr.condition, transform)
+            expr.then_value = transform_expr(expr.then_value, transform)
+            expr.else_value = transform_expr(expr.else_value, transform)
+        case CallIR():
+            expr.args = [transform_expr(arg, transform) for arg in expr.args]
+        case TableLoadIR():
+            expr.position = transform_expr(expr.position, transform)
+    return transform(expr)
+
+
+def transform_statements_expressions(statements, transform):
+    for statement in statements:
+        match statement:
+            case LocalVariableDeclarationIR() | GlobalVariableDeclarationIR():
+                statement.init_value = transform_expr(statement.init_value, transform)
+            case AssignStatementIR():
+                statement.value = transform_expr(statement.value, transform)
+            case ReturnStatementIR():
+                if statement.return_value is not None:
+                    statement.return_value = transform_expr(statement.return_value, transform)
+            case CallStatementIR():
+                statement.call = transform_expr(statement.call, transform)
+            case TableStoreStatementIR():
+                statement.position = transform_expr(statement.position, transform)
+                statement.value = transform_expr(statement.value, transform)
+            case IfStatementIR():
+                statement.condition = transform_expr(statement.condition, transform)
+                transform_statements_expressions(statement.then_block, transform)
+                if statement.else_block is not None:
+                    transform_statements_expressions(statement.else_block, transform)
+            case LoopStatementIR() | BlockStatementIR():
+                transform_statements_expressions(statement.body, transform)
+            case ContinueStatementIR() | BreakStatementIR():
+                pass
+            case _:
+                raise ValueError(statement)
+
+
+def transform_script_expressions(script: ScriptIR, transform):
+    for subroutine in script.subroutines:
+        transform_statements_expressions(subroutine.statements, transform)
+    transform_statements_expressions(script.statements, transform)
+    return script
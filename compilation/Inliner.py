@@ -0,0 +1,205 @@
+import copy
+
+from compilation.IRTraversal import *
+from compilation.Purity import mark_pure_subroutines
+
+INLINE_SIZE_LIMIT = 40
+
+
+class _HoistState:
+    def __init__(self):
+        self.evaluated_call = False
+        self.read_shared_state = False
+
+
+def _subroutine_size(subroutine: SubroutineDeclarationIR):
+    return sum(1 for _ in walk_ir(subroutine.statements))
+
+
+def _reads_shared_state(node):
+    return isinstance(node, TableLoadIR) or \
+           isinstance(node, VariableReferenceIR) and isinstance(node.declaration, GlobalVariableDeclarationIR)
+
+
+def _is_stable_argument(arg):
+    return isinstance(arg, IntegerIR) or isinstance(arg, VariableReferenceIR) and \
+           not isinstance(arg.declaration, GlobalVariableDeclarationIR)
+
+
+def _copy_stable_argument(arg):
+    if isinstance(arg, IntegerIR):
+        return IntegerIR(arg.val)
+    return VariableReferenceIR(arg.declaration)
+
+
+class _Inliner:
+    def __init__(self, statements, inlinable, subroutine: SubroutineDeclarationIR = None):
+        self.inlinable = inlinable
+        self.subroutine = subroutine
+        self.next_local_index = free_local_index(statements, 0 if subroutine is None else len(subroutine.parameters))
+        self.next_loop_index = next_loop_index(statements)
+        self.next_block_index = next_block_index(statements)
+
+    def is_inlinable(self, call: CallIR):
+        return id(call.subroutine.declaration) in self.inlinable
+
+    def declare_local(self, init_value):
+        local = LocalVariableDeclarationIR(self.next_local_index, init_value)
+        self.next_local_index += 1
+        if self.subroutine is not None:
+            self.subroutine.local_variables_count += 1
+        return local
+
+    def inline_block(self, statements):
+        result = []
+        for statement in statements:
+            prelude = []
+            state = _HoistState()
+            match statement:
+                case LocalVariableDeclarationIR() | GlobalVariableDeclarationIR():
+                    statement.init_value = self.hoist(statement.init_value, prelude, state)
+                case AssignStatementIR():
+                    statement.value = self.hoist(statement.value, prelude, state)
+                case ReturnStatementIR():
+                    if statement.return_value is not None:
+                        statement.return_value = self.hoist(statement.return_value, prelude, state)
+                case CallStatementIR():
+                    call = statement.call
+                    call.args = [self.hoist(arg, prelude, state) for arg in call.args]
+                    if self.is_inlinable(call):
+                        value = self.expand(call, prelude)
+                        if value is not None and has_side_effects(value):
+                            prelude.append(self.declare_local(value))
+                        statement = None
+                case TableStoreStatementIR():
+                    statement.position = self.hoist(statement.position, prelude, state)
+                    statement.value = self.hoist(statement.value, prelude, state)
+                case IfStatementIR():
+                    statement.condition = self.hoist(statement.condition, prelude, state)
+                    statement.then_block = self.inline_block(statement.then_block)
+                    if statement.else_block is not None:
+                        statement.else_block = self.inline_block(statement.else_block)
+                case LoopStatementIR() | BlockStatementIR():
+                    statement.body = self.inline_block(statement.body)
+            result += prelude
+            if statement is not None:
+                result.append(statement)
+        return result
+
+    def hoist(self, expr, prelude, state: _HoistState):
+        match expr:
+            case BinaryOperationIR():
+                expr.left_op = self.hoist(expr.left_op, prelude, state)
+                expr.right_op = self.hoist(expr.right_op, prelude, state)
+            case UnaryOperationIR():
+                expr.operand = self.hoist(expr.operand, prelude, state)
+            case ConditionalIR():
+                expr.condition = self.hoist(expr.condition, prelude, state)
+                for node in walk_ir([expr.then_value, expr.else_value]):
+                    state.evaluated_call = state.evaluated_call or isinstance(node, CallIR)
+                    state.read_shared_state = state.read_shared_state or _reads_shared_state(node)
+            case TableLoadIR():
+                expr.position = self.hoist(expr.position, prelude, state)
+                state.read_shared_state = True
+            case VariableReferenceIR():
+                state.read_shared_state = state.read_shared_state or _reads_shared_state(expr)
+            case CallIR():
+                evaluated_call = state.evaluated_call
+                read_shared_state = state.read_shared_state
+                expr.args = [self.hoist(arg, prelude, state) for arg in expr.args]
+                is_pure = all(node.subroutine.declaration.is_pure for node in walk_ir([expr])
+                              if isinstance(node, CallIR))
+                if self.is_inlinable(expr) and not evaluated_call and (is_pure or not read_shared_state):
+                    value = self.expand(expr, prelude)
+                    for node in walk_ir([value]):
+                        state.evaluated_call = state.evaluated_call or isinstance(node, CallIR)
+                        state.read_shared_state = state.read_shared_state or _reads_shared_state(node)
+                    return value
+                state.evaluated_call = True
+        return expr
+
+    def expand(self, call: CallIR, prelude):
+        callee = call.subroutine.declaration
+        copies = shared_declarations(callee.statements)
+        reassigned = assigned_declarations(callee.statements)
+        substitutions = dict()
+        for parameter, arg in zip(callee.parameters, call.args):
+            if id(parameter) not in reassigned and _is_stable_argument(arg):
+                copies[id(parameter)] = parameter
+                substitutions[id(parameter)] = arg
+            else:
+                local = self.declare_local(arg)
+                prelude.append(local)
+                copies[id(parameter)] = local
+        body = copy.deepcopy(callee.statements, copies)
+        for node in walk_ir(body):
+            match node:
+                case LocalVariableDeclarationIR():
+                    node.index = self.next_local_index
+                    self.next_local_index += 1
+                    if self.subroutine is not None:
+                        self.subroutine.local_variables_count += 1
+                case LoopStatementIR():
+                    node.index = self.next_loop_index
+                    self.next_loop_index += 1
+                case BlockStatementIR():
+                    node.index = self.next_block_index
+                    self.next_block_index += 1
+
+        def substitute(expr):
+            if isinstance(expr, VariableReferenceIR) and id(expr.declaration) in substitutions:
+                return _copy_stable_argument(substitutions[id(expr.declaration)])
+            return expr
+
+        transform_statements_expressions(body, substitute)
+        prelude += [AssignStatementIR(VariableReferenceIR(local), IntegerIR(0)) for local in
+                    nested_local_declarations(body)]
+        returns = [node for node in walk_ir(body) if isinstance(node, ReturnStatementIR)]
+        if len(returns) == 1 and body[-1] is returns[0]:
+            prelude += body[:-1]
+            return returns[0].return_value
+        if not returns:
+            prelude += body
+            return IntegerIR(0)
+        result = None
+        if callee.subroutine_kind == SubroutineKind.FUNCTION:
+            result = self.declare_local(IntegerIR(0))
+            prelude.append(result)
+        block = BlockStatementIR(self.next_block_index, [])
+        self.next_block_index += 1
+        block.body = _exit_block(body, block, result)
+        prelude.append(block)
+        return None if result is None else VariableReferenceIR(result)
+
+
+def _exit_block(statements, block: BlockStatementIR, result: LocalVariableDeclarationIR):
+    rewritten = []
+    for statement in statements:
+        match statement:
+            case ReturnStatementIR():
+                if statement.return_value is not None:
+                    rewritten.append(AssignStatementIR(VariableReferenceIR(result), statement.return_value))
+                rewritten.append(BreakStatementIR(block))
+            case IfStatementIR():
+                statement.then_block = _exit_block(statement.then_block, block, result)
+                if statement.else_block is not None:
+                    statement.else_block = _exit_block(statement.else_block, block, result)
+                rewritten.append(statement)
+            case LoopStatementIR() | BlockStatementIR():
+                statement.body = _exit_block(statement.body, block, result)
+                rewritten.append(statement)
+            case _:
+                rewritten.append(statement)
+    return rewritten
+
+
+def inline_subroutines(script: ScriptIR):
+    mark_pure_subroutines(script)
+    inlinable = set()
+    for subroutine in script.subroutines:
+        subroutine.statements = _Inliner(subroutine.statements, inlinable, subroutine).inline_block(
+            subroutine.statements)
+        if not is_recursive(subroutine) and _subroutine_size(subroutine) <= INLINE_SIZE_LIMIT:
+            inlinable.add(id(subroutine))
+    script.statements = _Inliner(script.statements, inlinable).inline_block(script.statements)
+    return script
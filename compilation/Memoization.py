@@ -0,0 +1,92 @@
+from compilation.ConstantFolding import wrap_i32
+from compilation.IRTraversal import *
+from compilation.Purity import mark_pure_subroutines
+
+MEMO_TABLE_ENTRIES = 4096
+_HASH_MULTIPLIER = 0x9E3779B1
+
+
+class _Memoizer:
+    def __init__(self, subroutine: SubroutineDeclarationIR, table: TableDeclarationIR):
+        self.subroutine = subroutine
+        self.table = table
+        self.next_local_index = next_local_index(subroutine)
+        self.slot = self.declare_local(self.hash())
+        reassigned = assigned_declarations(subroutine.statements)
+        self.keys = [self.declare_local(VariableReferenceIR(parameter)) if id(parameter) in reassigned else parameter
+                     for parameter in subroutine.parameters]
+
+    def declare_local(self, init_value):
+        local = LocalVariableDeclarationIR(self.next_local_index, init_value)
+        self.next_local_index += 1
+        self.subroutine.local_variables_count += 1
+        return local
+
+    def hash(self):
+        value = None
+        for position, parameter in enumerate(self.subroutine.parameters):
+            multiplier = IntegerIR(wrap_i32(_HASH_MULTIPLIER * (2 * position + 1)))
+            term = BinaryOperationIR(VariableReferenceIR(parameter), multiplier, BinaryOperatorKind.MUL)
+            value = term if value is None else BinaryOperationIR(value, term, BinaryOperatorKind.PLUS)
+        slot = BinaryOperationIR(value, IntegerIR(MEMO_TABLE_ENTRIES - 1), BinaryOperatorKind.AND)
+        return BinaryOperationIR(slot, IntegerIR(self.entry_size()), BinaryOperatorKind.MUL)
+
+    def entry_size(self):
+        return len(self.subroutine.parameters) + 2
+
+    def position(self, offset):
+        if offset == 0:
+            return VariableReferenceIR(self.slot)
+        return BinaryOperationIR(VariableReferenceIR(self.slot), IntegerIR(offset), BinaryOperatorKind.PLUS)
+
+    def lookup(self):
+        condition = BinaryOperationIR(TableLoadIR(self.table, self.position(0)), IntegerIR(1), BinaryOperatorKind.EQ)
+        for offset, key in enumerate(self.keys, 1):
+            matches = BinaryOperationIR(TableLoadIR(self.table, self.position(offset)), VariableReferenceIR(key),
+                                        BinaryOperatorKind.EQ)
+            condition = BinaryOperationIR(condition, matches, BinaryOperatorKind.AND)
+        cached = TableLoadIR(self.table, self.position(self.entry_size() - 1))
+        return IfStatementIR(condition, [ReturnStatementIR(cached)], None)
+
+    def store(self, statement: ReturnStatementIR):
+        result = self.declare_local(statement.return_value)
+        statements = [result, TableStoreStatementIR(self.table, self.position(0), IntegerIR(1))]
+        for offset, key in enumerate(self.keys, 1):
+            statements.append(TableStoreStatementIR(self.table, self.position(offset), VariableReferenceIR(key)))
+        statements.append(TableStoreStatementIR(self.table, self.position(self.entry_size() - 1),
+                                                VariableReferenceIR(result)))
+        return statements + [ReturnStatementIR(VariableReferenceIR(result))]
+
+    def rewrite_block(self, statements):
+        result = []
+        for statement in statements:
+            match statement:
+                case ReturnStatementIR():
+                    result += self.store(statement)
+                case IfStatementIR():
+                    statement.then_block = self.rewrite_block(statement.then_block)
+                    if statement.else_block is not None:
+                        statement.else_block = self.rewrite_block(statement.else_block)
+                    result.append(statement)
+                case LoopStatementIR() | BlockStatementIR():
+                    statement.body = self.rewrite_block(statement.body)
+                    result.append(statement)
+                case _:
+                    result.append(statement)
+        return result
+
+    def memoize(self):
+        body = self.rewrite_block(self.subroutine.statements)
+        copies = [key for key in self.keys if isinstance(key, LocalVariableDeclarationIR)]
+        self.subroutine.statements = [self.slot] + copies + [self.lookup()] + body
+
+
+def memoize_pure_functions(script: ScriptIR):
+    mark_pure_subroutines(script)
+    for subroutine in script.subroutines:
+        if subroutine.is_pure and subroutine.subroutine_kind == SubroutineKind.FUNCTION and subroutine.parameters \
+                and is_recursive(subroutine):
+            table = TableDeclarationIR(len(script.tables), MEMO_TABLE_ENTRIES * (len(subroutine.parameters) + 2))
+            script.tables.append(table)
+            _Memoizer(subroutine, table).memoize()
+    return script
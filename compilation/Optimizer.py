@@ -0,0 +1,20 @@
+from compilation.AccumulatorTransformation import introduce_accumulators
+from compilation.AlgebraicSimplification import simplify_algebraically
+from compilation.ConstantFolding import fold_constants
+from compilation.DeadCodeElimination import eliminate_dead_code
+from compilation.Inliner import inline_subroutines
+from compilation.IRNodes import ScriptIR
+from compilation.PartialEvaluation import evaluate_partially
+from compilation.Specialization import specialize_constant_arguments
+from compilation.StrengthReduction import reduce_strength
+from compilation.TailCallElimination import eliminate_tail_calls
+
+DEFAULT_PASSES = [inline_subroutines, specialize_constant_arguments, fold_constants, simplify_algebraically,
+                  eliminate_dead_code, introduce_accumulators, eliminate_tail_calls, evaluate_partially,
+                  reduce_strength]
+
+
+def optimize_script(script: ScriptIR, passes=None):
+    for optimization in DEFAULT_PASSES if passes is None else passes:
+        script = optimization(script)
+    return script
@@ -0,0 +1,170 @@
+from compilation.ConstantFolding import evaluate_binary_operation, evaluate_unary_operation
+from compilation.IRTraversal import *
+
+MAX_EVALUATION_STEPS = 100000
+MAX_EVALUATION_DEPTH = 100
+
+
+class _EvaluationAborted(Exception):
+    pass
+
+
+class _Return:
+    def __init__(self, value):
+        self.value = value
+
+
+class _Jump:
+    def __init__(self, target):
+        self.target = target
+
+
+class _Evaluator:
+    def __init__(self, max_steps: int, max_depth: int):
+        self.steps_left = max_steps
+        self.max_depth = max_depth
+        self.depth = 0
+        self.globals = dict()
+        self.tables = dict()
+        self.journal = []
+
+    def tick(self):
+        self.steps_left -= 1
+        if self.steps_left < 0:
+            raise _EvaluationAborted()
+
+    def read(self, declaration, frame):
+        if isinstance(declaration, GlobalVariableDeclarationIR):
+            frame = self.globals
+        return frame.get(id(declaration), 0)
+
+    def write(self, declaration, value, frame):
+        if isinstance(declaration, GlobalVariableDeclarationIR):
+            frame = self.globals
+        if frame is self.globals:
+            self.journal.append((id(declaration), frame.get(id(declaration))))
+        frame[id(declaration)] = value
+
+    def rollback(self):
+        for key, value in reversed(self.journal):
+            if value is None:
+                del self.globals[key]
+            else:
+                self.globals[key] = value
+        self.journal = []
+
+    def table(self, table: TableDeclarationIR, position: int):
+        if not 0 <= position < table.size:
+            raise _EvaluationAborted()
+        if id(table) not in self.tables:
+            self.tables[id(table)] = [0] * table.size
+        return self.tables[id(table)]
+
+    def call(self, call: CallIR, frame):
+        args = [self.evaluate(arg, frame) for arg in call.args]
+        if self.depth >= self.max_depth:
+            raise _EvaluationAborted()
+        subroutine = call.subroutine.declaration
+        self.depth += 1
+        signal = self.execute_block(subroutine.statements,
+                                    {id(parameter): arg for parameter, arg in zip(subroutine.parameters, args)})
+        self.depth -= 1
+        if isinstance(signal, _Return):
+            return signal.value
+        return 0
+
+    def evaluate(self, expr, frame):
+        self.tick()
+        match expr:
+            case IntegerIR():
+                return expr.val
+            case BinaryOperationIR():
+                left = self.evaluate(expr.left_op, frame)
+                return evaluate_binary_operation(expr.kind, left, self.evaluate(expr.right_op, frame))
+            case UnaryOperationIR():
+                return evaluate_unary_operation(expr.kind, self.evaluate(expr.operand, frame))
+            case ConditionalIR():
+                if self.evaluate(expr.condition, frame) != 0:
+                    return self.evaluate(expr.then_value, frame)
+                return self.evaluate(expr.else_value, frame)
+            case VariableReferenceIR():
+                return self.read(expr.declaration, frame)
+            case TableLoadIR():
+                position = self.evaluate(expr.position, frame)
+                return self.table(expr.table, position)[position]
+            case CallIR():
+                return self.call(expr, frame)
+            case _:
+                raise ValueError(expr)
+
+    def execute(self, statement, frame):
+        self.tick()
+        match statement:
+            case LocalVariableDeclarationIR() | GlobalVariableDeclarationIR():
+                self.write(statement, self.evaluate(statement.init_value, frame), frame)
+            case AssignStatementIR():
+                self.write(statement.var.declaration, self.evaluate(statement.value, frame), frame)
+            case ReturnStatementIR():
+                if statement.return_value is None:
+                    return _Return(None)
+                return _Return(self.evaluate(statement.return_value, frame))
+            case CallStatementIR():
+                self.call(statement.call, frame)
+            case TableStoreStatementIR():
+                position = self.evaluate(statement.position, frame)
+                value = self.evaluate(statement.value, frame)
+                self.table(statement.table, position)[position] = value
+            case IfStatementIR():
+                if self.evaluate(statement.condition, frame) != 0:
+                    return self.execute_block(statement.then_block, frame)
+                if statement.else_block is not None:
+                    return self.execute_block(statement.else_block, frame)
+            case LoopStatementIR():
+                while True:
+                    signal = self.execute_block(statement.body, frame)
+                    if not (isinstance(signal, _Jump) and signal.target is statement):
+                        return signal
+            case ContinueStatementIR():
+                return _Jump(statement.loop)
+            case BlockStatementIR():
+                signal = self.execute_block(statement.body, frame)
+                if not (isinstance(signal, _Jump) and signal.target is statement):
+                    return signal
+            case BreakStatementIR():
+                return _Jump(statement.block)
+            case _:
+                raise ValueError(statement)
+        return None
+
+    def execute_block(self, statements, frame):
+        for statement in statements:
+            signal = self.execute(statement, frame)
+            if signal is not None:
+                return signal
+        return None
+
+
+def _residual_declarations(statements, values):
+    declarations = [node for node in walk_ir(statements) if
+                    isinstance(node, GlobalVariableDeclarationIR) or isinstance(node, LocalVariableDeclarationIR)]
+    for declaration in declarations:
+        declaration.init_value = IntegerIR(values.get(id(declaration), 0))
+    return declarations
+
+
+def evaluate_partially(script: ScriptIR, max_steps=MAX_EVALUATION_STEPS, max_depth=MAX_EVALUATION_DEPTH):
+    evaluator = _Evaluator(max_steps, max_depth)
+    for position, statement in enumerate(script.statements):
+        evaluator.journal = []
+        try:
+            signal = evaluator.execute(statement, evaluator.globals)
+        except (_EvaluationAborted, RecursionError):
+            evaluator.rollback()
+            script.statements = _residual_declarations(script.statements[:position], evaluator.globals) + \
+                                script.statements[position:]
+            return script
+        if isinstance(signal, _Return):
+            script.statements = [ReturnStatementIR(IntegerIR(0 if signal.value is None else signal.value))]
+            return script
+    script.statements = [ReturnStatementIR(IntegerIR(0))]
+    return script
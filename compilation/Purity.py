@@ -0,0 +1,27 @@
+from compilation.IRTraversal import *
+
+
+def _called_subroutines(subroutine: SubroutineDeclarationIR):
+    return [node.subroutine.declaration for node in walk_ir(subroutine.statements) if isinstance(node, CallIR)]
+
+
+def _touches_shared_state(subroutine: SubroutineDeclarationIR):
+    for node in walk_ir(subroutine.statements):
+        if isinstance(node, VariableReferenceIR) and isinstance(node.declaration, GlobalVariableDeclarationIR):
+            return True
+        if isinstance(node, TableLoadIR) or isinstance(node, TableStoreStatementIR):
+            return True
+    return False
+
+
+def mark_pure_subroutines(script: ScriptIR):
+    for subroutine in script.subroutines:
+        subroutine.is_pure = not _touches_shared_state(subroutine)
+    changed = True
+    while changed:
+        changed = False
+        for subroutine in script.subroutines:
+            if subroutine.is_pure and not all(callee.is_pure for callee in _called_subroutines(subroutine)):
+                subroutine.is_pure = False
+                changed = True
+    return script
@@ -0,0 +1,15 @@
+from compilation.IRTraversal import *
+
+
+def _lower_boolean_operation(expr):
+    if isinstance(expr, BinaryOperationIR) and has_side_effects(expr.right_op):
+        match expr.kind:
+            case BinaryOperatorKind.AND:
+                return ConditionalIR(expr.left_op, expr.right_op, IntegerIR(0))
+            case BinaryOperatorKind.OR:
+                return ConditionalIR(expr.left_op, IntegerIR(1), expr.right_op)
+    return expr
+
+
+def lower_short_circuit(script: ScriptIR):
+    return transform_script_expressions(script, _lower_boolean_operation)
@@ -0,0 +1,99 @@
+import copy
+
+from compilation.ConstantFolding import fold_subroutine_constants
+from compilation.IRTraversal import *
+
+SPECIALIZATION_BUDGET = 400
+MAX_SPECIALIZATIONS_PER_SUBROUTINE = 4
+
+
+def _invariant_positions(subroutine: SubroutineDeclarationIR):
+    positions = set(range(len(subroutine.parameters)))
+    for node in walk_ir(subroutine.statements):
+        if isinstance(node, CallIR) and node.subroutine.declaration is subroutine:
+            positions = {position for position in positions
+                         if isinstance(node.args[position], VariableReferenceIR) and
+                         node.args[position].declaration is subroutine.parameters[position]}
+    return positions
+
+
+class _CallSites:
+    def __init__(self):
+        self.invariant_positions = dict()
+
+    def constant_arguments(self, call: CallIR):
+        subroutine = call.subroutine.declaration
+        if id(subroutine) not in self.invariant_positions:
+            self.invariant_positions[id(subroutine)] = _invariant_positions(subroutine)
+        positions = self.invariant_positions[id(subroutine)]
+        return tuple((position, arg.val) for position, arg in enumerate(call.args)
+                     if position in positions and isinstance(arg, IntegerIR))
+
+    def collect(self, script: ScriptIR):
+        return [(node, self.constant_arguments(node)) for node in walk_ir([script])
+                if isinstance(node, CallIR) and self.constant_arguments(node)]
+
+
+def _specialize(subroutine: SubroutineDeclarationIR, constants, index, reassigned):
+    known = dict(constants)
+    copies = shared_declarations(subroutine.statements)
+    parameters = []
+    initialized = []
+    substitutions = dict()
+    next_index = free_local_index(subroutine.statements, len(subroutine.parameters) - len(known))
+    for position, parameter in enumerate(subroutine.parameters):
+        if position not in known:
+            copies[id(parameter)] = ParameterDeclarationIR(len(parameters))
+            parameters.append(copies[id(parameter)])
+        elif id(parameter) in reassigned:
+            copies[id(parameter)] = LocalVariableDeclarationIR(next_index, IntegerIR(known[position]))
+            initialized.append(copies[id(parameter)])
+            next_index += 1
+        else:
+            copies[id(parameter)] = parameter
+            substitutions[id(parameter)] = known[position]
+    statements = copy.deepcopy(subroutine.statements, copies)
+
+    def substitute(expr):
+        if isinstance(expr, VariableReferenceIR) and id(expr.declaration) in substitutions:
+            return IntegerIR(substitutions[id(expr.declaration)])
+        return expr
+
+    transform_statements_expressions(statements, substitute)
+    specialized = SubroutineDeclarationIR(subroutine.subroutine_kind, parameters, initialized + statements, index,
+                                          subroutine.local_variables_count + len(initialized))
+    specialized.is_pure = subroutine.is_pure
+    return specialized
+
+
+def specialize_constant_arguments(script: ScriptIR):
+    call_sites = _CallSites()
+    patterns = dict()
+    for call, constants in call_sites.collect(script):
+        key = (id(call.subroutine.declaration), constants)
+        if key not in patterns:
+            patterns[key] = [call.subroutine.declaration, 0]
+        patterns[key][1] += 1
+    reassigned = assigned_declarations([script])
+    budget = SPECIALIZATION_BUDGET
+    specializations = dict()
+    clones_count = dict()
+    for key, (subroutine, _) in sorted(patterns.items(), key=lambda item: -item[1][1]):
+        size = sum(1 for _ in walk_ir(subroutine.statements))
+        if size > budget or clones_count.get(id(subroutine), 0) >= MAX_SPECIALIZATIONS_PER_SUBROUTINE:
+            continue
+        budget -= size
+        clones_count[id(subroutine)] = clones_count.get(id(subroutine), 0) + 1
+        specialized = _specialize(subroutine, key[1], len(script.subroutines), reassigned)
+        script.subroutines.append(specialized)
+        specializations[key] = specialized
+    for call, constants in call_sites.collect(script):
+        specialized = specializations.get((id(call.subroutine.declaration), constants))
+        if specialized is not None:
+            known = dict(constants)
+            call.args = [arg for position, arg in enumerate(call.args) if position not in known]
+            call.subroutine = SubroutineReferenceIR(specialized)
+    reassigned = assigned_declarations([script])
+    for specialized in specializations.values():
+        fold_subroutine_constants(specialized, reassigned)
+    return script
@@ -0,0 +1,60 @@
+from compilation.ConstantFolding import wrap_i32
+from compilation.IRTraversal import *
+
+MAX_SHIFT_SEQUENCE_BITS = 4
+
+
+def _power_of_two(value: int):
+    unsigned = value & 0xFFFFFFFF
+    if unsigned == 0 or unsigned & (unsigned - 1) != 0:
+        return None
+    return unsigned.bit_length() - 1
+
+
+def _is_duplicable(expr):
+    return isinstance(expr, VariableReferenceIR) or isinstance(expr, IntegerIR)
+
+
+def _shift(expr, bits: int):
+    return BinaryOperationIR(expr, IntegerIR(bits), BinaryOperatorKind.SHL)
+
+
+def _copy(expr):
+    if isinstance(expr, IntegerIR):
+        return IntegerIR(expr.val)
+    return VariableReferenceIR(expr.declaration)
+
+
+def _reduce_multiplication(operand, factor: int):
+    if factor == 0:
+        return None if has_side_effects(operand) else IntegerIR(0)
+    if factor == 1:
+        return operand
+    if factor == -1:
+        return UnaryOperationIR(operand, UnaryOperatorKind.MINUS)
+    bits = _power_of_two(factor)
+    if bits is not None:
+        return _shift(operand, bits)
+    bits = _power_of_two(wrap_i32(-factor))
+    if bits is not None:
+        return UnaryOperationIR(_shift(operand, bits), UnaryOperatorKind.MINUS)
+    if _is_duplicable(operand):
+        for kind, delta in [(BinaryOperatorKind.PLUS, -1), (BinaryOperatorKind.MINUS, 1)]:
+            bits = _power_of_two(factor + delta)
+            if bits is not None and bits <= MAX_SHIFT_SEQUENCE_BITS:
+                return BinaryOperationIR(_shift(operand, bits), _copy(operand), kind)
+    return None
+
+
+def _reduce(expr):
+    if isinstance(expr, BinaryOperationIR) and expr.kind == BinaryOperatorKind.MUL:
+        for operand, factor in [(expr.left_op, expr.right_op), (expr.right_op, expr.left_op)]:
+            if isinstance(factor, IntegerIR):
+                reduced = _reduce_multiplication(operand, factor.val)
+                if reduced is not None:
+                    return reduced
+    return expr
+
+
+def reduce_strength(script: ScriptIR):
+    return transform_script_expressions(script, _reduce)
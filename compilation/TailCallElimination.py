@@ -0,0 +1,75 @@
+from compilation.IRTraversal import *
+
+
+class TailCallRewriter:
+    def __init__(self, subroutine: SubroutineDeclarationIR):
+        self.subroutine = subroutine
+        self.loop = LoopStatementIR(next_loop_index(subroutine.statements), subroutine.statements)
+        self.next_local_index = next_local_index(subroutine)
+        self.nested_locals = nested_local_declarations(subroutine.statements)
+        self.rewritten = False
+
+    def is_self_call(self, call):
+        return isinstance(call, CallIR) and call.subroutine.declaration is self.subroutine
+
+    def rewrite_block(self, statements, is_tail):
+        result = []
+        position = 0
+        while position < len(statements):
+            statement = statements[position]
+            is_last = position == len(statements) - 1
+            followed_by_return = not is_last and _is_empty_return(statements[position + 1])
+            match statement:
+                case ReturnStatementIR() if self.is_self_call(statement.return_value):
+                    result += self.jump_back(statement.return_value)
+                case CallStatementIR() if self.is_self_call(statement.call) and (
+                        is_tail and is_last or followed_by_return):
+                    result += self.jump_back(statement.call)
+                    if followed_by_return:
+                        position += 1
+                case IfStatementIR():
+                    statement.then_block = self.rewrite_block(statement.then_block, is_tail and is_last)
+                    if statement.else_block is not None:
+                        statement.else_block = self.rewrite_block(statement.else_block, is_tail and is_last)
+                    result.append(statement)
+                case _:
+                    result.append(statement)
+            position += 1
+        return result
+
+    def jump_back(self, call: CallIR):
+        self.rewritten = True
+        parameters = self.subroutine.parameters
+        changed = [(parameter, arg) for parameter, arg in zip(parameters, call.args)
+                   if not (isinstance(arg, VariableReferenceIR) and arg.declaration is parameter)]
+        statements = []
+        deferred = []
+        for position, (parameter, arg) in enumerate(changed):
+            if any(_reads(later_arg, parameter) for _, later_arg in changed[position + 1:]):
+                temporary = LocalVariableDeclarationIR(self.next_local_index, arg)
+                self.next_local_index += 1
+                self.subroutine.local_variables_count += 1
+                statements.append(temporary)
+                deferred.append(AssignStatementIR(VariableReferenceIR(parameter), VariableReferenceIR(temporary)))
+            else:
+                statements.append(AssignStatementIR(VariableReferenceIR(parameter), arg))
+        resets = [AssignStatementIR(VariableReferenceIR(local), IntegerIR(0)) for local in self.nested_locals]
+        return statements + deferred + resets + [ContinueStatementIR(self.loop)]
+
+
+def _is_empty_return(statement):
+    return isinstance(statement, ReturnStatementIR) and statement.return_value is None
+
+
+def _reads(expr, declaration):
+    return any(isinstance(node, VariableReferenceIR) and node.declaration is declaration for node in walk_ir([expr]))
+
+
+def eliminate_tail_calls(script: ScriptIR):
+    for subroutine in script.subroutines:
+        rewriter = TailCallRewriter(subroutine)
+        body = rewriter.rewrite_block(subroutine.statements, True)
+        if rewriter.rewritten:
+            rewriter.loop.body = body
+            subroutine.statements = [rewriter.loop]
+    return script
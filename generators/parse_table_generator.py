@@ -0,0 +1,220 @@
+from collections import deque
+
+from grammar.grammar_nodes import *
+
+END_OF_INPUT = "EOF"
+
+
+class GrammarException(Exception):
+    pass
+
+
+class Production:
+    def __init__(self, nonterminal: int, symbols, reduce):
+        self.nonterminal = nonterminal
+        self.symbols = tuple(symbols)
+        self.reduce = reduce
+        self.arity = len(self.symbols)
+        self.expansion = tuple(reversed(self.symbols))
+
+
+class ParseTable:
+    def __init__(self, names, productions, first, follow, table, defaults, fallbacks, nonterminals, node_ids):
+        self.names = names
+        self.productions = productions
+        self.first = first
+        self.follow = follow
+        self.table = table
+        self.defaults = defaults
+        self.fallbacks = fallbacks
+        self.nonterminals = nonterminals
+        self.node_ids = node_ids
+
+    def node_first(self, node):
+        if isinstance(node, Terminal):
+            return frozenset([node.name])
+        if isinstance(node, NonTerminal):
+            return self.first[self.nonterminals[node.name]]
+        return self.first[self.node_ids[node]]
+
+    def node_nullable(self, node):
+        if isinstance(node, Terminal):
+            return False
+        if isinstance(node, NonTerminal):
+            return self.defaults[self.nonterminals[node.name]] is not None
+        return self.defaults[self.node_ids[node]] is not None
+
+    def node_closing_terminal(self, node):
+        nonterminal_id = self.node_ids[node]
+        return _closing_terminal(self.productions[nonterminal_id], self.defaults[nonterminal_id],
+                                 self.follow[nonterminal_id])
+
+
+def _values_tuple(*values):
+    return values
+
+
+def _empty_star():
+    return deque()
+
+
+def _prepend(value, values):
+    values.appendleft(value)
+    return values
+
+
+def _absent():
+    return None
+
+
+class _Desugarer:
+    def __init__(self, actions):
+        self.actions = actions
+        self.names = []
+        self.productions = []
+        self.nonterminals = dict()
+        self.node_ids = dict()
+        self._ids = dict()
+        self._pending = []
+
+    def run(self, start: NonTerminal):
+        self.symbol(start, start.name)
+        while self._pending:
+            nonterminal = self._pending.pop()
+            nonterminal_id = self._ids[nonterminal]
+            action = self.actions.get(nonterminal.name)
+            if isinstance(nonterminal.rule, Concat):
+                symbols = [self.symbol(child, nonterminal.name) for child in nonterminal.rule.list]
+                self._add(nonterminal_id, symbols, _values_tuple if action is None else action)
+            else:
+                self._add(nonterminal_id, [self.symbol(nonterminal.rule, nonterminal.name)], action)
+
+    def symbol(self, node, owner: str):
+        if isinstance(node, Terminal):
+            return node.name
+        if isinstance(node, NonTerminal):
+            if node not in self._ids:
+                if node.name in self.nonterminals:
+                    raise GrammarException("Nonterminal '%s' is defined twice" % node.name)
+                self._ids[node] = self._new_nonterminal(node.name)
+                self.nonterminals[node.name] = self._ids[node]
+                self._pending.append(node)
+            return self._ids[node]
+        nonterminal_id = self._new_nonterminal("%s#%d" % (owner, len(self.names)))
+        self.node_ids[node] = nonterminal_id
+        if isinstance(node, Concat):
+            self._add(nonterminal_id, [self.symbol(child, owner) for child in node.list], _values_tuple)
+        elif isinstance(node, Or):
+            for alternative in node.list:
+                self._add(nonterminal_id, [self.symbol(alternative, owner)], None)
+        elif isinstance(node, Star):
+            self._add(nonterminal_id, [], _empty_star)
+            self._add(nonterminal_id, [self.symbol(node.expr, owner), nonterminal_id], _prepend)
+        elif isinstance(node, Question):
+            self._add(nonterminal_id, [], _absent)
+            self._add(nonterminal_id, [self.symbol(node.expr, owner)], None)
+        else:
+            raise NotImplementedError("Unknown node type")
+        return nonterminal_id
+
+    def _new_nonterminal(self, name):
+        self.names.append(name)
+        self.productions.append([])
+        return len(self.names) - 1
+
+    def _add(self, nonterminal_id, symbols, reduce):
+        if reduce is None and len(symbols) != 1:
+            reduce = _values_tuple
+        self.productions[nonterminal_id].append(Production(nonterminal_id, symbols, reduce))
+
+
+def _sequence_first(symbols, first, nullable):
+    result = set()
+    for symbol in symbols:
+        if isinstance(symbol, str):
+            result.add(symbol)
+            return result, False
+        result |= first[symbol]
+        if not nullable[symbol]:
+            return result, False
+    return result, True
+
+
+def compute_first(productions):
+    first = [set() for _ in productions]
+    nullable = [False] * len(productions)
+    changed = True
+    while changed:
+        changed = False
+        for nonterminal_id, alternatives in enumerate(productions):
+            for production in alternatives:
+                symbols_first, symbols_nullable = _sequence_first(production.symbols, first, nullable)
+                if not symbols_first <= first[nonterminal_id]:
+                    first[nonterminal_id] |= symbols_first
+                    changed = True
+                if symbols_nullable and not nullable[nonterminal_id]:
+                    nullable[nonterminal_id] = True
+                    changed = True
+    return first, nullable
+
+
+def compute_follow(productions, first, nullable, start: int):
+    follow = [set() for _ in productions]
+    follow[start].add(END_OF_INPUT)
+    changed = True
+    while changed:
+        changed = False
+        for nonterminal_id, alternatives in enumerate(productions):
+            for production in alternatives:
+                for position, symbol in enumerate(production.symbols):
+                    if isinstance(symbol, str):
+                        continue
+                    rest_first, rest_nullable = _sequence_first(production.symbols[position + 1:], first, nullable)
+                    if rest_nullable:
+                        rest_first |= follow[nonterminal_id]
+                    if not rest_first <= follow[symbol]:
+                        follow[symbol] |= rest_first
+                        changed = True
+    return follow
+
+
+def _closing_terminal(alternatives, default, follow):
+    if default is None or len(follow) != 1 or len(alternatives) != 2:
+        return None
+    return next(iter(follow))
+
+
+def _fallback(alternatives, default, follow):
+    if len(alternatives) == 1:
+        return alternatives[0]
+    if _closing_terminal(alternatives, default, follow) is not None:
+        return alternatives[0] if alternatives[1] is default else alternatives[1]
+    return default
+
+
+def build_parse_table(start: NonTerminal, actions=None):
+    desugarer = _Desugarer(dict() if actions is None else actions)
+    desugarer.run(start)
+    productions = desugarer.productions
+    first, nullable = compute_first(productions)
+    follow = compute_follow(productions, first, nullable, desugarer.nonterminals[start.name])
+    table = [dict() for _ in productions]
+    defaults = [None] * len(productions)
+    for nonterminal_id, alternatives in enumerate(productions):
+        for production in alternatives:
+            lookahead, production_nullable = _sequence_first(production.symbols, first, nullable)
+            if production_nullable:
+                if defaults[nonterminal_id] is not None:
+                    raise GrammarException("Grammar is not LL(1): '%s' has several empty derivations"
+                                           % desugarer.names[nonterminal_id])
+                defaults[nonterminal_id] = production
+                lookahead |= follow[nonterminal_id]
+            for terminal in lookahead:
+                if table[nonterminal_id].setdefault(terminal, production) is not production:
+                    raise GrammarException("Grammar is not LL(1): '%s' has conflicting productions on '%s'"
+                                           % (desugarer.names[nonterminal_id], terminal))
+    fallbacks = [_fallback(alternatives, defaults[nonterminal_id], follow[nonterminal_id])
+                 for nonterminal_id, alternatives in enumerate(productions)]
+    return ParseTable(desugarer.names, productions, [frozenset(symbols) for symbols in first],
+                      [frozenset(symbols) for symbols in follow], table, defaults, fallbacks,
+                      desugarer.nonterminals, desugarer.node_ids)
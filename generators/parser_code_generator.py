@@ -0,0 +1,129 @@
+from generators.parse_table_generator import build_parse_table
+from grammar.grammar_nodes import *
+
+
+class _CodeWriter:
+    def __init__(self, parse_table, actions):
+        self.parse_table = parse_table
+        self.actions = actions
+        self.lines = []
+        self.first_sets = dict()
+        self._counter = 0
+
+    def fresh(self, prefix):
+        self._counter += 1
+        return "%s_%d" % (prefix, self._counter)
+
+    def emit(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def first_set(self, node):
+        first = self.parse_table.node_first(node)
+        if first not in self.first_sets:
+            self.first_sets[first] = "_FIRST_%d" % len(self.first_sets)
+        return self.first_sets[first]
+
+    def enters(self, node):
+        closing = self.parse_table.node_closing_terminal(node)
+        if closing is None:
+            return "tokenizer.current().type in %s" % self.first_set(node.expr)
+        return "tokenizer.current().type != %r" % closing
+
+    def is_checked(self, node):
+        return self.parse_table.node_closing_terminal(node) is None
+
+    def expected(self, node):
+        return repr(sorted(self.parse_table.node_first(node)))
+
+    def nonterminal(self, nonterminal: NonTerminal):
+        self.emit(0, "def _parse_%s(tokenizer):" % nonterminal.name)
+        if isinstance(nonterminal.rule, Concat):
+            values = [self.node(child, 1) for child in nonterminal.rule.list]
+        else:
+            values = [self.node(nonterminal.rule, 1)]
+        if nonterminal.name in self.actions:
+            self.emit(1, "return _action_%s(%s)" % (nonterminal.name, ", ".join(values)))
+        elif isinstance(nonterminal.rule, Concat):
+            self.emit(1, "return (%s,)" % ", ".join(values))
+        else:
+            self.emit(1, "return %s" % values[0])
+        self.emit(0, "")
+        self.emit(0, "")
+
+    def node(self, node, indent, checked=False):
+        if isinstance(node, Terminal):
+            token = self.fresh("token")
+            self.emit(indent, "%s = tokenizer.current()" % token)
+            if not checked:
+                self.emit(indent, "if %s.type != %r:" % (token, node.name))
+                self.emit(indent + 1, "raise ParserException(%s, [%r])" % (token, node.name))
+            self.emit(indent, "tokenizer.advance()")
+            return token
+        value = self.fresh("value")
+        if isinstance(node, NonTerminal):
+            self.emit(indent, "%s = _parse_%s(tokenizer)" % (value, node.name))
+        elif isinstance(node, Concat):
+            values = [self.node(child, indent, checked and index == 0) for index, child in enumerate(node.list)]
+            self.emit(indent, "%s = (%s,)" % (value, ", ".join(values)))
+        elif isinstance(node, Or):
+            lookahead = self.fresh("lookahead")
+            self.emit(indent, "%s = tokenizer.current().type" % lookahead)
+            default = None
+            keyword = "if"
+            for alternative in node.list:
+                if self.parse_table.node_nullable(alternative):
+                    default = alternative
+                    continue
+                self.emit(indent, "%s %s in %s:" % (keyword, lookahead, self.first_set(alternative)))
+                self.emit(indent + 1, "%s = %s" % (value, self.node(alternative, indent + 1, True)))
+                keyword = "elif"
+            self.emit(indent, "else:")
+            if default is None:
+                self.emit(indent + 1, "raise ParserException(tokenizer.current(), %s)" % self.expected(node))
+            else:
+                self.emit(indent + 1, "%s = %s" % (value, self.node(default, indent + 1)))
+        elif isinstance(node, Star):
+            self.emit(indent, "%s = []" % value)
+            self.emit(indent, "while %s:" % self.enters(node))
+            self.emit(indent + 1, "%s.append(%s)" % (value, self.node(node.expr, indent + 1, self.is_checked(node))))
+        elif isinstance(node, Question):
+            self.emit(indent, "%s = None" % value)
+            self.emit(indent, "if %s:" % self.enters(node))
+            self.emit(indent + 1, "%s = %s" % (value, self.node(node.expr, indent + 1, self.is_checked(node))))
+        else:
+            raise NotImplementedError("Unknown node type")
+        return value
+
+
+def _named_nonterminals(start: NonTerminal):
+    found = []
+    seen = set()
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, NonTerminal):
+            if node in seen:
+                continue
+            seen.add(node)
+            found.append(node)
+            stack.append(node.rule)
+        elif isinstance(node, Or) or isinstance(node, Concat):
+            stack.extend(reversed(node.list))
+        elif isinstance(node, Question) or isinstance(node, Star):
+            stack.append(node.expr)
+    return found
+
+
+def generate_parser_source(start: NonTerminal, actions):
+    writer = _CodeWriter(build_parse_table(start), actions)
+    for nonterminal in _named_nonterminals(start):
+        writer.nonterminal(nonterminal)
+    header = ["%s = frozenset(%r)" % (name, sorted(first)) for first, name in writer.first_sets.items()]
+    return "\n".join(header + ["", ""] + writer.lines)
+
+
+def compile_parser(start: NonTerminal, actions, exception_class):
+    namespace = {"_action_" + name: action for name, action in actions.items()}
+    namespace["ParserException"] = exception_class
+    exec(compile(generate_parser_source(start, actions), "<%s parser>" % start.name, "exec"), namespace)
+    return {name[len("_parse_"):]: function for name, function in namespace.items() if name.startswith("_parse_")}
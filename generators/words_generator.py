@@ -7,7 +7,7 @@ MAX_DEPTH = 20
 
 
 def random_int_terminal():
-    return randint(-100, 100)
+    return randint(0, 100)
 
 
 def random_ident():
@@ -28,7 +28,7 @@ def generate_random_word(v, depth):
         return [v.name]
     if isinstance(v, NamedTerminal) and v.name == "IDENT":
         return [str(random_ident())]
-    if isinstance(v, NamedTerminal) and v.name == "INTEGER":
+    if isinstance(v, NamedTerminal) and v.name == "INT":
         return [random_int_terminal()]
     if isinstance(v, NonTerminal):
         return generate_random_word(v.rule, depth + 1)
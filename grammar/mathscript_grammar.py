@@ -5,6 +5,7 @@ PROCEDURE = Literal("procedure")
 RETURN = Literal("return")
 IF = Literal("if")
 ELSE = Literal("else")
+VAR = Literal("var")
 
 LEQ = Literal("<=")
 GEQ = Literal(">=")
@@ -27,48 +28,50 @@ LESS = Literal("<")
 GREATER = Literal(">")
 
 IDENT = NamedTerminal("IDENT")
-INTEGER = NamedTerminal("INTEGER")
+INTEGER = NamedTerminal("INT")
 
 script = NonTerminal("script")
+scriptElement = NonTerminal("scriptElement")
 subroutineDecl = NonTerminal("subroutineDecl")
 statement = NonTerminal("statement")
-subroutineHeading = NonTerminal("subroutineHeading")
-functionHeading = NonTerminal("functionHeading")
-procedureHeading = NonTerminal("procedureHeading")
 paramList = NonTerminal("paramList")
 block = NonTerminal("block")
 returnStatement = NonTerminal("returnStatement")
-assignStatement = NonTerminal("assignStatement")
-callStatement = NonTerminal("callStatement")
+identStatement = NonTerminal("identStatement")
+assignStatementTail = NonTerminal("assignStatementTail")
+callStatementTail = NonTerminal("callStatementTail")
 ifStatement = NonTerminal("ifStatement")
-intExpr = NonTerminal("intExpr")
-subroutineCall = NonTerminal("subroutineCall")
+variableDeclaration = NonTerminal("variableDeclaration")
 argumentList = NonTerminal("argumentList")
-boolExpr = NonTerminal("boolExpr")
-intTerm = NonTerminal("intTerm")
-intFactor = NonTerminal("intFactor")
-boolTerm = NonTerminal("boolTerm")
-boolFactor = NonTerminal("boolFactor")
+expr = NonTerminal("expr")
+conjunction = NonTerminal("conjunction")
 comparison = NonTerminal("comparison")
+additiveExpr = NonTerminal("additiveExpr")
+multiplicativeExpr = NonTerminal("multiplicativeExpr")
+factor = NonTerminal("factor")
+primary = NonTerminal("primary")
+parenthesizedExpr = NonTerminal("parenthesizedExpr")
+identOrCall = NonTerminal("identOrCall")
 
-script.rule = Star(Or([subroutineDecl, statement]))
-subroutineDecl.rule = Concat([subroutineHeading, block])
-subroutineHeading.rule = Or([functionHeading, procedureHeading])
-functionHeading.rule = Concat([FUNCTION, IDENT, paramList])
-procedureHeading.rule = Concat([PROCEDURE, IDENT, paramList])
+script.rule = Star(scriptElement)
+scriptElement.rule = Or([subroutineDecl, statement])
+subroutineDecl.rule = Concat([Or([FUNCTION, PROCEDURE]), IDENT, paramList, block])
 block.rule = Concat([OPEN_CURLY_BRACKET, Star(statement), CLOSE_CURLY_BRACKET])
 paramList.rule = Concat([OPEN_BRACKET, Question(Concat([IDENT, Star(Concat([COMMA, IDENT]))])), CLOSE_BRACKET])
-argumentList.rule = Concat([OPEN_BRACKET, Question(Concat([intExpr, Star(Concat([COMMA, intExpr]))])), CLOSE_BRACKET])
-statement.rule = Or([returnStatement, assignStatement, callStatement, ifStatement])
-returnStatement.rule = Concat([RETURN, Question(intExpr), SEMICOLON])
-assignStatement.rule = Concat([IDENT, ASSIGN, intExpr, SEMICOLON])
-callStatement.rule = Concat([subroutineCall, SEMICOLON])
-ifStatement.rule = Concat([IF, boolExpr, block, Question(Concat([ELSE, block]))])
-subroutineCall.rule = Concat([IDENT, argumentList])
-intExpr.rule = Concat([intTerm, Star(Concat([Or([PLUS, MINUS]), intTerm]))])
-intTerm.rule = Concat([intFactor, Star(Concat([MUL, intFactor]))])
-intFactor.rule = Or([INTEGER, Concat([OPEN_BRACKET, intExpr, CLOSE_BRACKET]), subroutineCall, IDENT])
-boolExpr.rule = Concat([boolTerm, Star(Concat([OR, boolTerm]))])
-boolTerm.rule = Concat([boolFactor, Star(Concat([AND, boolFactor]))])
-boolFactor.rule = Concat([Question(NOT), Or([comparison, Concat([OPEN_BRACKET, boolExpr, CLOSE_BRACKET])])])
-comparison.rule = Concat([intExpr, Or([LESS, LEQ, EQUALS, GEQ, GREATER]), intExpr])
+argumentList.rule = Concat([OPEN_BRACKET, Question(Concat([expr, Star(Concat([COMMA, expr]))])), CLOSE_BRACKET])
+statement.rule = Or([returnStatement, identStatement, ifStatement, variableDeclaration])
+returnStatement.rule = Concat([RETURN, Question(expr), SEMICOLON])
+identStatement.rule = Concat([IDENT, Or([assignStatementTail, callStatementTail])])
+assignStatementTail.rule = Concat([ASSIGN, expr, SEMICOLON])
+callStatementTail.rule = Concat([argumentList, SEMICOLON])
+ifStatement.rule = Concat([IF, expr, block, Question(Concat([ELSE, block]))])
+variableDeclaration.rule = Concat([VAR, IDENT, ASSIGN, expr, SEMICOLON])
+expr.rule = Concat([conjunction, Star(Concat([OR, conjunction]))])
+conjunction.rule = Concat([comparison, Star(Concat([AND, comparison]))])
+comparison.rule = Concat([additiveExpr, Star(Concat([Or([LESS, LEQ, EQUALS, GEQ, GREATER]), additiveExpr]))])
+additiveExpr.rule = Concat([multiplicativeExpr, Star(Concat([Or([PLUS, MINUS]), multiplicativeExpr]))])
+multiplicativeExpr.rule = Concat([factor, Star(Concat([MUL, factor]))])
+factor.rule = Concat([Question(Or([NOT, MINUS])), primary])
+primary.rule = Or([INTEGER, parenthesizedExpr, identOrCall])
+parenthesizedExpr.rule = Concat([OPEN_BRACKET, expr, CLOSE_BRACKET])
+identOrCall.rule = Concat([IDENT, Question(argumentList)])
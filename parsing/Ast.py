@@ -1,12 +1,58 @@
 from enum import Enum
 
+from parsing.LineIndex import LineIndex
+
 
 class Location:
+    __slots__ = ("line_index", "_span", "_positions")
+
     def __init__(self, line_start, column_start, line_end, column_end):
-        self.line_start = line_start
-        self.column_start = column_start
-        self.line_end = line_end
-        self.column_end = column_end
+        self.line_index = None
+        self._span = None
+        self._positions = (line_start, column_start, line_end, column_end)
+
+    @classmethod
+    def from_offsets(cls, line_index: LineIndex, start: int, end: int):
+        location = cls.__new__(cls)
+        location.line_index = line_index
+        location._span = start << 32 | end
+        location._positions = None
+        return location
+
+    @property
+    def start(self):
+        return self._span >> 32
+
+    @property
+    def end(self):
+        return self._span & 0xFFFFFFFF
+
+    @property
+    def line_start(self):
+        return self._resolve()[0]
+
+    @property
+    def column_start(self):
+        return self._resolve()[1]
+
+    @property
+    def line_end(self):
+        return self._resolve()[2]
+
+    @property
+    def column_end(self):
+        return self._resolve()[3]
+
+    def start_position(self):
+        return self._resolve()[:2]
+
+    def end_position(self):
+        return self._resolve()[2:]
+
+    def _resolve(self):
+        if self._positions is None:
+            self._positions = self.line_index.position(self.start) + self.line_index.position(self.end)
+        return self._positions
 
     def __eq__(self, other):
         if isinstance(other, Location):
@@ -18,11 +64,34 @@ class Location:
 
 
 class Node:
+    __slots__ = ("_line_index", "_location")
+
     def __init__(self, location: Location):
         self.location = location
 
+    @property
+    def location(self):
+        if self._line_index is None:
+            return self._location
+        location = Location.__new__(Location)
+        location.line_index = self._line_index
+        location._span = self._location
+        location._positions = None
+        return location
+
+    @location.setter
+    def location(self, location: Location):
+        if location is None or location.line_index is None:
+            self._line_index = None
+            self._location = location
+        else:
+            self._line_index = location.line_index
+            self._location = location._span
+
 
 class Identifier(Node):
+    __slots__ = ("name",)
+
     def __init__(self, name: str, location: Location):
         super(Identifier, self).__init__(location)
         self.name = name
@@ -34,6 +103,8 @@ class Identifier(Node):
 
 
 class Integer(Node):
+    __slots__ = ("val",)
+
     def __init__(self, val: int, location: Location):
         super(Integer, self).__init__(location)
         self.val = val
@@ -45,6 +116,8 @@ class Integer(Node):
 
 
 class ParametersList(Node):
+    __slots__ = ("parameters",)
+
     def __init__(self, parameters, location: Location):
         super(ParametersList, self).__init__(location)
         self.parameters = parameters
@@ -56,6 +129,8 @@ class ParametersList(Node):
 
 
 class ArgumentsList(Node):
+    __slots__ = ("arguments",)
+
     def __init__(self, arguments, location: Location):
         super(ArgumentsList, self).__init__(location)
         self.arguments = arguments
@@ -67,6 +142,8 @@ class ArgumentsList(Node):
 
 
 class Block(Node):
+    __slots__ = ("statements",)
+
     def __init__(self, statements, location: Location):
         super(Block, self).__init__(location)
         self.statements = statements
@@ -78,6 +155,8 @@ class Block(Node):
 
 
 class Script:
+    __slots__ = ("body", "end_location")
+
     def __init__(self, statements, end_location: Location):
         self.body = statements
         self.end_location = end_location
@@ -94,13 +173,42 @@ class SubroutineKind(Enum):
 
 
 class SubroutineDecl(Node):
+    __slots__ = ("kind", "name", "parameters", "_body", "_parse_body")
+
     def __init__(self, kind: SubroutineKind, name: Identifier, parameters: ParametersList, body: Block,
                  location: Location):
         super(SubroutineDecl, self).__init__(location)
         self.kind = kind
         self.name = name
         self.parameters = parameters
-        self.body = body
+        self._body = body
+        self._parse_body = None
+
+    @classmethod
+    def lazy(cls, kind: SubroutineKind, name: Identifier, parameters: ParametersList, parse_body,
+             location: Location):
+        subroutine = cls(kind, name, parameters, None, location)
+        subroutine._parse_body = parse_body
+        return subroutine
+
+    def materialize_body(self):
+        if self._parse_body is not None:
+            self._body = self._parse_body()
+            self._parse_body = None
+        return self._body
+
+    @property
+    def body(self):
+        return self.materialize_body()
+
+    @body.setter
+    def body(self, body: Block):
+        self._body = body
+        self._parse_body = None
+
+    @property
+    def body_parsed(self):
+        return self._parse_body is None
 
     def __eq__(self, other):
         if isinstance(other, SubroutineDecl):
@@ -112,6 +220,8 @@ class SubroutineDecl(Node):
 
 
 class ReturnStatement(Node):
+    __slots__ = ("return_value",)
+
     def __init__(self, return_value, location: Location):
         super(ReturnStatement, self).__init__(location)
         self.return_value = return_value
@@ -123,6 +233,8 @@ class ReturnStatement(Node):
 
 
 class AssignStatement(Node):
+    __slots__ = ("var", "expr")
+
     def __init__(self, var: Identifier, expr, location: Location):
         super(AssignStatement, self).__init__(location)
         self.var = var
@@ -135,6 +247,8 @@ class AssignStatement(Node):
 
 
 class VariableDeclaration(Node):
+    __slots__ = ("var", "init_expr")
+
     def __init__(self, var: Identifier, init_expr, location: Location):
         super(VariableDeclaration, self).__init__(location)
         self.var = var
@@ -147,6 +261,8 @@ class VariableDeclaration(Node):
 
 
 class Call(Node):
+    __slots__ = ("subroutine", "arguments")
+
     def __init__(self, subroutine: Identifier, arguments: ArgumentsList, location: Location):
         super(Call, self).__init__(location)
         self.subroutine = subroutine
@@ -161,6 +277,8 @@ class Call(Node):
 
 
 class CallStatement(Node):
+    __slots__ = ("call",)
+
     def __init__(self, call: Call, location: Location):
         super(CallStatement, self).__init__(location)
         self.call = call
@@ -172,6 +290,8 @@ class CallStatement(Node):
 
 
 class IfStatement(Node):
+    __slots__ = ("condition", "then_block", "else_block")
+
     def __init__(self, condition, then_block: Block, else_block: Block, location: Location):
         super(IfStatement, self).__init__(location)
         self.condition = condition
@@ -198,6 +318,7 @@ class BinaryOperatorKind(Enum):
     GEQ = ">="
     AND = "&"
     OR = "|"
+    SHL = "<<"
 
 
 class UnaryOperatorKind(Enum):
@@ -206,6 +327,8 @@ class UnaryOperatorKind(Enum):
 
 
 class BinaryOperation(Node):
+    __slots__ = ("kind", "left_operand", "right_operand")
+
     def __init__(self, kind: BinaryOperatorKind, left_operand, right_operand, location: Location):
         super(BinaryOperation, self).__init__(location)
         self.kind = kind
@@ -222,6 +345,8 @@ class BinaryOperation(Node):
 
 
 class UnaryOperation(Node):
+    __slots__ = ("kind", "operand")
+
     def __init__(self, kind: UnaryOperatorKind, operand, location: Location):
         super(UnaryOperation, self).__init__(location)
         self.kind = kind
@@ -231,3 +356,33 @@ class UnaryOperation(Node):
         if isinstance(other, UnaryOperation):
             return self.kind == other.kind and self.operand == other.operand and self.location == other.location
         raise NotImplementedError()
+
+
+def children(node):
+    match node:
+        case SubroutineDecl():
+            return [node.name, node.parameters, node.body]
+        case ParametersList():
+            return node.parameters
+        case ArgumentsList():
+            return node.arguments
+        case Block():
+            return node.statements
+        case ReturnStatement():
+            return [] if node.return_value is None else [node.return_value]
+        case AssignStatement():
+            return [node.var, node.expr]
+        case VariableDeclaration():
+            return [node.var, node.init_expr]
+        case CallStatement():
+            return [node.call]
+        case Call():
+            return [node.subroutine, node.arguments]
+        case IfStatement():
+            return [node.condition, node.then_block] + ([] if node.else_block is None else [node.else_block])
+        case BinaryOperation():
+            return [node.left_operand, node.right_operand]
+        case UnaryOperation():
+            return [node.operand]
+        case _:
+            return []
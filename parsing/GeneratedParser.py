@@ -0,0 +1,29 @@
+from generators.parser_code_generator import compile_parser
+from grammar import mathscript_grammar
+from parsing.Ast import *
+from parsing.GrammarActions import ACTIONS, token_location
+from parsing.Parser import ParserException
+from parsing.Tokenizer import Tokenizer
+
+_RULES = compile_parser(mathscript_grammar.script, ACTIONS, ParserException)
+
+
+def parse_expr(tokenizer: Tokenizer):
+    return _RULES["expr"](tokenizer)
+
+
+def parse_statement(tokenizer: Tokenizer):
+    return _RULES["statement"](tokenizer)
+
+
+def parse_block(tokenizer: Tokenizer):
+    return _RULES["block"](tokenizer)
+
+
+def parse_subroutine(tokenizer: Tokenizer):
+    return _RULES["subroutineDecl"](tokenizer)
+
+
+def parse_script(tokenizer: Tokenizer):
+    body = _RULES["script"](tokenizer)
+    return Script(body, token_location(tokenizer.current()))
@@ -0,0 +1,119 @@
+from parsing.Ast import *
+from parsing.Parser import _BINARY_OPERATORS, _UNARY_OPERATORS, _interval_location
+from parsing.Tokenizer import Token
+
+
+def token_location(token: Token):
+    return _interval_location(token.location, token.location)
+
+
+def _identifier(token: Token):
+    return Identifier(token.value, token_location(token))
+
+
+def _binary_operations(first, rest):
+    for operator_token, operand in rest:
+        first = BinaryOperation(_BINARY_OPERATORS[operator_token.type][0], first, operand,
+                                _interval_location(first.location, operand.location))
+    return first
+
+
+def _subroutine_decl(kind_token, name_token, parameters, body):
+    return SubroutineDecl(SubroutineKind(kind_token.type), _identifier(name_token), parameters, body,
+                          _interval_location(kind_token.location, body.location))
+
+
+def _param_list(first_token, parameters, last_token):
+    identifiers = []
+    if parameters is not None:
+        first_parameter, rest = parameters
+        identifiers.append(_identifier(first_parameter))
+        identifiers.extend(_identifier(parameter) for _, parameter in rest)
+    return ParametersList(identifiers, _interval_location(first_token.location, last_token.location))
+
+
+def _argument_list(first_token, arguments, last_token):
+    expressions = []
+    if arguments is not None:
+        first_argument, rest = arguments
+        expressions.append(first_argument)
+        expressions.extend(argument for _, argument in rest)
+    return ArgumentsList(expressions, _interval_location(first_token.location, last_token.location))
+
+
+def _block(first_token, statements, last_token):
+    return Block(list(statements), _interval_location(first_token.location, last_token.location))
+
+
+def _return_statement(first_token, expr, last_token):
+    return ReturnStatement(expr, _interval_location(first_token.location, last_token.location))
+
+
+def _ident_statement(ident_token, tail):
+    identifier = _identifier(ident_token)
+    if isinstance(tail[0], ArgumentsList):
+        arguments, last_token = tail
+        call = Call(identifier, arguments, _interval_location(identifier.location, arguments.location))
+        return CallStatement(call, _interval_location(call.location, last_token.location))
+    _, expr, last_token = tail
+    return AssignStatement(identifier, expr, _interval_location(identifier.location, last_token.location))
+
+
+def _if_statement(first_token, condition, then_block, else_part):
+    if else_part is None:
+        return IfStatement(condition, then_block, None, _interval_location(first_token.location, then_block.location))
+    _, else_block = else_part
+    return IfStatement(condition, then_block, else_block,
+                       _interval_location(first_token.location, else_block.location))
+
+
+def _variable_declaration(first_token, ident_token, _, expr, last_token):
+    return VariableDeclaration(_identifier(ident_token), expr,
+                               _interval_location(first_token.location, last_token.location))
+
+
+def _factor(operator_token, primary):
+    if operator_token is None:
+        return primary
+    return UnaryOperation(_UNARY_OPERATORS[operator_token.type], primary,
+                          _interval_location(operator_token.location, primary.location))
+
+
+def _primary(value):
+    if isinstance(value, Token):
+        return Integer(value.value, token_location(value))
+    return value
+
+
+def _parenthesized_expr(first_token, expr, last_token):
+    expr.location = _interval_location(first_token.location, last_token.location)
+    return expr
+
+
+def _ident_or_call(ident_token, arguments):
+    identifier = _identifier(ident_token)
+    if arguments is None:
+        return identifier
+    return Call(identifier, arguments, _interval_location(identifier.location, arguments.location))
+
+
+ACTIONS = {
+    "script": list,
+    "subroutineDecl": _subroutine_decl,
+    "paramList": _param_list,
+    "argumentList": _argument_list,
+    "block": _block,
+    "returnStatement": _return_statement,
+    "identStatement": _ident_statement,
+    "ifStatement": _if_statement,
+    "variableDeclaration": _variable_declaration,
+    "expr": _binary_operations,
+    "conjunction": _binary_operations,
+    "comparison": _binary_operations,
+    "additiveExpr": _binary_operations,
+    "multiplicativeExpr": _binary_operations,
+    "factor": _factor,
+    "primary": _primary,
+    "parenthesizedExpr": _parenthesized_expr,
+    "identOrCall": _ident_or_call,
+}
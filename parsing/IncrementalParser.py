@@ -0,0 +1,127 @@
+from bisect import bisect_left, bisect_right
+
+from parsing.Ast import *
+from parsing.LineIndex import LineIndex
+from parsing.Parser import ParserException, parse_script, parse_script_element
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
+
+
+class TextEdit:
+    def __init__(self, offset: int, deleted_length: int, inserted_text: str):
+        self.offset = offset
+        self.deleted_length = deleted_length
+        self.inserted_text = inserted_text
+
+
+class ParsedScript:
+    def __init__(self, text: str, script: Script, line_index: LineIndex):
+        self.text = text
+        self.script = script
+        self.line_index = line_index
+        self._shifts = []
+        self._shifts_origin = 0
+        _anchor_elements(self, script.body)
+
+
+class _ElementOffsets:
+    __slots__ = ("_document", "_base", "_version")
+
+    def __init__(self, document: ParsedScript, base: int):
+        self._document = document
+        self._base = base
+        self._version = document._shifts_origin + len(document._shifts)
+
+    @property
+    def base(self):
+        document = self._document
+        for offset, delta in document._shifts[self._version - document._shifts_origin:]:
+            if self._base >= offset:
+                self._base += delta
+        self._version = document._shifts_origin + len(document._shifts)
+        return self._base
+
+    def position(self, offset):
+        return self._document.line_index.position(self.base + offset)
+
+
+def parse_document(text: str):
+    line_index = LineIndex(text)
+    tokenizer = BufferedTokenizer(tokenize(text, line_index=line_index))
+    tokenizer.advance()
+    return ParsedScript(text, parse_script(tokenizer), line_index)
+
+
+def _anchor_elements(document: ParsedScript, elements):
+    for element in elements:
+        base = element.location.start
+        offsets = _ElementOffsets(document, base)
+        stack = [element]
+        while stack:
+            node = stack.pop()
+            location = node.location
+            node.location = Location.from_offsets(offsets, location.start - base, location.end - base)
+            stack.extend(children(node))
+
+
+def _element_start(element):
+    location = element.location
+    return location.line_index.base + location.start
+
+
+def _element_end(element):
+    location = element.location
+    return location.line_index.base + location.end
+
+
+def _record_shift(document: ParsedScript, offset: int, delta: int):
+    if len(document._shifts) > len(document.script.body):
+        for element in document.script.body:
+            _element_start(element)
+        document._shifts_origin += len(document._shifts)
+        document._shifts = []
+    if delta != 0:
+        document._shifts.append((offset, delta))
+
+
+def _parse_region(text: str, start: int, end: int, line_index: LineIndex):
+    tokenizer = BufferedTokenizer(tokenize(text, start, end, line_index))
+    tokenizer.advance()
+    elements = []
+    while tokenizer.current_type() != "EOF":
+        elements.append(parse_script_element(tokenizer))
+    return elements
+
+
+def apply_edit(document: ParsedScript, edit: TextEdit):
+    body = document.script.body
+    edit_end = edit.offset + edit.deleted_length
+    delta = len(edit.inserted_text) - edit.deleted_length
+    first_damaged = bisect_left(body, edit.offset - 1, key=_element_end)
+    first_kept = bisect_right(body, edit_end, key=_element_start)
+    if first_damaged > 0 and isinstance(body[first_damaged - 1], IfStatement) \
+            and body[first_damaged - 1].else_block is None:
+        first_damaged -= 1
+    region_start = 0 if first_damaged == 0 else _element_end(body[first_damaged - 1]) + 1
+
+    text = document.text[:edit.offset] + edit.inserted_text + document.text[edit_end:]
+    document.line_index.replace(edit.offset, edit.deleted_length, edit.inserted_text)
+    try:
+        while True:
+            region_end = len(text) if first_kept == len(body) else _element_start(body[first_kept]) + delta
+            try:
+                elements = _parse_region(text, region_start, region_end, document.line_index)
+                break
+            except ParserException:
+                if first_kept == len(body):
+                    raise
+                first_kept += 1
+    except Exception:
+        document.line_index.replace(edit.offset, len(edit.inserted_text), document.text[edit.offset:edit_end])
+        raise
+
+    _record_shift(document, edit.offset, delta)
+    _anchor_elements(document, elements)
+    body[first_damaged:first_kept] = elements
+    document.script.end_location = Location.from_offsets(document.line_index, len(text), len(text))
+    document.text = text
+    return document
@@ -0,0 +1,221 @@
+from parsing.Ast import *
+from parsing.Parser import ParserException, _BINARY_OPERATORS, _UNARY_OPERATORS, _eat_token, _interval_location, \
+    _tokens_location, parse_identifier, parse_int, parse_parameters
+from parsing.Tokenizer import Tokenizer
+
+
+def _run(rule):
+    stack = [rule]
+    value = None
+    while True:
+        try:
+            subrule = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            if not stack:
+                return stop.value
+            value = stop.value
+            continue
+        stack.append(subrule)
+        value = None
+
+
+def _arguments(tokenizer):
+    arguments = []
+    first_mark = _eat_token(tokenizer, "(")
+    if tokenizer.current_type() != ")":
+        arguments.append((yield _expr(tokenizer)))
+        while tokenizer.current_type() != ")":
+            _eat_token(tokenizer, ",")
+            arguments.append((yield _expr(tokenizer)))
+    last_mark = _eat_token(tokenizer, ")")
+    return ArgumentsList(arguments, _tokens_location(tokenizer, first_mark, last_mark))
+
+
+def _call(tokenizer):
+    subroutine = parse_identifier(tokenizer)
+    arguments = yield _arguments(tokenizer)
+    return Call(subroutine, arguments, _interval_location(subroutine.location, arguments.location))
+
+
+def _g(tokenizer):
+    match tokenizer.current_type():
+        case "(":
+            first_mark = _eat_token(tokenizer, "(")
+            g = yield _expr(tokenizer)
+            last_mark = _eat_token(tokenizer, ")")
+            g.location = _tokens_location(tokenizer, first_mark, last_mark)
+            return g
+        case "INT":
+            return parse_int(tokenizer)
+        case "IDENT":
+            identifier = parse_identifier(tokenizer)
+            if tokenizer.current_type() == "(":
+                arguments = yield _arguments(tokenizer)
+                return Call(identifier, arguments, _interval_location(identifier.location, arguments.location))
+            return identifier
+        case _:
+            raise ParserException(tokenizer.current(), ["(", "IDENT", "INT"])
+
+
+def _f(tokenizer):
+    unary_operator = _UNARY_OPERATORS.get(tokenizer.current_type())
+    if unary_operator is None:
+        return (yield _g(tokenizer))
+    first_mark = tokenizer.mark()
+    tokenizer.advance()
+    g = yield _g(tokenizer)
+    return UnaryOperation(unary_operator, g, _interval_location(_tokens_location(tokenizer, first_mark), g.location))
+
+
+def _binary_operations(tokenizer, left, min_binding_power):
+    operator = _BINARY_OPERATORS.get(tokenizer.current_type())
+    while operator is not None and operator[1] > min_binding_power:
+        kind, binding_power = operator
+        tokenizer.advance()
+        right = yield _f(tokenizer)
+        operator = _BINARY_OPERATORS.get(tokenizer.current_type())
+        if operator is not None and operator[1] > binding_power:
+            right = yield _binary_operations(tokenizer, right, binding_power)
+            operator = _BINARY_OPERATORS.get(tokenizer.current_type())
+        left = BinaryOperation(kind, left, right, _interval_location(left.location, right.location))
+    return left
+
+
+def _expr(tokenizer):
+    left = yield _f(tokenizer)
+    return (yield _binary_operations(tokenizer, left, 0))
+
+
+def _return(tokenizer):
+    first_mark = _eat_token(tokenizer, "return")
+    expr = None
+    if tokenizer.current_type() != ";":
+        expr = yield _expr(tokenizer)
+    last_mark = _eat_token(tokenizer, ";")
+    return ReturnStatement(expr, _tokens_location(tokenizer, first_mark, last_mark))
+
+
+def _if(tokenizer):
+    first_mark = _eat_token(tokenizer, "if")
+    condition = yield _expr(tokenizer)
+    then_block = yield _block(tokenizer)
+    end_location = then_block.location
+    else_block = None
+    if tokenizer.current_type() == "else":
+        tokenizer.advance()
+        else_block = yield _block(tokenizer)
+        end_location = else_block.location
+    return IfStatement(condition, then_block, else_block,
+                       _interval_location(_tokens_location(tokenizer, first_mark), end_location))
+
+
+def _call_statement(tokenizer):
+    call = yield _call(tokenizer)
+    last_mark = _eat_token(tokenizer, ";")
+    return CallStatement(call, _interval_location(call.location, _tokens_location(tokenizer, last_mark)))
+
+
+def _assign(tokenizer):
+    var = parse_identifier(tokenizer)
+    _eat_token(tokenizer, "=")
+    expr = yield _expr(tokenizer)
+    last_mark = _eat_token(tokenizer, ";")
+    return AssignStatement(var, expr, _interval_location(var.location, _tokens_location(tokenizer, last_mark)))
+
+
+def _variable_declaration(tokenizer):
+    first_mark = _eat_token(tokenizer, "var")
+    var = parse_identifier(tokenizer)
+    _eat_token(tokenizer, "=")
+    expr = yield _expr(tokenizer)
+    last_mark = _eat_token(tokenizer, ";")
+    return VariableDeclaration(var, expr, _tokens_location(tokenizer, first_mark, last_mark))
+
+
+def _statement(tokenizer):
+    match tokenizer.current_type():
+        case "return":
+            return (yield _return(tokenizer))
+        case "if":
+            return (yield _if(tokenizer))
+        case "IDENT":
+            tokenizer.advance()
+            match tokenizer.current_type():
+                case "(":
+                    tokenizer.rollback()
+                    return (yield _call_statement(tokenizer))
+                case "=":
+                    tokenizer.rollback()
+                    return (yield _assign(tokenizer))
+                case _:
+                    raise ParserException(tokenizer.current(), ["(", "="])
+        case "var":
+            return (yield _variable_declaration(tokenizer))
+        case _:
+            raise ParserException(tokenizer.current(), ["return", "if", "IDENT", "var"])
+
+
+def _block(tokenizer):
+    statements = []
+    first_mark = _eat_token(tokenizer, "{")
+    while tokenizer.current_type() != "}":
+        statements.append((yield _statement(tokenizer)))
+    last_mark = _eat_token(tokenizer, "}")
+    return Block(statements, _tokens_location(tokenizer, first_mark, last_mark))
+
+
+def _subroutine(tokenizer):
+    match tokenizer.current_type():
+        case "function":
+            subroutine_kind = SubroutineKind.FUNCTION
+        case "procedure":
+            subroutine_kind = SubroutineKind.PROCEDURE
+        case _:
+            raise ParserException(tokenizer.current(), ["function", "procedure"])
+    first_mark = tokenizer.mark()
+    tokenizer.advance()
+    name = parse_identifier(tokenizer)
+    params = parse_parameters(tokenizer)
+    body = yield _block(tokenizer)
+    return SubroutineDecl(subroutine_kind, name, params, body,
+                          _interval_location(_tokens_location(tokenizer, first_mark), body.location))
+
+
+def _script_element(tokenizer):
+    if tokenizer.current_type() in ["function", "procedure"]:
+        return (yield _subroutine(tokenizer))
+    if tokenizer.current_type() in ["return", "IDENT", "if", "var"]:
+        return (yield _statement(tokenizer))
+    raise ParserException(tokenizer.current(), ["function", "procedure", "return", "IDENT", "if", "var"])
+
+
+def _script(tokenizer):
+    body = []
+    while tokenizer.current_type() != "EOF":
+        body.append((yield _script_element(tokenizer)))
+    return Script(body, _tokens_location(tokenizer, tokenizer.mark()))
+
+
+def parse_expr(tokenizer: Tokenizer):
+    return _run(_expr(tokenizer))
+
+
+def parse_statement(tokenizer: Tokenizer):
+    return _run(_statement(tokenizer))
+
+
+def parse_block(tokenizer: Tokenizer):
+    return _run(_block(tokenizer))
+
+
+def parse_subroutine(tokenizer: Tokenizer):
+    return _run(_subroutine(tokenizer))
+
+
+def parse_script_element(tokenizer: Tokenizer):
+    return _run(_script_element(tokenizer))
+
+
+def parse_script(tokenizer: Tokenizer):
+    return _run(_script(tokenizer))
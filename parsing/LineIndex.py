@@ -0,0 +1,61 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+TAB_WIDTH = 4
+
+_NEWLINE_REGEX = re.compile("\n")
+_TAB_REGEX = re.compile("\t")
+
+
+class LineIndex:
+    def __init__(self, text=""):
+        self._text = text
+        self._line_starts = None
+        self._tabs = None
+        self._pending = []
+
+    def position(self, offset):
+        if self._line_starts is None:
+            self._build()
+        if self._pending:
+            self._apply_pending()
+        line = bisect_right(self._line_starts, offset)
+        line_start = self._line_starts[line - 1]
+        tabs_count = bisect_left(self._tabs, offset) - bisect_left(self._tabs, line_start)
+        return line, offset - line_start + 1 + (TAB_WIDTH - 1) * tabs_count
+
+    def extend(self, text, offset):
+        if self._line_starts is None:
+            self._build()
+        if self._pending:
+            self._apply_pending()
+        self._line_starts.extend(offset + match.end() for match in _NEWLINE_REGEX.finditer(text))
+        self._tabs.extend(offset + match.start() for match in _TAB_REGEX.finditer(text))
+
+    def replace(self, offset, deleted_length, inserted_text):
+        if self._line_starts is None:
+            self._text = self._text[:offset] + inserted_text + self._text[offset + deleted_length:]
+            return
+        self._pending.append((offset, deleted_length, inserted_text))
+
+    def _apply_pending(self):
+        for offset, deleted_length, inserted_text in self._pending:
+            delta = len(inserted_text) - deleted_length
+            _splice(self._line_starts, offset + 1, offset + deleted_length + 1,
+                    (offset + match.end() for match in _NEWLINE_REGEX.finditer(inserted_text)), delta)
+            _splice(self._tabs, offset, offset + deleted_length,
+                    (offset + match.start() for match in _TAB_REGEX.finditer(inserted_text)), delta)
+        self._pending = []
+
+    def _build(self):
+        self._line_starts = array("i", [0])
+        self._line_starts.extend(match.end() for match in _NEWLINE_REGEX.finditer(self._text))
+        self._tabs = array("i", (match.start() for match in _TAB_REGEX.finditer(self._text)))
+        self._text = None
+
+
+def _splice(positions, removed_from, removed_to, inserted, delta):
+    first = bisect_left(positions, removed_from)
+    last = bisect_left(positions, removed_to)
+    positions[first:] = array("i", inserted) + array("i", (position + delta for position in positions[last:]))
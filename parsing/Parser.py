@@ -1,4 +1,3 @@
-import parsing.Tokenizer
 from parsing.Tokenizer import *
 from parsing.Ast import *
 
@@ -7,7 +6,7 @@ class ParserException(Exception):
     def __init__(self, bad_token: Token, expected_types):
         super(ParserException, self).__init__("Unexpected token '%s' at %s. I was expecting %s" % (
             bad_token.value,
-            bad_token.location,
+            "unknown location" if bad_token.location is None else bad_token.location,
             ", or ".join(map(lambda x: x if x in ["IDENT", "INT"] else "'%s'" % x, expected_types))))
         self.bad_token = bad_token
         self.expected_types = expected_types
@@ -17,93 +16,103 @@ class ParserException(Exception):
             return self.bad_token == other.bad_token and set(self.expected_types) == set(other.expected_types)
 
 
-def _eat_token(tokenizer, token_type):
-    token = tokenizer.current()
-    if token.type == token_type:
-        tokenizer.advance()
-        return token
-    raise ParserException(token, [token_type])
+_BINDING_POWERS = {
+    BinaryOperatorKind.OR: 1,
+    BinaryOperatorKind.AND: 2,
+    BinaryOperatorKind.LESS: 3,
+    BinaryOperatorKind.LEQ: 3,
+    BinaryOperatorKind.EQ: 3,
+    BinaryOperatorKind.GEQ: 3,
+    BinaryOperatorKind.GREATER: 3,
+    BinaryOperatorKind.PLUS: 4,
+    BinaryOperatorKind.MINUS: 4,
+    BinaryOperatorKind.MUL: 5,
+}
 
+_BINARY_OPERATORS = {kind.value: (kind, binding_power) for kind, binding_power in _BINDING_POWERS.items()}
+_UNARY_OPERATORS = {kind.value: kind for kind in UnaryOperatorKind}
 
-def _get_start_position(location):
-    match location:
-        case parsing.Tokenizer.Location():
-            return location.line, location.column_start
-        case parsing.Parser.Location():
-            return location.line_start, location.column_start
 
-
-def _get_end_position(location):
-    match location:
-        case parsing.Tokenizer.Location():
-            return location.line, location.column_end
-        case parsing.Parser.Location():
-            return location.line_end, location.column_end
+def _eat_token(tokenizer, token_type):
+    if tokenizer.current_type() == token_type:
+        mark = tokenizer.mark()
+        tokenizer.advance()
+        return mark
+    raise ParserException(tokenizer.current(), [token_type])
 
 
 def _interval_location(from_location, to_location):
-    line_start, column_start = _get_start_position(from_location)
-    line_end, column_end = _get_end_position(to_location)
-    return parsing.Parser.Location(line_start, column_start, line_end, column_end)
+    if from_location is None or to_location is None:
+        return None
+    if from_location.line_index is not None and from_location.line_index is to_location.line_index:
+        return Location.from_offsets(from_location.line_index, from_location.start, to_location.end)
+    line_start, column_start = from_location.start_position()
+    line_end, column_end = to_location.end_position()
+    return Location(line_start, column_start, line_end, column_end)
 
 
-def _from_token_location(token: Token):
-    return Location(token.location.line, token.location.column_start, token.location.line, token.location.column_end)
+def _tokens_location(tokenizer, first_mark, last_mark=None):
+    span = tokenizer.span(first_mark, first_mark if last_mark is None else last_mark)
+    if span is None:
+        return None
+    return Location.from_offsets(tokenizer.line_index, *span)
 
 
 def parse_identifier(tokenizer: Tokenizer):
-    token = _eat_token(tokenizer, "IDENT")
-    return Identifier(token.value, _from_token_location(token))
+    name = tokenizer.current_value()
+    mark = _eat_token(tokenizer, "IDENT")
+    return Identifier(name, _tokens_location(tokenizer, mark))
 
 
 def parse_int(tokenizer: Tokenizer):
-    token = _eat_token(tokenizer, "INT")
-    return Integer(token.value, _from_token_location(token))
+    value = tokenizer.current_value()
+    mark = _eat_token(tokenizer, "INT")
+    return Integer(value, _tokens_location(tokenizer, mark))
 
 
 def parse_arguments(tokenizer: Tokenizer):
     arguments = []
-    first_token = _eat_token(tokenizer, "(")
-    if tokenizer.current().type == ")":
-        last_token = _eat_token(tokenizer, ")")
-        return ArgumentsList(arguments, _interval_location(first_token.location, last_token.location))
+    first_mark = _eat_token(tokenizer, "(")
+    if tokenizer.current_type() == ")":
+        last_mark = _eat_token(tokenizer, ")")
+        return ArgumentsList(arguments, _tokens_location(tokenizer, first_mark, last_mark))
     arguments.append(parse_expr(tokenizer))
-    while tokenizer.current().type != ")":
+    while tokenizer.current_type() != ")":
         _eat_token(tokenizer, ",")
         arguments.append(parse_expr(tokenizer))
-    last_token = _eat_token(tokenizer, ")")
-    return ArgumentsList(arguments, _interval_location(first_token.location, last_token.location))
+    last_mark = _eat_token(tokenizer, ")")
+    return ArgumentsList(arguments, _tokens_location(tokenizer, first_mark, last_mark))
 
 
 def parse_parameters(tokenizer):
     params = []
-    first_token = _eat_token(tokenizer, "(")
-    if tokenizer.current().type == ")":
-        last_token = _eat_token(tokenizer, ")")
-        return ParametersList(params, _interval_location(first_token.location, last_token.location))
+    first_mark = _eat_token(tokenizer, "(")
+    if tokenizer.current_type() == ")":
+        last_mark = _eat_token(tokenizer, ")")
+        return ParametersList(params, _tokens_location(tokenizer, first_mark, last_mark))
     params.append(parse_identifier(tokenizer))
-    while tokenizer.current().type != ")":
+    while tokenizer.current_type() != ")":
         _eat_token(tokenizer, ",")
         params.append(parse_identifier(tokenizer))
-    last_token = _eat_token(tokenizer, ")")
-    return ParametersList(params, _interval_location(first_token.location, last_token.location))
+    last_mark = _eat_token(tokenizer, ")")
+    return ParametersList(params, _tokens_location(tokenizer, first_mark, last_mark))
 
 
 def parse_call_statement(tokenizer):
     call = parse_call(tokenizer)
-    last_token = _eat_token(tokenizer, ";")
-    return CallStatement(call, _interval_location(call.location, last_token.location))
+    last_mark = _eat_token(tokenizer, ";")
+    return CallStatement(call, _interval_location(call.location, _tokens_location(tokenizer, last_mark)))
 
 
 def parse_statement(tokenizer):
-    match tokenizer.current().type:
+    match tokenizer.current_type():
         case "return":
             return parse_return(tokenizer)
         case "if":
             return parse_if(tokenizer)
         case "IDENT":
             tokenizer.advance()
-            match tokenizer.current().type:
+            match tokenizer.current_type():
                 case "(":
                     tokenizer.rollback()
                     return parse_call_statement(tokenizer)
@@ -115,153 +124,110 @@ def parse_statement(tokenizer):
         case "var":
             return parse_variable_declaration(tokenizer)
         case _:
-            raise ParserException(tokenizer.current(), ["return", "if", "IDENT"])
+            raise ParserException(tokenizer.current(), ["return", "if", "IDENT", "var"])
 
 
 def parse_block(tokenizer):
     statements = []
-    first_token = _eat_token(tokenizer, "{")
-    while tokenizer.current().type != "}":
+    first_mark = _eat_token(tokenizer, "{")
+    while tokenizer.current_type() != "}":
         statements.append(parse_statement(tokenizer))
-    last_token = _eat_token(tokenizer, "}")
-    return Block(statements, _interval_location(first_token.location, last_token.location))
+    last_mark = _eat_token(tokenizer, "}")
+    return Block(statements, _tokens_location(tokenizer, first_mark, last_mark))
 
 
-def parse_subroutine(tokenizer: Tokenizer):
-    match tokenizer.current().type:
+def parse_subroutine(tokenizer: Tokenizer, lazy_body=False):
+    match tokenizer.current_type():
         case "function":
             subroutine_kind = SubroutineKind.FUNCTION
         case "procedure":
             subroutine_kind = SubroutineKind.PROCEDURE
         case _:
             raise ParserException(tokenizer.current(), ["function", "procedure"])
-    first_token = tokenizer.current()
+    first_mark = tokenizer.mark()
     tokenizer.advance()
     name = parse_identifier(tokenizer)
     params = parse_parameters(tokenizer)
-    body = parse_block(tokenizer)
-    return SubroutineDecl(subroutine_kind, name, params, body,
-                          _interval_location(first_token.location, body.location))
+    block_tokenizer = tokenizer.skip_block() if lazy_body else None
+    if block_tokenizer is None:
+        body = parse_block(tokenizer)
+        return SubroutineDecl(subroutine_kind, name, params, body,
+                              _interval_location(_tokens_location(tokenizer, first_mark), body.location))
+    last_mark = _eat_token(tokenizer, "}")
+    return SubroutineDecl.lazy(subroutine_kind, name, params, lambda: parse_block(block_tokenizer),
+                               _tokens_location(tokenizer, first_mark, last_mark))
 
 
 def parse_return(tokenizer: Tokenizer):
-    first_token = _eat_token(tokenizer, "return")
-    if tokenizer.current().type == ";":
-        last_token = _eat_token(tokenizer, ";")
-        return ReturnStatement(None, _interval_location(first_token.location, last_token.location))
+    first_mark = _eat_token(tokenizer, "return")
+    if tokenizer.current_type() == ";":
+        last_mark = _eat_token(tokenizer, ";")
+        return ReturnStatement(None, _tokens_location(tokenizer, first_mark, last_mark))
     expr = parse_expr(tokenizer)
-    last_token = _eat_token(tokenizer, ";")
-    return ReturnStatement(expr, _interval_location(first_token.location, last_token.location))
+    last_mark = _eat_token(tokenizer, ";")
+    return ReturnStatement(expr, _tokens_location(tokenizer, first_mark, last_mark))
 
 
 def parse_g(tokenizer):
-    match tokenizer.current().type:
+    match tokenizer.current_type():
         case "(":
-            first_token = _eat_token(tokenizer, "(")
+            first_mark = _eat_token(tokenizer, "(")
             g = parse_expr(tokenizer)
-            last_token = _eat_token(tokenizer, ")")
-            g.location = _interval_location(first_token.location, last_token.location)
+            last_mark = _eat_token(tokenizer, ")")
+            g.location = _tokens_location(tokenizer, first_mark, last_mark)
             return g
         case "INT":
             return parse_int(tokenizer)
         case "IDENT":
-            name = parse_identifier(tokenizer)
-            if tokenizer.current().type == "(":
-                tokenizer.rollback()
-                return parse_call(tokenizer)
-            else:
-                return name
+            identifier = parse_identifier(tokenizer)
+            if tokenizer.current_type() == "(":
+                arguments = parse_arguments(tokenizer)
+                return Call(identifier, arguments, _interval_location(identifier.location, arguments.location))
+            return identifier
         case _:
             raise ParserException(tokenizer.current(), ["(", "IDENT", "INT"])
 
 
 def parse_f(tokenizer):
-    if tokenizer.current().type in ["!", "-"]:
-        unary_operator = UnaryOperatorKind.MINUS if tokenizer.current().type == "-" else UnaryOperatorKind.NOT
-        first_token = tokenizer.current()
-        tokenizer.advance()
-        g = parse_g(tokenizer)
-        f = UnaryOperation(unary_operator, g, _interval_location(first_token.location, g.location))
-        return f
-    return parse_g(tokenizer)
-
-
-def parse_e(tokenizer):
-    f = parse_f(tokenizer)
-    while tokenizer.current().type == "*":
-        tokenizer.advance()
-        right_hand_operand = parse_f(tokenizer)
-        f = BinaryOperation(BinaryOperatorKind.MUL, f, right_hand_operand,
-                            _interval_location(f.location, right_hand_operand.location))
-    return f
-
-
-def parse_d(tokenizer):
-    d = parse_e(tokenizer)
-    while tokenizer.current().type in ["+", "-"]:
-        if tokenizer.current().type == "+":
-            binary_operator = BinaryOperatorKind.PLUS
-        else:
-            binary_operator = BinaryOperatorKind.MINUS
-        tokenizer.advance()
-        right_hand_operand = parse_e(tokenizer)
-        d = BinaryOperation(binary_operator, d, right_hand_operand,
-                            _interval_location(d.location, right_hand_operand.location))
-    return d
-
-
-def parse_c(tokenizer):
-    c = parse_d(tokenizer)
-    while tokenizer.current().type in ["<", "<=", "==", ">=", ">"]:
-        match tokenizer.current().type:
-            case "<":
-                binary_operator = BinaryOperatorKind.LESS
-            case "<=":
-                binary_operator = BinaryOperatorKind.LEQ
-            case "==":
-                binary_operator = BinaryOperatorKind.EQ
-            case ">=":
-                binary_operator = BinaryOperatorKind.GEQ
-            case ">":
-                binary_operator = BinaryOperatorKind.GREATER
-        tokenizer.advance()
-        right_hand_operand = parse_d(tokenizer)
-        c = BinaryOperation(binary_operator, c, right_hand_operand,
-                            _interval_location(c.location, right_hand_operand.location))
-    return c
+    unary_operator = _UNARY_OPERATORS.get(tokenizer.current_type())
+    if unary_operator is None:
+        return parse_g(tokenizer)
+    first_mark = tokenizer.mark()
+    tokenizer.advance()
+    g = parse_g(tokenizer)
+    return UnaryOperation(unary_operator, g, _interval_location(_tokens_location(tokenizer, first_mark), g.location))
 
 
-def parse_b(tokenizer):
-    b = parse_c(tokenizer)
-    while tokenizer.current().type == "&":
+def _parse_binary_operations(tokenizer, left, min_binding_power):
+    operator = _BINARY_OPERATORS.get(tokenizer.current_type())
+    while operator is not None and operator[1] > min_binding_power:
+        kind, binding_power = operator
         tokenizer.advance()
-        right_hand_operand = parse_c(tokenizer)
-        b = BinaryOperation(BinaryOperatorKind.AND, b, right_hand_operand,
-                            _interval_location(b.location, right_hand_operand.location))
-    return b
+        right = parse_f(tokenizer)
+        operator = _BINARY_OPERATORS.get(tokenizer.current_type())
+        if operator is not None and operator[1] > binding_power:
+            right = _parse_binary_operations(tokenizer, right, binding_power)
+            operator = _BINARY_OPERATORS.get(tokenizer.current_type())
+        left = BinaryOperation(kind, left, right, _interval_location(left.location, right.location))
+    return left
 
 
 def parse_expr(tokenizer):
-    a = parse_b(tokenizer)
-    while tokenizer.current().type == "|":
-        tokenizer.advance()
-        right_hand_operand = parse_b(tokenizer)
-        a = BinaryOperation(BinaryOperatorKind.OR, a, right_hand_operand,
-                            _interval_location(a.location, right_hand_operand.location))
-    return a
+    return _parse_binary_operations(tokenizer, parse_f(tokenizer), 0)
 
 
 def parse_if(tokenizer: Tokenizer):
-    first_token = _eat_token(tokenizer, "if")
+    first_mark = _eat_token(tokenizer, "if")
     condition = parse_expr(tokenizer)
     then_block = parse_block(tokenizer)
     end_location = then_block.location
     else_block = None
-    if tokenizer.current().type == "else":
+    if tokenizer.current_type() == "else":
         tokenizer.advance()
         else_block = parse_block(tokenizer)
         end_location = else_block.location
-    return IfStatement(condition, then_block, else_block, _interval_location(first_token.location, end_location))
+    return IfStatement(condition, then_block, else_block,
+                       _interval_location(_tokens_location(tokenizer, first_mark), end_location))
 
 
 def parse_call(tokenizer):
@@ -274,28 +240,29 @@ def parse_assign(tokenizer: Tokenizer):
     var = parse_identifier(tokenizer)
     _eat_token(tokenizer, "=")
     expr = parse_expr(tokenizer)
-    last_token = _eat_token(tokenizer, ";")
-    return AssignStatement(var, expr, _interval_location(var.location, last_token.location))
+    last_mark = _eat_token(tokenizer, ";")
+    return AssignStatement(var, expr, _interval_location(var.location, _tokens_location(tokenizer, last_mark)))
 
 
 def parse_variable_declaration(tokenizer: Tokenizer):
-    first_token = _eat_token(tokenizer, "var")
+    first_mark = _eat_token(tokenizer, "var")
     var = parse_identifier(tokenizer)
     _eat_token(tokenizer, "=")
     expr = parse_expr(tokenizer)
-    last_token = _eat_token(tokenizer, ";")
-    return VariableDeclaration(var, expr, _interval_location(first_token.location, last_token.location))
+    last_mark = _eat_token(tokenizer, ";")
+    return VariableDeclaration(var, expr, _tokens_location(tokenizer, first_mark, last_mark))
+
+
+def parse_script_element(tokenizer: Tokenizer, lazy_bodies=False):
+    if tokenizer.current_type() in ["function", "procedure"]:
+        return parse_subroutine(tokenizer, lazy_bodies)
+    if tokenizer.current_type() in ["return", "IDENT", "if", "var"]:
+        return parse_statement(tokenizer)
+    raise ParserException(tokenizer.current(), ["function", "procedure", "return", "IDENT", "if", "var"])
 
 
-def parse_script(tokenizer: Tokenizer):
+def parse_script(tokenizer: Tokenizer, lazy_bodies=False):
     body = []
-    while tokenizer.current().type != "EOF":
-        if tokenizer.current().type in ["function", "procedure"]:
-            body.append(parse_subroutine(tokenizer))
-            continue
-        if tokenizer.current().type in ["return", "IDENT", "if", "var"]:
-            body.append(parse_statement(tokenizer))
-            continue
-        raise ParserException(tokenizer.current(), ["function", "procedure", "return", "IDENT", "if", "var"])
-    eof_token = tokenizer.current()
-    return Script(body, _from_token_location(eof_token))
+    while tokenizer.current_type() != "EOF":
+        body.append(parse_script_element(tokenizer, lazy_bodies))
+    return Script(body, _tokens_location(tokenizer, tokenizer.mark()))
@@ -0,0 +1,59 @@
+from generators.parse_table_generator import build_parse_table
+from grammar import mathscript_grammar
+from parsing.Ast import *
+from parsing.GrammarActions import ACTIONS, token_location
+from parsing.Parser import ParserException
+from parsing.Tokenizer import Tokenizer
+
+PARSE_TABLE = build_parse_table(mathscript_grammar.script, ACTIONS)
+
+
+def _parse(tokenizer: Tokenizer, nonterminal_name: str):
+    table = PARSE_TABLE.table
+    fallbacks = PARSE_TABLE.fallbacks
+    stack = [PARSE_TABLE.nonterminals[nonterminal_name]]
+    values = []
+    token = tokenizer.current()
+    while stack:
+        top = stack.pop()
+        if top.__class__ is int:
+            production = table[top].get(token.type, fallbacks[top])
+            if production is None:
+                raise ParserException(token, sorted(table[top]))
+            if production.reduce is not None:
+                stack.append(production)
+            stack.extend(production.expansion)
+        elif top.__class__ is str:
+            if token.type != top:
+                raise ParserException(token, [top])
+            values.append(token)
+            tokenizer.advance()
+            token = tokenizer.current()
+        elif top.arity == 0:
+            values.append(top.reduce())
+        else:
+            arguments = values[-top.arity:]
+            del values[-top.arity:]
+            values.append(top.reduce(*arguments))
+    return values[0]
+
+
+def parse_expr(tokenizer: Tokenizer):
+    return _parse(tokenizer, "expr")
+
+
+def parse_statement(tokenizer: Tokenizer):
+    return _parse(tokenizer, "statement")
+
+
+def parse_block(tokenizer: Tokenizer):
+    return _parse(tokenizer, "block")
+
+
+def parse_subroutine(tokenizer: Tokenizer):
+    return _parse(tokenizer, "subroutineDecl")
+
+
+def parse_script(tokenizer: Tokenizer):
+    body = _parse(tokenizer, "script")
+    return Script(body, token_location(tokenizer.current()))
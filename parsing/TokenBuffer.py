@@ -0,0 +1,173 @@
+from array import array
+
+from parsing.LineIndex import LineIndex
+from parsing.Tokenizer import Token, Location, UnexpectedCharException, IllegalRollbackException, \
+    _TOKEN_REGEX, _WHITESPACE_REGEX, _KEYWORDS
+
+TOKEN_TYPES = ("SOF", "EOF", "IDENT", "INT",
+               "if", "else", "function", "procedure", "return", "var",
+               "(", ")", "{", "}", "!", "|", "&", "+", "-", "*", ",", ";", "<", ">", "=", "<=", ">=", "==")
+
+_TYPE_IDS = {token_type: type_id for type_id, token_type in enumerate(TOKEN_TYPES)}
+_SOF = _TYPE_IDS["SOF"]
+_EOF = _TYPE_IDS["EOF"]
+_IDENT = _TYPE_IDS["IDENT"]
+_INT = _TYPE_IDS["INT"]
+_OPEN_CURLY_BRACKET = _TYPE_IDS["{"]
+_CLOSE_CURLY_BRACKET = _TYPE_IDS["}"]
+
+
+class TokenBuffer:
+    def __init__(self, line_index: LineIndex):
+        self.kinds = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.values = array("i")
+        self.value_table = []
+        self.line_index = line_index
+        self.error_offset = None
+        self.error_char = None
+        self._value_ids = dict()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def intern(self, value):
+        value_id = self._value_ids.get(value)
+        if value_id is None:
+            value_id = len(self.value_table)
+            self._value_ids[value] = value_id
+            self.value_table.append(value)
+        return value_id
+
+    def append(self, kind: int, start: int, end: int, value):
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.values.append(self.intern(value))
+
+    def type(self, index):
+        return TOKEN_TYPES[self.kinds[index]]
+
+    def value(self, index):
+        return self.value_table[self.values[index]]
+
+    def span(self, first_index, last_index):
+        last_start = self.starts[last_index]
+        return self.starts[first_index], max(self.ends[last_index] - 1, last_start)
+
+    def location(self, index):
+        if self.kinds[index] == _SOF:
+            return Location(1, 0, 0)
+        return Location.from_offsets(self.line_index, *self.span(index, index))
+
+    def raise_error(self):
+        line, column = self.line_index.position(self.error_offset)
+        raise UnexpectedCharException(self.error_char, line, column)
+
+
+def tokenize(text: str, start: int = 0, end: int = None, line_index: LineIndex = None):
+    buffer = TokenBuffer(LineIndex(text) if line_index is None else line_index)
+    buffer.append(_SOF, start, start, None)
+    match_whitespace = _WHITESPACE_REGEX.match
+    match_token = _TOKEN_REGEX.match
+    text_length = len(text) if end is None else end
+    pos = start
+    while True:
+        pos = match_whitespace(text, pos, text_length).end()
+        if pos >= text_length:
+            buffer.append(_EOF, pos, pos, '\0')
+            return buffer
+        token_match = match_token(text, pos, text_length)
+        if token_match is None:
+            buffer.error_offset = pos
+            buffer.error_char = text[pos]
+            return buffer
+        match_str = token_match.group()
+        end = token_match.end()
+        match token_match.lastgroup:
+            case "WORD":
+                if match_str in _KEYWORDS:
+                    buffer.append(_TYPE_IDS[match_str], pos, end, match_str)
+                else:
+                    buffer.append(_IDENT, pos, end, match_str)
+            case "INT":
+                buffer.append(_INT, pos, end, int(match_str))
+            case _:
+                buffer.append(_TYPE_IDS[match_str], pos, end, match_str)
+        pos = end
+
+
+class BufferedTokenizer:
+    def __init__(self, buffer: TokenBuffer, index: int = 0, locations=True):
+        self._buffer = buffer
+        self._index = index
+        self._locations = locations
+        self._current = None
+        self._current_index = -1
+
+    @property
+    def index(self):
+        return self._index
+
+    def seek(self, index: int):
+        self._index = index
+
+    def current(self):
+        if self._current_index != self._index:
+            index = self._index
+            location = self._buffer.location(index) if self._locations else None
+            self._current = Token(self._buffer.type(index), self._buffer.value(index), location)
+            self._current_index = self._index
+        return self._current
+
+    def current_type(self):
+        return TOKEN_TYPES[self._buffer.kinds[self._index]]
+
+    def current_value(self):
+        return self._buffer.value(self._index)
+
+    def mark(self):
+        return self._index
+
+    def span(self, first_mark: int, last_mark: int):
+        if not self._locations:
+            return None
+        return self._buffer.span(first_mark, last_mark)
+
+    @property
+    def line_index(self):
+        return self._buffer.line_index
+
+    def peek(self, k: int = 1):
+        index = min(self._index + k, len(self._buffer) - 1)
+        return self._buffer.type(index)
+
+    def advance(self):
+        if self._buffer.kinds[self._index] == _EOF:
+            raise EOFError()
+        if self._index + 1 == len(self._buffer):
+            self._buffer.raise_error()
+        self._index += 1
+
+    def skip_block(self):
+        kinds = self._buffer.kinds
+        if kinds[self._index] != _OPEN_CURLY_BRACKET:
+            return None
+        depth = 0
+        for index in range(self._index, len(kinds)):
+            kind = kinds[index]
+            if kind == _OPEN_CURLY_BRACKET:
+                depth += 1
+            elif kind == _CLOSE_CURLY_BRACKET:
+                depth -= 1
+                if depth == 0:
+                    block = BufferedTokenizer(self._buffer, self._index, self._locations)
+                    self._index = index
+                    return block
+        return None
+
+    def rollback(self, steps: int = 1):
+        if self._index < steps:
+            raise IllegalRollbackException()
+        self._index -= steps
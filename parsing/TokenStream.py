@@ -0,0 +1,37 @@
+from parsing.Tokenizer import Tokenizer, Token, UnexpectedCharException, _TOKEN_REGEX, _KEYWORDS
+
+
+class TokenStream(Tokenizer):
+    def __init__(self, tokens):
+        super(TokenStream, self).__init__("", locations=False)
+        self._tokens = iter(tokens)
+
+    def skip_block(self):
+        return None
+
+    def _read_next(self):
+        token = next(self._tokens, None)
+        if token is None:
+            return Token("EOF", '\0', None)
+        return token
+
+
+def word_to_token(word):
+    if isinstance(word, int):
+        return Token("INT", word, None)
+    token_match = _TOKEN_REGEX.fullmatch(word)
+    if token_match is None:
+        prefix_match = _TOKEN_REGEX.match(word)
+        position = 0 if prefix_match is None else prefix_match.end()
+        raise UnexpectedCharException(word[position] if position < len(word) else '\0', 1, position + 1)
+    match token_match.lastgroup:
+        case "WORD":
+            return Token(word if word in _KEYWORDS else "IDENT", word, None)
+        case "INT":
+            return Token("INT", int(word), None)
+        case _:
+            return Token(word, word, None)
+
+
+def words_to_tokens(words):
+    return map(word_to_token, words)
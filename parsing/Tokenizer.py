@@ -1,26 +1,53 @@
+import codecs
 import re
 
+from parsing.LineIndex import LineIndex
+
+_KEYWORDS = frozenset(["if", "else", "function", "procedure", "return", "var"])
+_TOKEN_REGEX = re.compile(r"(?P<WORD>[a-zA-Z][a-zA-Z0-9]*)|(?P<INT>\d+)|(?P<OPERATOR>[<>=]=|[(){}!|&+\-*,;<>=])")
+_WHITESPACE_REGEX = re.compile(r"[ \n\t]*")
+_BRACE_REGEX = re.compile(r"[{}]")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
 
 class Tokenizer:
-    def __init__(self, text):
+    def __init__(self, text, locations=True):
         self._text = text
-        self._text_pos = -1
-        self._line = 1
-        self._column = 0
-        self._currents = [Token("SOF", None, Location(1, 0, 0)), None]
+        self._text_pos = 0
+        self._text_offset = 0
+        self._line_index = LineIndex(text)
+        self._locations = locations
+        self._currents = [Token("SOF", None, Location(1, 0, 0) if locations else None), None]
         self._currents_index = 0
 
     def current(self):
         return self._currents[self._currents_index]
 
+    def current_type(self):
+        return self._currents[self._currents_index].type
+
+    def current_value(self):
+        return self._currents[self._currents_index].value
+
+    def mark(self):
+        return self._currents[self._currents_index]
+
+    def span(self, first_mark, last_mark):
+        if not self._locations:
+            return None
+        return first_mark.location.start, last_mark.location.end
+
+    @property
+    def line_index(self):
+        return self._line_index
+
     def advance(self):
         if self._currents_index == 0 and self._currents[1] is not None:
             self._currents_index = 1
             return
         if self.current().type == "EOF":
             raise EOFError()
-        self._text_pos += 1
-        self._column += 1
         next_token = self._read_next()
         if self._currents_index == 0:
             self._currents[1] = next_token
@@ -34,65 +61,148 @@ class Tokenizer:
             raise IllegalRollbackException()
         self._currents_index = 0
 
+    def skip_block(self):
+        if self.current().type != "{" or self._currents_index != 1:
+            return None
+        self._text_pos -= 1
+        scanned = 1
+        depth = 1
+        while depth > 0:
+            brace = _BRACE_REGEX.search(self._text, self._text_pos + scanned)
+            if brace is None:
+                scanned = len(self._text) - self._text_pos
+                if not self._fill_buffer():
+                    self._text_pos += 1
+                    return None
+                continue
+            depth += 1 if brace.group() == "{" else -1
+            scanned = brace.end() - self._text_pos
+        block_start = self._text_pos
+        block = Tokenizer(self._text[block_start:block_start + scanned], self._locations)
+        block._text_offset = self._text_offset + block_start
+        block._line_index = self._line_index
+        block.advance()
+        self._text_pos = block_start + scanned
+        self._currents[0] = self._currents[1]
+        self._currents[1] = Token("}", "}", self._location(self._text_pos - 1, self._text_pos - 1))
+        return block
+
     def _read_next(self):
         self._eat_whitespaces()
         pos = self._text_pos
         if pos >= len(self._text):
-            return Token("EOF", '\0', Location(self._line, self._column, self._column))
-        if self._text[pos] in ['(', ')', '{', '}', '!', '|', '&', '+', '-', '*', ',', ';']:
-            return Token(self._text[pos], self._text[pos], Location(self._line, self._column, self._column))
-        if self._text[pos] in ['<', '>', '=']:
-            if self._char_equals(pos + 1, '='):
-                next_token = Token(self._text[pos: pos + 2], self._text[pos: pos + 2],
-                                   Location(self._line, self._column, self._column + 1))
-                self._text_pos += 1
-                self._column += 1
-                return next_token
-            else:
-                return Token(self._text[pos], self._text[pos], Location(self._line, self._column, self._column))
-        word_match = re.match("[a-zA-Z][a-zA-Z0-9]*", self._text[pos:])
-        if word_match:
-            match_str = word_match.group(0)
-            if match_str in ["if", "else", "function", "procedure", "return", "var"]:
-                next_token = Token(match_str, match_str,
-                                   Location(self._line, self._column, self._column + len(match_str) - 1))
-            else:
-                next_token = Token("IDENT", match_str,
-                                   Location(self._line, self._column, self._column + len(match_str) - 1))
-            self._text_pos += len(match_str) - 1
-            self._column += len(match_str) - 1
-            return next_token
-        num_match = re.match(r"\d+", self._text[pos:])
-        if num_match:
-            match_str = num_match.group(0)
-            next_token = Token("INT", int(match_str),
-                               Location(self._line, self._column, self._column + len(match_str) - 1))
-            self._text_pos += len(match_str) - 1
-            self._column += len(match_str) - 1
-            return next_token
-        raise UnexpectedCharException(self._text[self._text_pos], self._line, self._column)
-
-    def _char_equals(self, pos, c):
-        return pos < len(self._text) and self._text[pos] == c
+            return Token("EOF", '\0', self._location(pos, pos))
+        token_match = _TOKEN_REGEX.match(self._text, pos)
+        while token_match is not None and token_match.end() == len(self._text) and self._fill_buffer():
+            pos = self._text_pos
+            token_match = _TOKEN_REGEX.match(self._text, pos)
+        if token_match is None:
+            line, column = self._line_index.position(self._text_offset + pos)
+            raise UnexpectedCharException(self._text[pos], line, column)
+        match_str = token_match.group()
+        match token_match.lastgroup:
+            case "WORD":
+                token_type = match_str if match_str in _KEYWORDS else "IDENT"
+                value = match_str
+            case "INT":
+                token_type = "INT"
+                value = int(match_str)
+            case _:
+                token_type = match_str
+                value = match_str
+        self._text_pos = token_match.end()
+        return Token(token_type, value, self._location(pos, self._text_pos - 1))
+
+    def _location(self, start, end):
+        if not self._locations:
+            return None
+        return Location.from_offsets(self._line_index, self._text_offset + start, self._text_offset + end)
+
+    def _fill_buffer(self):
+        return False
 
     def _eat_whitespaces(self):
-        while self._text_pos < len(self._text) and (self._text[self._text_pos] in [' ', '\n', '\t']):
-            match self._text[self._text_pos]:
-                case ' ':
-                    self._column += 1
-                case '\n':
-                    self._line += 1
-                    self._column = 1
-                case '\t':
-                    self._column += 4
-            self._text_pos += 1
+        self._text_pos = _WHITESPACE_REGEX.match(self._text, self._text_pos).end()
+        while self._text_pos == len(self._text) and self._fill_buffer():
+            self._text_pos = _WHITESPACE_REGEX.match(self._text, self._text_pos).end()
+
+
+class StreamTokenizer(Tokenizer):
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE, locations=True):
+        super(StreamTokenizer, self).__init__("", locations)
+        self._source = source
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._exhausted = False
+
+    def _fill_buffer(self):
+        while not self._exhausted:
+            chunk = self._source.read(self._chunk_size)
+            self._exhausted = len(chunk) == 0
+            if isinstance(chunk, (bytes, bytearray)):
+                chunk = self._decoder.decode(chunk, final=self._exhausted)
+            if chunk:
+                self._text_offset += self._text_pos
+                self._text = self._text[self._text_pos:] + chunk
+                self._text_pos = 0
+                self._line_index.extend(chunk, self._text_offset + len(self._text) - len(chunk))
+                return True
+        return False
 
 
 class Location:
+    __slots__ = ("line_index", "_span", "_line", "_column_start", "_column_end")
+
     def __init__(self, line, column_start, column_end):
-        self.line = line
-        self.column_start = column_start
-        self.column_end = column_end
+        self.line_index = None
+        self._span = None
+        self._line = line
+        self._column_start = column_start
+        self._column_end = column_end
+
+    @classmethod
+    def from_offsets(cls, line_index: LineIndex, start: int, end: int):
+        location = cls.__new__(cls)
+        location.line_index = line_index
+        location._span = start << 32 | end
+        location._line = None
+        return location
+
+    @property
+    def start(self):
+        return self._span >> 32
+
+    @property
+    def end(self):
+        return self._span & 0xFFFFFFFF
+
+    @property
+    def line(self):
+        if self._line is None:
+            self._resolve()
+        return self._line
+
+    @property
+    def column_start(self):
+        if self._line is None:
+            self._resolve()
+        return self._column_start
+
+    @property
+    def column_end(self):
+        if self._line is None:
+            self._resolve()
+        return self._column_end
+
+    def start_position(self):
+        return self.line, self.column_start
+
+    def end_position(self):
+        return self.line, self.column_end
+
+    def _resolve(self):
+        self._line, self._column_start = self.line_index.position(self.start)
+        self._column_end = self._column_start + self.end - self.start
 
     def __eq__(self, other):
         if isinstance(other, Location):
@@ -106,6 +216,8 @@ class Location:
 
 
 class Token:
+    __slots__ = ("type", "value", "location")
+
     def __init__(self, type, value, location: Location):
         self.type = type
         self.value = value
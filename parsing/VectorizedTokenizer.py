@@ -0,0 +1,125 @@
+import numpy as np
+
+from parsing.LineIndex import LineIndex
+from parsing.TokenBuffer import TokenBuffer, TOKEN_TYPES, tokenize, _TYPE_IDS, _SOF, _EOF, _IDENT, _INT
+from parsing.Tokenizer import _KEYWORDS
+
+_INVALID = 0
+_WHITESPACE = 1
+_LETTER = 2
+_DIGIT = 3
+_OPERATOR = 4
+
+_OPERATORS = "(){}!|&+-*,;<>="
+_PAIRED_OPERATORS = "<>="
+
+
+def _build_char_classes():
+    classes = np.full(256, _INVALID, dtype=np.uint8)
+    classes[[ord(c) for c in " \n\t"]] = _WHITESPACE
+    classes[ord("a"):ord("z") + 1] = _LETTER
+    classes[ord("A"):ord("Z") + 1] = _LETTER
+    classes[ord("0"):ord("9") + 1] = _DIGIT
+    classes[[ord(c) for c in _OPERATORS]] = _OPERATOR
+    return classes
+
+
+def _build_kinds_table(operators, suffix):
+    kinds = np.zeros(256, dtype=np.intc)
+    for operator in operators:
+        kinds[ord(operator)] = _TYPE_IDS[operator + suffix]
+    return kinds
+
+
+_CHAR_CLASSES = _build_char_classes()
+_OPERATOR_KINDS = _build_kinds_table(_OPERATORS, "")
+_PAIR_KINDS = _build_kinds_table(_PAIRED_OPERATORS, "=")
+
+
+def _shift_right(mask):
+    shifted = np.zeros_like(mask)
+    shifted[1:] = mask[:-1]
+    return shifted
+
+
+def _shift_left(mask):
+    shifted = np.zeros_like(mask)
+    shifted[:-1] = mask[1:]
+    return shifted
+
+
+def _scan_words(classes):
+    alnum = (classes == _LETTER) | (classes == _DIGIT)
+    edges = np.diff(alnum.astype(np.int8), prepend=0, append=0)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    digit_led = classes[run_starts] == _DIGIT
+    letters_after_digits = np.flatnonzero((classes == _LETTER) & _shift_right(classes == _DIGIT))
+    runs = np.searchsorted(run_starts, letters_after_digits, side="right") - 1
+    in_digit_led = digit_led[runs]
+    split_runs, first_letters = np.unique(runs[in_digit_led], return_index=True)
+    splits = run_ends.copy()
+    splits[split_runs] = letters_after_digits[in_digit_led][first_letters]
+    has_word = ~digit_led | (splits < run_ends)
+    word_starts = np.where(digit_led, splits, run_starts)[has_word]
+    return run_starts[digit_led], splits[digit_led], word_starts, run_ends[has_word]
+
+
+def _scan_operators(chars, classes):
+    positions = np.arange(len(chars))
+    equals = chars == ord("=")
+    after_comparison = _shift_right((chars == ord("<")) | (chars == ord(">")))
+    equals_run_starts = np.maximum.accumulate(np.where(equals & ~_shift_right(equals), positions, 0))
+    parity = (positions - equals_run_starts + after_comparison[equals_run_starts]) & 1
+    second_of_pair = equals & (parity == 1)
+    starts = np.flatnonzero((classes == _OPERATOR) & ~second_of_pair)
+    operator_chars = chars[starts]
+    paired = _shift_left(equals)[starts] & (_PAIR_KINDS[operator_chars] != 0)
+    kinds = np.where(paired, _PAIR_KINDS[operator_chars], _OPERATOR_KINDS[operator_chars])
+    return starts, starts + 1 + paired, kinds
+
+
+def tokenize_vectorized(text: str):
+    if not text.isascii():
+        return tokenize(text)
+    chars = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    classes = _CHAR_CLASSES[chars]
+    invalid = np.flatnonzero(classes == _INVALID)
+    scanned_length = len(chars) if len(invalid) == 0 else int(invalid[0])
+    chars = chars[:scanned_length]
+    classes = classes[:scanned_length]
+
+    buffer = TokenBuffer(LineIndex(text))
+    buffer.append(_SOF, 0, 0, None)
+
+    int_starts, int_ends, word_starts, word_ends = _scan_words(classes)
+    operator_starts, operator_ends, operator_kinds = _scan_operators(chars, classes)
+
+    int_values = [buffer.intern(int(text[start:end])) for start, end in zip(int_starts.tolist(), int_ends.tolist())]
+    word_kinds = np.full(len(word_starts), _IDENT, dtype=np.intc)
+    word_values = []
+    for index, (start, end) in enumerate(zip(word_starts.tolist(), word_ends.tolist())):
+        word = text[start:end]
+        if word in _KEYWORDS:
+            word_kinds[index] = _TYPE_IDS[word]
+        word_values.append(buffer.intern(word))
+    operator_value_ids = np.zeros(len(TOKEN_TYPES), dtype=np.intc)
+    for kind in np.unique(operator_kinds).tolist():
+        operator_value_ids[kind] = buffer.intern(TOKEN_TYPES[kind])
+
+    starts = np.concatenate((int_starts, word_starts, operator_starts))
+    order = np.argsort(starts, kind="stable")
+    columns = [(buffer.kinds, (np.full(len(int_starts), _INT, dtype=np.intc), word_kinds, operator_kinds)),
+               (buffer.starts, (int_starts, word_starts, operator_starts)),
+               (buffer.ends, (int_ends, word_ends, operator_ends)),
+               (buffer.values, (np.array(int_values, dtype=np.intc), np.array(word_values, dtype=np.intc),
+                                operator_value_ids[operator_kinds]))]
+    for column, parts in columns:
+        column.frombytes(np.concatenate(parts).astype(np.intc)[order].tobytes())
+
+    if len(invalid) == 0:
+        buffer.append(_EOF, scanned_length, scanned_length, '\0')
+    else:
+        buffer.error_offset = scanned_length
+        buffer.error_char = text[scanned_length]
+    return buffer
@@ -475,6 +475,26 @@ class TestDuplicateDeclarationErrorThree(TestBases.FailedCompilationTest):
         return DuplicateDeclaration("x", Location(1, 31, 1, 31))
 
 
+class TestDuplicateDeclarationErrorFour(TestBases.FailedCompilationTest):
+    def _get_input(self):
+        x_decl = GlobalVariableDeclarationIR(0, IntegerIR(42))
+        script_context = ScriptContext()
+        script_context.variables["x"] = x_decl
+        return "procedure p(y) {var x = 1;}", script_context, None
+
+    def _get_parsing_rule(self):
+        return parse_subroutine
+
+    def _get_compilation_rule(self):
+        return compile_subroutine_declaration
+
+    def _get_pass_context_mode(self):
+        return PassContextMode.PASS_SCRIPT_CONTEXT
+
+    def _get_expected_exception(self):
+        return DuplicateDeclaration("x", Location(1, 21, 1, 21))
+
+
 class TestVariableDeclarationNotFoundError(TestBases.FailedCompilationTest):
     def _get_input(self):
         return "x = 42;", ScriptContext(), None
@@ -694,3 +714,21 @@ class TestResultOfFunctionIgnored(TestBases.FailedCompilationTest):
 
     def _get_expected_exception(self):
         return ResultOfFunctionCallIgnored(Location(1, 26, 1, 30))
+
+
+class SkipUnusedSubroutinesTest(unittest.TestCase):
+    def _compile(self, text, **kwargs):
+        tokenizer = Tokenizer(text)
+        tokenizer.advance()
+        return compile_script(parse_script(tokenizer, lazy_bodies=True), **kwargs)
+
+    def test_unused_subroutines_are_skipped(self):
+        used = "function g(x) { return x + 1; } function f(x) { return g(x) * 2; } "
+        unused = "function h() { return h() + ; } procedure p() { print(1); } "
+        main = "return f(2);"
+        self.assertEqual(self._compile(used + main), self._compile(unused + used + main, skip_unused_subroutines=True))
+
+    def test_all_subroutines_are_compiled_by_default(self):
+        with self.assertRaises(ParserException):
+            self._compile("function h() { return h() + ; } return 0;")
+
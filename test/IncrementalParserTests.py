@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from parsing.IncrementalParser import TextEdit, parse_document, apply_edit
+from parsing.Parser import ParserException
+from parsing.Tokenizer import UnexpectedCharException
+
+_SCRIPT = """function f(x) {
+    if x < 2 {
+        return 1;
+    }
+    return x * f(x - 1);
+}
+var y = f(5);
+if y > 100 {
+\ty = 100;
+}
+procedure p(a, b) {
+    print(a + b);
+}
+p(y, 2);
+"""
+
+
+class IncrementalParsingTest(unittest.TestCase):
+    def _check_edit(self, text, edit):
+        document = parse_document(text)
+        new_text = text[:edit.offset] + edit.inserted_text + text[edit.offset + edit.deleted_length:]
+        try:
+            expected = parse_document(new_text).script
+        except (ParserException, UnexpectedCharException):
+            with self.assertRaises((ParserException, UnexpectedCharException)):
+                apply_edit(document, edit)
+            self.assertEqual(text, document.text)
+            self.assertEqual(parse_document(text).script, document.script)
+            return
+        apply_edit(document, edit)
+        self.assertEqual(new_text, document.text)
+        self.assertEqual(expected, document.script)
+        for actual_element, expected_element in zip(document.script.body, expected.body):
+            self.assertEqual(expected_element.location, actual_element.location)
+
+    def test_edit_inside_statement(self):
+        offset = _SCRIPT.index("f(5)") + 2
+        self._check_edit(_SCRIPT, TextEdit(offset, 1, "42"))
+
+    def test_reuses_untouched_elements(self):
+        document = parse_document(_SCRIPT)
+        function, procedure = document.script.body[0], document.script.body[3]
+        apply_edit(document, TextEdit(_SCRIPT.index("f(5)") + 2, 1, "42"))
+        self.assertIs(function, document.script.body[0])
+        self.assertIs(procedure, document.script.body[3])
+        self.assertEqual((11, 1), procedure.location.start_position())
+
+    def test_untouched_spans_are_not_rewritten(self):
+        document = parse_document(_SCRIPT)
+        statement = document.script.body[3].body.statements[0]
+        location = statement.location
+        apply_edit(document, TextEdit(_SCRIPT.index("f(5)") + 2, 1, "42\n"))
+        self.assertIs(location.line_index, statement.location.line_index)
+        self.assertEqual((location.start, location.end), (statement.location.start, statement.location.end))
+        self.assertEqual((13, 5), statement.location.start_position())
+
+    def test_insert_line(self):
+        self._check_edit(_SCRIPT, TextEdit(_SCRIPT.index("var"), 0, "var z = 0;\n\n"))
+
+    def test_add_else(self):
+        offset = _SCRIPT.index("procedure") - 1
+        self._check_edit(_SCRIPT, TextEdit(offset, 0, " else { y = 0; }"))
+
+    def test_remove_closing_brace(self):
+        offset = _SCRIPT.index("}\nvar")
+        self._check_edit(_SCRIPT, TextEdit(offset, 1, ""))
+        self._check_edit(_SCRIPT.replace("function", "var q = 0; function"), TextEdit(offset + 11, 1, ""))
+
+    def test_merge_tokens(self):
+        self._check_edit(_SCRIPT, TextEdit(_SCRIPT.index("p(y"), 0, "q"))
+        self._check_edit(_SCRIPT, TextEdit(_SCRIPT.index("p(y") - 1, 1, ""))
+
+    def test_errors(self):
+        self._check_edit(_SCRIPT, TextEdit(_SCRIPT.index("f(5)"), 0, "#"))
+        self._check_edit(_SCRIPT, TextEdit(_SCRIPT.index("= f(5)"), 1, ""))
+
+    def test_random_edits(self):
+        generator = random.Random(7)
+        snippets = ["", " ", "\n", "\t", "x", "1", ";", "{", "}", "(", ")", "else", "if", "var a = 1;", "} else {",
+                    "return 2;", "function g() { return 3; }", "y = y + 1;\n"]
+        text = _SCRIPT
+        for _ in range(300):
+            offset = generator.randrange(len(text) + 1)
+            deleted_length = min(generator.randrange(6), len(text) - offset)
+            edit = TextEdit(offset, deleted_length, generator.choice(snippets))
+            self._check_edit(text, edit)
+
+    def test_edit_sequence(self):
+        generator = random.Random(11)
+        document = parse_document(_SCRIPT)
+        text = _SCRIPT
+        for _ in range(200):
+            offset = generator.randrange(len(text) + 1)
+            deleted_length = min(generator.randrange(4), len(text) - offset)
+            edit = TextEdit(offset, deleted_length, generator.choice(["", " ", "\n", "x", "7", "y = 1;", "}"]))
+            try:
+                apply_edit(document, edit)
+            except (ParserException, UnexpectedCharException):
+                continue
+            text = document.text
+            self.assertEqual(parse_document(text).script, document.script)
+
+
+if __name__ == '__main__':
+    unittest.main()
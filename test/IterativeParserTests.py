@@ -0,0 +1,72 @@
+import unittest
+
+from parsing import Parser, IterativeParser
+from parsing.Ast import *
+from parsing.Tokenizer import Tokenizer
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
+
+
+def _parse(module, rule, text):
+    tokenizer = BufferedTokenizer(tokenize(text))
+    tokenizer.advance()
+    return getattr(module, rule)(tokenizer)
+
+
+class SameAstTest(unittest.TestCase):
+    def test_scripts(self):
+        for name in ["count_intersections", "fact7", "number_of_roots", "simplest", "sum_from_1_to_n"]:
+            with open('resources/%s.mas' % name) as file:
+                text = file.read()
+            self.assertEqual(_parse(Parser, "parse_script", text), _parse(IterativeParser, "parse_script", text))
+
+    def test_expressions(self):
+        for text in ["2*(1+3)", "a|b&c<d+e*-f-g", "1<2==3", "f(x, g(-y), (z))", "!(a) & -b * c"]:
+            self.assertEqual(_parse(Parser, "parse_expr", text), _parse(IterativeParser, "parse_expr", text))
+
+    def test_errors(self):
+        for rule, text in [("parse_expr", "(x>=)"), ("parse_statement", "x == 1;"), ("parse_block", "{ return 1 }"),
+                           ("parse_script", "function f() { function g() {} }"), ("parse_script", "else")]:
+            with self.assertRaises(Parser.ParserException) as expected:
+                _parse(Parser, rule, text)
+            with self.assertRaises(Parser.ParserException) as actual:
+                _parse(IterativeParser, rule, text)
+            self.assertEqual(expected.exception, actual.exception)
+
+
+class UnboundedInputTest(unittest.TestCase):
+    def test_long_sum(self):
+        terms = 20000
+        expr = _parse(IterativeParser, "parse_expr", "+".join(["1"] * terms))
+        depth = 0
+        while isinstance(expr, BinaryOperation):
+            self.assertIsInstance(expr.right_operand, Integer)
+            expr = expr.left_operand
+            depth += 1
+        self.assertEqual(terms - 1, depth)
+
+    def test_deep_parentheses(self):
+        depth = 20000
+        expr = _parse(IterativeParser, "parse_expr", "(" * depth + "x" + ")" * depth)
+        self.assertEqual(Identifier("x", Location(1, 1, 1, 2 * depth + 1)), expr)
+
+    def test_deep_right_nesting(self):
+        depth = 10000
+        expr = _parse(IterativeParser, "parse_expr", "1*(" * depth + "1" + ")" * depth)
+        for _ in range(depth):
+            self.assertEqual(BinaryOperatorKind.MUL, expr.kind)
+            expr = expr.right_operand
+        self.assertEqual(1, expr.val)
+
+    def test_deep_blocks(self):
+        depth = 10000
+        tokenizer = Tokenizer("if x {" * depth + "return;" + "}" * depth)
+        tokenizer.advance()
+        statement = IterativeParser.parse_statement(tokenizer)
+        for _ in range(depth):
+            self.assertIsInstance(statement, IfStatement)
+            statement = statement.then_block.statements[0]
+        self.assertIsInstance(statement, ReturnStatement)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ import os
 from parsing.Parser import parse_script
 from parsing.Tokenizer import Tokenizer
 from compilation.IRCompiler import compile_script as compile_to_ir
+from compilation.Optimizer import DEFAULT_PASSES, optimize_script
+from compilation.ShortCircuit import lower_short_circuit
 from backend.jvm.JVMCompiler import Compiler as JvmCompiler
 from backend.jvm.bytecodewriter.bytecompiler import ClassFile
 
@@ -27,11 +29,14 @@ class TestBases:
         def _get_expected(self):
             raise NotImplementedError()
 
+        def _get_passes(self):
+            return []
+
         def test_compilation(self):
             text = self._get_input()
             tokenizer = Tokenizer(text)
             tokenizer.advance()
-            ir = compile_to_ir(parse_script(tokenizer))
+            ir = optimize_script(compile_to_ir(parse_script(tokenizer)), self._get_passes())
             jvm_compiler = JvmCompiler(QUALIFIED_CLASS_NAME_JVM)
             clazz = jvm_compiler.compile(ir)
             _dump_class_to_disk(clazz)
@@ -95,3 +100,30 @@ class CountIntersectionsTest(TestBases.SuccessfulCompilationTestBase):
 
     def _get_expected(self):
         return 3
+
+
+class ShortCircuitTest(TestBases.SuccessfulCompilationTestBase):
+    def _get_input(self):
+        return "var calls = 0; function f(n) { calls = calls + 1; return n; } " \
+               "if 0 > 1 & f(1) > 0 { return -1; } if 1 > 0 | f(2) > 0 { calls = calls + 10; } return calls;"
+
+    def _get_passes(self):
+        return [lower_short_circuit]
+
+    def _get_expected(self):
+        return 10
+
+
+class DeadCodeTest(TestBases.SuccessfulCompilationTestBase):
+    def _get_input(self):
+        return "function sign(x) { if x > 0 { return 1; } else { if x == 0 { return 0; } else { return -1; } } } " \
+               "function f(x) { if 1 > 2 { return 100; } return sign(x) * 10; return 7; } " \
+               "return f(-3) + f(5) * 2 + sign(7);"
+
+    def _get_expected(self):
+        return 11
+
+
+class OptimizedDeadCodeTest(DeadCodeTest):
+    def _get_passes(self):
+        return DEFAULT_PASSES
@@ -0,0 +1,532 @@
+import io
+import unittest
+
+import pywasm
+import wasmtime
+from wasmtime import wat2wasm
+
+from backend.wasm.WASMCompiler import compile_script as compile_to_wasm, emit_module_code
+from compilation.AccumulatorTransformation import introduce_accumulators
+from compilation.AlgebraicSimplification import simplify_algebraically
+from compilation.ConstantFolding import fold_constants, wrap_i32
+from compilation.DeadCodeElimination import eliminate_dead_code
+from compilation.Inliner import inline_subroutines
+from compilation.IRCompiler import compile_script as compile_to_ir
+from compilation.IRNodes import *
+from compilation.IRTraversal import walk_ir
+from compilation.Memoization import memoize_pure_functions
+from compilation.Optimizer import optimize_script
+from compilation.PartialEvaluation import evaluate_partially
+from compilation.Purity import mark_pure_subroutines
+from compilation.ShortCircuit import lower_short_circuit
+from compilation.Specialization import MAX_SPECIALIZATIONS_PER_SUBROUTINE, specialize_constant_arguments
+from compilation.StrengthReduction import reduce_strength
+from compilation.TailCallElimination import eliminate_tail_calls
+from parsing.Parser import parse_script
+from parsing.Tokenizer import Tokenizer
+
+
+def _compile(text):
+    tokenizer = Tokenizer(text)
+    tokenizer.advance()
+    return compile_to_ir(parse_script(tokenizer))
+
+
+def _run(script_ir):
+    wasm_bytecode = wat2wasm(emit_module_code(compile_to_wasm(script_ir)))
+    runtime = pywasm.Runtime(pywasm.binary.Module.from_reader(io.BytesIO(wasm_bytecode)))
+    return runtime.exec('main', [])
+
+
+def _run_native(script_ir):
+    engine = wasmtime.Engine()
+    store = wasmtime.Store(engine)
+    module = wasmtime.Module(engine, emit_module_code(compile_to_wasm(script_ir)))
+    return wasmtime.Instance(store, module, []).exports(store)["main"](store)
+
+
+class ConstantFoldingTest(unittest.TestCase):
+    def _assert_folded(self, expected, text):
+        self.assertEqual(_compile(expected), fold_constants(_compile(text)))
+
+    def _assert_folded_to_integer(self, expected: int, text):
+        self.assertEqual(ReturnStatementIR(IntegerIR(expected)), fold_constants(_compile(text)).statements[0])
+
+    def test_arithmetic(self):
+        self._assert_folded("return 19;", "return 2 * (3 + 4) - -5;")
+
+    def test_i32_wraparound(self):
+        self._assert_folded_to_integer(-2147483648, "return 2147483647 + 1;")
+        self._assert_folded_to_integer(0, "return 65536 * 65536;")
+        self._assert_folded_to_integer(2147483647, "return -2147483647 - 2;")
+        self._assert_folded_to_integer(-2147483648, "return -(-2147483647 - 1);")
+
+    def test_comparisons_and_boolean_operators(self):
+        script_ir = fold_constants(_compile("if 1 < 2 & !(3 == 4) | 0 > 1 { return 1; } "
+                                            "if 2 <= 1 | 3 >= 4 & 5 == 5 { return 2; } return 0;"))
+        self.assertEqual(IntegerIR(1), script_ir.statements[0].condition)
+        self.assertEqual(IntegerIR(0), script_ir.statements[1].condition)
+
+    def test_unassigned_variables_are_propagated(self):
+        self._assert_folded("var g = 4; function f(x) { var a = 3; return x + 12; } return f(4);",
+                            "var g = 4; function f(x) { var a = 3; return x + a * g; } return f(g);")
+
+    def test_reassigned_variables_are_kept(self):
+        text = "var a = 1; function f() { var b = 2; b = a; a = b + 1; return b; } return a + f();"
+        self.assertEqual(_compile(text), fold_constants(_compile(text)))
+
+    def test_declarations_in_nested_blocks_are_scoped(self):
+        self._assert_folded("function f(x) { if x > 0 { var a = 5; return 5; } return a; } return f(1);",
+                            "function f(x) { if x > 0 { var a = 5; return a; } return a; } return f(1);")
+
+
+class ShortCircuitTest(unittest.TestCase):
+    def test_lowering(self):
+        script_ir = lower_short_circuit(_compile(
+            "var g = 0; function f(n) { g = g + 1; return n; } "
+            "if g > 0 & f(1) > 0 | g < 0 & g > 1 { return 1; } return 0;"))
+        condition = script_ir.statements[1].condition
+        self.assertIsInstance(condition, BinaryOperationIR)
+        self.assertEqual(BinaryOperatorKind.OR, condition.kind)
+        self.assertIsInstance(condition.left_op, ConditionalIR)
+        self.assertEqual(IntegerIR(0), condition.left_op.else_value)
+        self.assertIsInstance(condition.right_op, BinaryOperationIR)
+
+    def test_right_operand_is_skipped(self):
+        text = "var calls = 0; function f(n) { calls = calls + 1; return n; } " \
+               "if 0 > 1 & f(1) > 0 { return -1; } if 1 > 0 | f(2) > 0 { calls = calls + 10; } " \
+               "if 1 > 0 & f(3) > 0 | f(4) > 0 { calls = calls + 100; } return calls;"
+        self.assertEqual(114, _run(_compile(text)))
+        self.assertEqual(111, _run(lower_short_circuit(_compile(text))))
+        self.assertEqual(111, _run(fold_constants(lower_short_circuit(_compile(text)))))
+
+    def test_constant_condition_is_folded(self):
+        script_ir = fold_constants(lower_short_circuit(_compile(
+            "function f(n) { return n; } if 1 > 2 & f(1) > 0 { return 1; } return 0;")))
+        self.assertEqual(IntegerIR(0), script_ir.statements[0].condition)
+
+
+class TailCallEliminationTest(unittest.TestCase):
+    SUM = "function sum(n, acc) { if n <= 0 { return acc; } return sum(n - 1, acc + n); } return sum(%d, 0);"
+
+    def test_self_tail_call_becomes_loop(self):
+        script_ir = eliminate_tail_calls(_compile(self.SUM % 10))
+        subroutine = script_ir.subroutines[0]
+        self.assertEqual(1, len(subroutine.statements))
+        self.assertIsInstance(subroutine.statements[0], LoopStatementIR)
+        self.assertFalse(any(isinstance(node, CallIR) for node in walk_ir(subroutine.statements)))
+
+    def test_non_tail_calls_are_kept(self):
+        with open('resources/sum_from_1_to_n.mas') as file:
+            text = file.read()
+        self.assertEqual(_compile(text), eliminate_tail_calls(_compile(text)))
+
+    def test_results(self):
+        for expected, text in [
+            (55, "function fib(n, a, b) { if n == 0 { return a; } return fib(n - 1, b, a + b); } return fib(10, 0, 1);"),
+            (55, "var total = 0; procedure add(n) { if n > 0 { total = total + n; add(n - 1); } } "
+                 "add(10); return total;"),
+            (55, "var total = 0; procedure add(n) { if n <= 0 { return; } total = total + n; add(n - 1); return; } "
+                 "add(10); return total;"),
+            (12, "function f(a, b) { var c = 2; if a > 0 { var d = 1; return f(a - d, b + c); } return b; } "
+                 "return f(6, 0);"),
+            (5, "function f(n, acc) { if n == 3 { var t = 5; } if n < 1 { return acc + t; } "
+                "return f(n - 1, acc + t); } return f(5, 0);")]:
+            self.assertEqual(expected, _run(_compile(text)))
+            self.assertEqual(expected, _run(eliminate_tail_calls(_compile(text))))
+
+    def test_deep_recursion(self):
+        text = self.SUM % 1000000
+        with self.assertRaises(wasmtime.Trap):
+            _run_native(_compile(text))
+        self.assertEqual(wrap_i32(1000000 * 1000001 // 2), _run_native(eliminate_tail_calls(_compile(text))))
+
+
+class AccumulatorTransformationTest(unittest.TestCase):
+    SUM = "function sum(n) { if n <= 0 { return 0; } return n + sum(n - 1); } return sum(%d);"
+
+    def test_linear_recursion_becomes_loop(self):
+        script_ir = introduce_accumulators(_compile(self.SUM % 10))
+        subroutine = script_ir.subroutines[0]
+        self.assertIsInstance(subroutine.statements[0], LocalVariableDeclarationIR)
+        self.assertIsInstance(subroutine.statements[1], LoopStatementIR)
+        self.assertFalse(any(isinstance(node, CallIR) for node in walk_ir(subroutine.statements)))
+
+    def test_unsupported_recursion_is_kept(self):
+        for text in [
+            "function fib(n) { if n < 2 { return n; } return fib(n - 1) + fib(n - 2); } return fib(10);",
+            "function f(n) { if n <= 0 { return 1; } return n - f(n - 1); } return f(10);",
+            "function f(n) { if n <= 0 { return 1; } if n > 5 { return n + f(n - 1); } return n * f(n - 1); } "
+            "return f(10);",
+            "var k = 1; function f(n) { if n <= 0 { return 0; } return k + f(n - 1); } k = 2; return f(10);"]:
+            self.assertEqual(_compile(text), introduce_accumulators(_compile(text)))
+
+    def test_results(self):
+        for name in ["fact7", "sum_from_1_to_n"]:
+            with open('resources/%s.mas' % name) as file:
+                text = file.read()
+            self.assertEqual(_run(_compile(text)), _run(introduce_accumulators(_compile(text))))
+        for expected, text in [
+            (wrap_i32(2 ** 40), "function p(n) { if n == 0 { return 1; } return 2 * p(n - 1) * 2; } return p(20);"),
+            (31, "function f(a, b) { if a == 0 { return b; } return a * 2 + f(a - 1, a); } return f(5, 0);"),
+            (12, "function f(n, m) { if n == 0 { return m; } if n > 2 { return f(n - 1, m + 1); } "
+                 "return n * f(n - 1, m); } return f(5, 3);"),
+            (20, "function f(n) { if n == 3 { var t = 5; } if n < 1 { return t; } return (n + t) + f(n - 1); } "
+                 "return f(5);")]:
+            self.assertEqual(expected, _run(_compile(text)))
+            self.assertEqual(expected, _run(introduce_accumulators(_compile(text))))
+
+    def test_deep_recursion(self):
+        text = self.SUM % 1000000
+        with self.assertRaises(wasmtime.Trap):
+            _run_native(_compile(text))
+        self.assertEqual(wrap_i32(1000000 * 1000001 // 2), _run_native(introduce_accumulators(_compile(text))))
+
+
+class MemoizationTest(unittest.TestCase):
+    FIB = "function fib(n) { if n < 2 { return n; } return fib(n - 1) + fib(n - 2); } return fib(%d);"
+
+    def test_purity(self):
+        script_ir = mark_pure_subroutines(_compile(
+            "var g = 1; "
+            "function square(x) { return x * x; } "
+            "function reads(x) { return x + g; } "
+            "procedure writes(x) { g = x; } "
+            "function callsImpure(x) { return reads(x) + square(x); } "
+            "function cube(x) { return square(x) * x; } "
+            "function fact(n) { if n == 0 { return 1; } return n * fact(n - 1); } "
+            "return 0;"))
+        self.assertEqual([True, False, False, False, True, True],
+                         [subroutine.is_pure for subroutine in script_ir.subroutines])
+
+    def test_only_pure_recursive_functions_are_memoized(self):
+        text = "var g = 1; function square(x) { return x * x; } " \
+               "function f(n) { if n < 2 { return g; } return f(n - 1) + f(n - 2); } return square(3) + f(5);"
+        self.assertEqual(_compile(text), memoize_pure_functions(_compile(text)))
+        script_ir = memoize_pure_functions(_compile(self.FIB % 10))
+        self.assertEqual(1, len(script_ir.tables))
+        self.assertTrue(any(isinstance(node, TableLoadIR) for node in walk_ir(script_ir.subroutines)))
+
+    def test_results(self):
+        for expected, text in [
+            (610, self.FIB % 15),
+            (252, "function c(n, k) { if k == 0 | k == n { return 1; } return c(n - 1, k - 1) + c(n - 1, k); } "
+                  "return c(10, 5);"),
+            (-55, "function f(n, acc) { if n == 0 { return acc; } return f(n - 1, acc - n); } return f(10, 0);"),
+            (143, "function cube(x) { return x * x * x; } "
+                  "function f(n) { if n < 2 { return cube(n); } return f(n - 1) + f(n - 2) + 1; } return f(10);")]:
+            self.assertEqual(expected, _run(memoize_pure_functions(_compile(text))))
+            self.assertEqual(expected, _run(memoize_pure_functions(optimize_script(_compile(text)))))
+
+    def test_exponential_recursion(self):
+        self.assertEqual(wrap_i32(12586269025), _run_native(memoize_pure_functions(_compile(self.FIB % 50))))
+
+
+class InliningTest(unittest.TestCase):
+    def test_small_calls_are_inlined(self):
+        with open('resources/count_intersections.mas') as file:
+            script_ir = inline_subroutines(_compile(file.read()))
+        self.assertFalse(any(isinstance(node, CallIR) for node in walk_ir(script_ir.statements)))
+
+    def test_recursive_subroutines_are_kept(self):
+        with open('resources/sum_from_1_to_n.mas') as file:
+            text = file.read()
+        self.assertEqual(_compile(text), inline_subroutines(_compile(text)))
+
+    def test_results(self):
+        for expected, text in [
+            (6, "var g = 1; function set(x) { g = x; return 0; } return g + set(5) + g;"),
+            (2, "var g = 1; function bump() { g = g + 1; return g; } function twice(x) { return x + x; } "
+                "var r = twice(bump()) - g - g; return r + g;"),
+            (7, "var g = 0; procedure put(x) { if x < 0 { return; } g = x; } put(-1); put(7); put(-2); return g;"),
+            (-6, "function sign(x) { if x < 0 { return -1; } if x > 0 { return 1; } return 0; } "
+                 "function clamp(x) { x = x * sign(x); if x > 10 { return 10; } return x; } "
+                 "return clamp(-3) - clamp(-30) + sign(-5) * 0 + sign(0) + sign(3);"),
+            (-5, "function get() { return 5; } function neg(x) { return -x; } var a = 1; "
+                 "function f(p) { var b = neg(get()); return b; } return f(a);"),
+            (13, "var g = 0; function f(x) { g = g + x; return g; } return f(1) * 10 + f(2);")]:
+            self.assertEqual(expected, _run(_compile(text)))
+            self.assertEqual(expected, _run(inline_subroutines(_compile(text))))
+            self.assertEqual(expected, _run(optimize_script(_compile(text))))
+
+    def test_branch_locals_in_loops(self):
+        text = "function h(x) { if x > 2 { var t = 7; } return t + x; } " \
+               "function k(n, acc) { if n < 1 { return acc; } return k(n - 1, acc + h(n)); } return k(5, 0);"
+        self.assertEqual(36, _run(_compile(text)))
+        self.assertEqual(36, _run(optimize_script(_compile(text), [eliminate_tail_calls, inline_subroutines])))
+
+
+class SpecializationTest(unittest.TestCase):
+    POWER = "function power(b, n) { if n == 0 { return 1; } return b * power(b, n - 1); } " \
+            "return power(2, 10) + power(3, 4) + power(2, 5);"
+
+    def test_calls_are_retargeted(self):
+        script_ir = specialize_constant_arguments(_compile(self.POWER))
+        self.assertEqual(3, len(script_ir.subroutines))
+        two, three = script_ir.subroutines[1:]
+        self.assertEqual(1, len(two.parameters))
+        calls = [node for node in walk_ir(script_ir.statements) if isinstance(node, CallIR)]
+        self.assertEqual([two, three, two], [call.subroutine.declaration for call in calls])
+        self.assertEqual([1, 1, 1], [len(call.args) for call in calls])
+        recursive_calls = [node for node in walk_ir(two.statements) if isinstance(node, CallIR)]
+        self.assertIs(two, recursive_calls[0].subroutine.declaration)
+
+    def test_budget(self):
+        calls = " + ".join("f(%d, 1)" % value for value in range(MAX_SPECIALIZATIONS_PER_SUBROUTINE + 3))
+        script_ir = specialize_constant_arguments(_compile("function f(a, b) { return a * b; } return %s;" % calls))
+        self.assertEqual(1 + MAX_SPECIALIZATIONS_PER_SUBROUTINE, len(script_ir.subroutines))
+
+    def test_results(self):
+        for expected, text in [
+            (1137, self.POWER),
+            (24, "function f(a, b) { a = a + b; return a * 2; } function g(x) { return f(x, 3) + f(4, x); } "
+                 "return g(1) + f(1, 2);")]:
+            self.assertEqual(expected, _run(_compile(text)))
+            self.assertEqual(expected, _run(specialize_constant_arguments(_compile(text))))
+            self.assertEqual(expected, _run(optimize_script(_compile(text))))
+
+
+class PartialEvaluationTest(unittest.TestCase):
+    def test_closed_scripts_become_constants(self):
+        for name in ["count_intersections", "fact7", "number_of_roots", "simplest", "sum_from_1_to_n"]:
+            with open('resources/%s.mas' % name) as file:
+                text = file.read()
+            script_ir = evaluate_partially(_compile(text))
+            self.assertEqual([ReturnStatementIR(IntegerIR(_run(_compile(text))))], script_ir.statements)
+
+    def test_step_budget(self):
+        text = "var a = 2 + 3; function fib(n) { if n < 2 { return n; } return fib(n - 1) + fib(n - 2); } " \
+               "var b = a * 2; var c = fib(20); return c + a + b;"
+        script_ir = evaluate_partially(_compile(text), max_steps=1000)
+        self.assertEqual([IntegerIR(5), IntegerIR(10)],
+                         [statement.init_value for statement in script_ir.statements[:2]])
+        self.assertIsInstance(script_ir.statements[2].init_value, CallIR)
+        self.assertEqual(_run_native(_compile(text)), _run_native(script_ir))
+
+    def test_depth_budget_rolls_back_statement(self):
+        text = "var g = 0; procedure work(n) { g = g + 1; if n > 0 { work(n - 1); } } work(10); work(500); return g;"
+        script_ir = evaluate_partially(_compile(text), max_depth=50)
+        self.assertEqual(IntegerIR(11), script_ir.statements[0].init_value)
+        self.assertEqual(3, len(script_ir.statements))
+        self.assertEqual(_run_native(_compile(text)), _run_native(script_ir))
+
+    def test_loops_and_tables(self):
+        text = "function fib(n) { if n < 2 { return n; } return fib(n - 1) + fib(n - 2); } " \
+               "function sum(n) { if n <= 0 { return 0; } return n + sum(n - 1); } return fib(40) + sum(1000);"
+        script_ir = evaluate_partially(memoize_pure_functions(introduce_accumulators(_compile(text))))
+        self.assertEqual([ReturnStatementIR(IntegerIR(102334155 + 1000 * 1001 // 2))],
+                         script_ir.statements)
+
+
+class StrengthReductionTest(unittest.TestCase):
+    def _reduced_return(self, expression):
+        script_ir = reduce_strength(fold_constants(_compile("function g() { return 3; } function f(x) { return %s; } "
+                                                            "return f(1);" % expression)))
+        return script_ir.subroutines[1].statements[0].return_value
+
+    def test_rewrites(self):
+        parameter = ParameterDeclarationIR(0)
+
+        def x():
+            return VariableReferenceIR(parameter)
+
+        for expected, expression in [
+            (BinaryOperationIR(x(), IntegerIR(3), BinaryOperatorKind.SHL), "x * 8"),
+            (BinaryOperationIR(x(), IntegerIR(1), BinaryOperatorKind.SHL), "2 * x"),
+            (IntegerIR(0), "x * 0"),
+            (x(), "x * 1"),
+            (UnaryOperationIR(x(), UnaryOperatorKind.MINUS), "x * -1"),
+            (UnaryOperationIR(BinaryOperationIR(x(), IntegerIR(2), BinaryOperatorKind.SHL), UnaryOperatorKind.MINUS),
+             "x * -4"),
+            (BinaryOperationIR(BinaryOperationIR(x(), IntegerIR(2), BinaryOperatorKind.SHL), x(),
+                               BinaryOperatorKind.PLUS), "x * 5"),
+            (BinaryOperationIR(BinaryOperationIR(x(), IntegerIR(3), BinaryOperatorKind.SHL), x(),
+                               BinaryOperatorKind.MINUS), "7 * x")]:
+            self.assertEqual(expected, self._reduced_return(expression))
+
+    def test_kept_multiplications(self):
+        for expression in ["g() * 0", "g() * 5", "x * 33", "x * 6", "x * x"]:
+            self.assertEqual(BinaryOperatorKind.MUL, self._reduced_return(expression).kind)
+
+    def test_results(self):
+        text = "function f(x) { return x * 8 + x * -4 + 7 * x + x * 0 + x * 1 + x * -1 + x * 65536 + x * 3 " \
+               "+ x * -2147483648 + x * 1073741824; } return %s;"
+        for call in ["f(1)", "f(-7)", "f(123456789)", "f(-2147483648)", "f(2147483647)"]:
+            self.assertEqual(_run(_compile(text % call)), _run(reduce_strength(_compile(text % call))))
+            self.assertEqual(_run(_compile(text % call)), _run(fold_constants(reduce_strength(_compile(text % call)))))
+
+
+class AlgebraicSimplificationTest(unittest.TestCase):
+    def _simplified(self, statement):
+        script_ir = simplify_algebraically(fold_constants(_compile("function g() { return 3; } "
+                                                                   "function f(x, y) { %s return 0; } return f(1, 2);"
+                                                                   % statement)))
+        return script_ir.subroutines[1].statements[0]
+
+    def _simplified_return(self, expression):
+        return self._simplified("return %s;" % expression).return_value
+
+    def _simplified_condition(self, expression):
+        return self._simplified("if (%s) { return 1; }" % expression).condition
+
+    def test_rewrites(self):
+        first = ParameterDeclarationIR(0)
+        second = ParameterDeclarationIR(1)
+
+        def x():
+            return VariableReferenceIR(first)
+
+        def y():
+            return VariableReferenceIR(second)
+
+        for expected, expression in [
+            (x(), "x + 0"),
+            (x(), "0 + x"),
+            (x(), "x - 0"),
+            (UnaryOperationIR(x(), UnaryOperatorKind.MINUS), "0 - x"),
+            (x(), "1 * x"),
+            (IntegerIR(0), "x * 0"),
+            (IntegerIR(0), "x - x"),
+            (x(), "-(-x)"),
+            (BinaryOperationIR(x(), y(), BinaryOperatorKind.PLUS), "x - -y"),
+            (BinaryOperationIR(x(), y(), BinaryOperatorKind.MINUS), "x + -y")]:
+            self.assertEqual(expected, self._simplified_return(expression))
+
+    def test_boolean_rewrites(self):
+        first = ParameterDeclarationIR(0)
+        second = ParameterDeclarationIR(1)
+
+        def x():
+            return VariableReferenceIR(first)
+
+        def y():
+            return VariableReferenceIR(second)
+
+        for expected, expression in [
+            (IntegerIR(1), "x == x"),
+            (BinaryOperationIR(x(), y(), BinaryOperatorKind.LESS), "x < y & x < y"),
+            (BinaryOperationIR(x(), y(), BinaryOperatorKind.GEQ), "!(x < y)"),
+            (BinaryOperationIR(x(), y(), BinaryOperatorKind.LESS), "!(!(x < y))"),
+            (BinaryOperationIR(x(), y(), BinaryOperatorKind.EQ), "!(!(x == y))"),
+            (BinaryOperationIR(BinaryOperationIR(x(), y(), BinaryOperatorKind.GREATER),
+                               BinaryOperationIR(y(), IntegerIR(0), BinaryOperatorKind.LEQ), BinaryOperatorKind.OR),
+             "!(x <= y & y > 0)"),
+            (BinaryOperationIR(BinaryOperationIR(x(), y(), BinaryOperatorKind.EQ),
+                               BinaryOperationIR(y(), IntegerIR(0), BinaryOperatorKind.EQ), BinaryOperatorKind.AND),
+             "!(x == y) | (!(y == 0))"),
+            (BinaryOperationIR(x(), IntegerIR(7), BinaryOperatorKind.EQ), "x == x & x == 7"),
+            (IntegerIR(1), "x == 7 | 1 == 1")]:
+            self.assertEqual(expected, self._simplified_condition(expression))
+
+    def test_kept_expressions(self):
+        for expression in ["g() * 0", "g() - g()", "x * y"]:
+            self.assertIsInstance(self._simplified_return(expression), BinaryOperationIR)
+        self.assertEqual(BinaryOperatorKind.EQ, self._simplified_condition("g() == g()").kind)
+        self.assertEqual(BinaryOperatorKind.OR, self._simplified_condition("g() == 3 | 1 == 1").kind)
+
+    def test_integer_operands(self):
+        parameter = ParameterDeclarationIR(0)
+        for expected, value in [
+            (VariableReferenceIR(parameter), BinaryOperationIR(VariableReferenceIR(parameter), IntegerIR(-1),
+                                                               BinaryOperatorKind.AND)),
+            (IntegerIR(-1), BinaryOperationIR(VariableReferenceIR(parameter), IntegerIR(-1), BinaryOperatorKind.OR)),
+            (UnaryOperationIR(UnaryOperationIR(VariableReferenceIR(parameter), UnaryOperatorKind.NOT),
+                              UnaryOperatorKind.NOT),
+             UnaryOperationIR(UnaryOperationIR(VariableReferenceIR(parameter), UnaryOperatorKind.NOT),
+                              UnaryOperatorKind.NOT))]:
+            subroutine = SubroutineDeclarationIR(SubroutineKind.FUNCTION, [parameter], [ReturnStatementIR(value)], 0,
+                                                 0)
+            script_ir = simplify_algebraically(ScriptIR([subroutine], [], 0))
+            self.assertEqual(expected, script_ir.subroutines[0].statements[0].return_value)
+
+    def test_branch_swap(self):
+        statement = self._simplified("if (!(x == y)) { return 1; } else { return 2; }")
+        self.assertEqual(BinaryOperatorKind.EQ, statement.condition.kind)
+        self.assertEqual(IntegerIR(2), statement.then_block[0].return_value)
+        statement = self._simplified("if (!(x == y)) { return 1; }")
+        self.assertEqual(BinaryOperatorKind.EQ, statement.condition.kind)
+        self.assertEqual([], statement.then_block)
+
+    def test_results(self):
+        text = "function f(x, y) { var r = 0; r = (x + 0) * 1 - (y - y) + -(-x) - -y + x * 0; " \
+               "if (!(x == y)) { r = r + 1; } if (!(x < y)) { r = r + 2; } else { r = r - 2; } " \
+               "if (!(!(x >= y))) { r = r + 4; } if (!(x <= y & y > 0)) { r = r + 8; } " \
+               "if (!(x == y) | (!(y == 0))) { r = r + 16; } if (!(x == 1) & (!(y == 1))) { r = r + 32; } " \
+               "if (x == x & (!(!(y == 2)))) { r = r + 64; } return r; } return %s;"
+        for call in ["f(0, 0)", "f(1, 2)", "f(2, 1)", "f(-5, 0)", "f(3, 3)", "f(2147483647, -2147483648)"]:
+            self.assertEqual(_run(_compile(text % call)), _run(simplify_algebraically(_compile(text % call))))
+            self.assertEqual(_run(_compile(text % call)),
+                             _run(simplify_algebraically(fold_constants(_compile(text % call)))))
+
+
+class DeadCodeEliminationTest(unittest.TestCase):
+    def test_statements_after_return(self):
+        script_ir = _compile("function f(x) { return x; x = 2; return 3; } return f(1); return 2;")
+        self.assertEqual(1, len(script_ir.subroutines[0].statements))
+        self.assertEqual(1, len(script_ir.statements))
+
+    def test_statements_after_exhaustive_if(self):
+        script_ir = _compile("function f(x) { if (x > 0) { return 1; } else { return 2; } x = 3; return x; } "
+                             "return f(1);")
+        self.assertEqual(1, len(script_ir.subroutines[0].statements))
+
+    def test_constant_branches(self):
+        script_ir = eliminate_dead_code(fold_constants(_compile(
+            "function f(x) { if (1 > 2) { x = 5; } if (2 > 1) { x = x + 1; } else { return 9; } "
+            "if (1 == 2) { return 7; } else { return x; } x = 4; return x; } return f(1);")))
+        statements = script_ir.subroutines[0].statements
+        self.assertEqual([AssignStatementIR, ReturnStatementIR], [type(statement) for statement in statements])
+
+    def test_empty_branches(self):
+        script_ir = eliminate_dead_code(_compile("var g = 0; procedure p() { g = 1; } function f(x) { "
+                                                 "if (x > 0) { if (x > 1) { return 2; } return 3; return 4; } "
+                                                 "return 1; } p(); return f(g);"))
+        self.assertEqual(2, len(script_ir.subroutines[1].statements))
+        script_ir.subroutines[1].statements[0].then_block = []
+        eliminate_dead_code(script_ir)
+        self.assertEqual([ReturnStatementIR], [type(statement) for statement in script_ir.subroutines[1].statements])
+
+    def test_referenced_declarations_are_kept(self):
+        text = "function f(x) { if 1 > 2 { var a = 1; } return a + x; } return f(3);"
+        script_ir = eliminate_dead_code(fold_constants(_compile(text)))
+        self.assertEqual([LocalVariableDeclarationIR, ReturnStatementIR],
+                         [type(statement) for statement in script_ir.subroutines[0].statements])
+        self.assertEqual(IntegerIR(0), script_ir.subroutines[0].statements[0].init_value)
+        self.assertEqual(3, _run(script_ir))
+        self.assertEqual(3, _run(optimize_script(_compile(text))))
+
+    def test_blocks(self):
+        parameter = ParameterDeclarationIR(0)
+        kept = BlockStatementIR(0, [])
+        kept.body = [IfStatementIR(VariableReferenceIR(parameter), [BreakStatementIR(kept)], None),
+                     AssignStatementIR(VariableReferenceIR(parameter), IntegerIR(1))]
+        spliced = BlockStatementIR(1, [AssignStatementIR(VariableReferenceIR(parameter), IntegerIR(2))])
+        subroutine = SubroutineDeclarationIR(SubroutineKind.FUNCTION, [parameter],
+                                             [kept, spliced, ReturnStatementIR(VariableReferenceIR(parameter)),
+                                              ReturnStatementIR(IntegerIR(0))], 0, 0)
+        script_ir = eliminate_dead_code(ScriptIR([subroutine], [], 0))
+        self.assertEqual([BlockStatementIR, AssignStatementIR, ReturnStatementIR],
+                         [type(statement) for statement in script_ir.subroutines[0].statements])
+
+    def test_results(self):
+        text = "var g = 0; function sign(x) { if x > 0 { return 1; } else { if x == 0 { return 0; } " \
+               "else { return -1; } } g = 5; return g; } function f(x) { if 1 > 2 { return 100; } " \
+               "return sign(x) * 10; return 7; } return f(-3) + f(5) * 2 + sign(%s) + g;"
+        for value in ["7", "0", "-7"]:
+            self.assertEqual(_run(_compile(text % value)), _run(optimize_script(_compile(text % value))))
+
+
+class OptimizedExecutionTest(unittest.TestCase):
+    def test_resources(self):
+        for name in ["count_intersections", "fact7", "number_of_roots", "simplest", "sum_from_1_to_n"]:
+            with open('resources/%s.mas' % name) as file:
+                text = file.read()
+            self.assertEqual(_run(_compile(text)), _run(optimize_script(_compile(text))))
+
+    def test_overflow(self):
+        text = "function f(x) { return x * 65536 + 2147483647; } return f(65536) - (2147483647 + 1) * 3;"
+        self.assertEqual(_run(_compile(text)), _run(optimize_script(_compile(text))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,14 @@
+import io
+import random
 import unittest
 
+from generators.words_generator import generate_random_word
+from grammar.mathscript_grammar import script
 from parsing.Parser import *
+from parsing.IterativeParser import parse_script as iterative_parse_script
+from parsing.TokenStream import TokenStream, words_to_tokens
 from parsing.Tokenizer import Location as TokenLocation
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
 
 
 class TestBases:
@@ -211,6 +218,69 @@ class ComplexExpressionParsingTest(TestBases.SuccessfulParsingTestBase):
                                Location(1, 1, 1, 30))
 
 
+class AllPrecedenceLevelsExpressionTest(TestBases.SuccessfulParsingTestBase):
+    def _get_input(self):
+        return "a|b&c<d+e*-f-g"
+
+    def _get_expected(self):
+        return BinaryOperation(
+            BinaryOperatorKind.OR,
+            Identifier("a", Location(1, 1, 1, 1)),
+            BinaryOperation(
+                BinaryOperatorKind.AND,
+                Identifier("b", Location(1, 3, 1, 3)),
+                BinaryOperation(
+                    BinaryOperatorKind.LESS,
+                    Identifier("c", Location(1, 5, 1, 5)),
+                    BinaryOperation(
+                        BinaryOperatorKind.MINUS,
+                        BinaryOperation(
+                            BinaryOperatorKind.PLUS,
+                            Identifier("d", Location(1, 7, 1, 7)),
+                            BinaryOperation(BinaryOperatorKind.MUL,
+                                            Identifier("e", Location(1, 9, 1, 9)),
+                                            UnaryOperation(UnaryOperatorKind.MINUS,
+                                                           Identifier("f", Location(1, 12, 1, 12)),
+                                                           Location(1, 11, 1, 12)),
+                                            Location(1, 9, 1, 12)),
+                            Location(1, 7, 1, 12)),
+                        Identifier("g", Location(1, 14, 1, 14)),
+                        Location(1, 7, 1, 14)),
+                    Location(1, 5, 1, 14)),
+                Location(1, 3, 1, 14)),
+            Location(1, 1, 1, 14))
+
+    def _get_rule(self):
+        return parse_expr
+
+
+class LeftAssociativeComparisonTest(TestBases.SuccessfulParsingTestBase):
+    def _get_input(self):
+        return "1<2==3"
+
+    def _get_expected(self):
+        return BinaryOperation(BinaryOperatorKind.EQ,
+                               BinaryOperation(BinaryOperatorKind.LESS,
+                                               Integer(1, Location(1, 1, 1, 1)),
+                                               Integer(2, Location(1, 3, 1, 3)),
+                                               Location(1, 1, 1, 3)),
+                               Integer(3, Location(1, 6, 1, 6)),
+                               Location(1, 1, 1, 6))
+
+    def _get_rule(self):
+        return parse_expr
+
+
+class LongExpressionParsingTest(unittest.TestCase):
+    def test_parsing(self):
+        tokenizer = Tokenizer(" + ".join(["x * 2"] * 5000))
+        tokenizer.advance()
+        expr = parse_expr(tokenizer)
+        self.assertEqual(BinaryOperatorKind.PLUS, expr.kind)
+        self.assertEqual(BinaryOperatorKind.MUL, expr.right_operand.kind)
+        self.assertEqual((1, 1), expr.location.start_position())
+
+
 class SimplestAssignParsingTest(TestBases.SuccessfulParsingTestBase):
     def _get_input(self):
         return "x = f(y);"
@@ -632,7 +702,8 @@ class IllegalInnerFunction(TestBases.FailedParsingTestBase):
         return parse_subroutine
 
     def _get_expected_exception(self):
-        return ParserException(Token("function", "function", TokenLocation(1, 15, 22)), ["return", "if", "IDENT"])
+        return ParserException(Token("function", "function", TokenLocation(1, 15, 22)),
+                               ["return", "if", "IDENT", "var"])
 
 
 class MissingRightOperandTest(TestBases.FailedParsingTestBase):
@@ -644,3 +715,148 @@ class MissingRightOperandTest(TestBases.FailedParsingTestBase):
 
     def _get_expected_exception(self):
         return ParserException(Token(")", ")", TokenLocation(1, 5, 5)), ["(", "IDENT", "INT"])
+
+
+class BufferedTokenizerParsingTest(unittest.TestCase):
+    def test_parsing(self):
+        with open('resources/fact7.mas') as file:
+            text = file.read()
+        tokenizer = Tokenizer(text)
+        tokenizer.advance()
+        buffered_tokenizer = BufferedTokenizer(tokenize(text))
+        buffered_tokenizer.advance()
+        self.assertEqual(parse_script(tokenizer), parse_script(buffered_tokenizer))
+
+    def test_no_tokens_built(self):
+        class CountingTokenizer(BufferedTokenizer):
+            built = 0
+
+            def current(self):
+                CountingTokenizer.built += 1
+                return super(CountingTokenizer, self).current()
+
+        with open('resources/fact7.mas') as file:
+            text = file.read()
+        tokenizer = Tokenizer(text)
+        tokenizer.advance()
+        expected = parse_script(tokenizer)
+        for parse in [parse_script, iterative_parse_script]:
+            buffered_tokenizer = CountingTokenizer(tokenize(text))
+            buffered_tokenizer.advance()
+            self.assertEqual(expected, parse(buffered_tokenizer))
+        self.assertEqual(0, CountingTokenizer.built)
+
+
+class NoLocationsParsingTest(unittest.TestCase):
+    def test_parsing(self):
+        tokenizer = Tokenizer("function f(x) { return -(x + 1) * 2; } f(1);", locations=False)
+        tokenizer.advance()
+        script = parse_script(tokenizer)
+        self.assertIsNone(script.end_location)
+        self.assertIsNone(script.body[0].location)
+        self.assertIsNone(script.body[0].body.statements[0].return_value.location)
+
+    def test_exception(self):
+        tokenizer = Tokenizer("return 1", locations=False)
+        tokenizer.advance()
+        with self.assertRaises(ParserException) as cm:
+            parse_return(tokenizer)
+        self.assertEqual("Unexpected token '\0' at unknown location. I was expecting ';'", str(cm.exception))
+
+
+class LazySubroutineParsingTest(unittest.TestCase):
+    def _tokenizers(self, text):
+        yield Tokenizer(text)
+        yield StreamTokenizer(io.StringIO(text), chunk_size=7)
+        yield BufferedTokenizer(tokenize(text))
+
+    def test_same_ast(self):
+        with open('resources/fact7.mas') as file:
+            text = file.read()
+        tokenizer = Tokenizer(text)
+        tokenizer.advance()
+        expected = parse_script(tokenizer)
+        for tokenizer in self._tokenizers(text):
+            tokenizer.advance()
+            script = parse_script(tokenizer, lazy_bodies=True)
+            self.assertFalse(script.body[3].body_parsed)
+            self.assertEqual(expected.body[3].location, script.body[3].location)
+            self.assertEqual(expected, script)
+            self.assertTrue(script.body[3].body_parsed)
+
+    def test_body_errors_are_deferred(self):
+        text = "function f() { if x { return 1 } } function g() { return 2; } return g();"
+        for tokenizer in self._tokenizers(text):
+            tokenizer.advance()
+            script = parse_script(tokenizer, lazy_bodies=True)
+            self.assertEqual("g", script.body[1].name.name)
+            with self.assertRaises(ParserException) as cm:
+                _ = script.body[0].body
+            self.assertEqual(Token("}", "}", TokenLocation(1, 32, 32)), cm.exception.bad_token)
+
+    def test_unmatched_brace(self):
+        for tokenizer in self._tokenizers("function f() { return 1; "):
+            tokenizer.advance()
+            with self.assertRaises(ParserException) as cm:
+                parse_script(tokenizer, lazy_bodies=True)
+            self.assertEqual("EOF", cm.exception.bad_token.type)
+
+
+class CompactAstTest(unittest.TestCase):
+    def test_slots(self):
+        tokenizer = BufferedTokenizer(tokenize("f(x + 1)"))
+        tokenizer.advance()
+        call = parse_expr(tokenizer)
+        for node in [call, call.subroutine, call.arguments, call.arguments.arguments[0], call.location]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_location_round_trip(self):
+        tokenizer = BufferedTokenizer(tokenize("x +\n (y)"))
+        tokenizer.advance()
+        expr = parse_expr(tokenizer)
+        self.assertEqual(Location(1, 1, 2, 4), expr.location)
+        self.assertEqual(Location(2, 2, 2, 4), expr.right_operand.location)
+        expr.location = Location(3, 1, 3, 2)
+        self.assertEqual(Location(3, 1, 3, 2), expr.location)
+        expr.location = None
+        self.assertIsNone(expr.location)
+
+
+class TokenStreamParsingTest(unittest.TestCase):
+    def test_generated_words(self):
+        generator_state = random.getstate()
+        random.seed(17)
+        try:
+            words_list = [generate_random_word(script, 0) for _ in range(200)]
+        finally:
+            random.setstate(generator_state)
+        for words in words_list:
+            tokenizer = Tokenizer(" ".join(map(str, words)), locations=False)
+            tokenizer.advance()
+            stream = TokenStream(words_to_tokens(words))
+            stream.advance()
+            try:
+                expected = parse_script(tokenizer)
+            except ParserException as exception:
+                with self.assertRaises(ParserException) as cm:
+                    parse_script(stream)
+                self.assertEqual(exception.bad_token, cm.exception.bad_token)
+                continue
+            self.assertEqual(expected, parse_script(stream))
+
+    def test_tokens(self):
+        stream = TokenStream([Token("return", "return", None), Token("IDENT", "x", None), Token("*", "*", None),
+                              Token("INT", 2, None), Token(";", ";", None)])
+        stream.advance()
+        script = parse_script(stream, lazy_bodies=True)
+        self.assertEqual(BinaryOperatorKind.MUL, script.body[0].return_value.kind)
+        self.assertIsNone(script.end_location)
+
+    def test_errors(self):
+        stream = TokenStream(words_to_tokens(["x", "=", "1"]))
+        stream.advance()
+        with self.assertRaises(ParserException) as cm:
+            parse_statement(stream)
+        self.assertEqual("EOF", cm.exception.bad_token.type)
+        with self.assertRaises(UnexpectedCharException):
+            list(words_to_tokens(["x#"]))
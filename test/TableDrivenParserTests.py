@@ -0,0 +1,68 @@
+import unittest
+
+from generators.parse_table_generator import build_parse_table, GrammarException
+from grammar.grammar_nodes import *
+from parsing import Parser, TableDrivenParser, GeneratedParser
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
+
+
+def _parse(module, rule, text):
+    tokenizer = BufferedTokenizer(tokenize(text))
+    tokenizer.advance()
+    return getattr(module, rule)(tokenizer)
+
+
+class ParseTableGeneratorTest(unittest.TestCase):
+    def test_first_and_follow(self):
+        number = NamedTerminal("INT")
+        term = NonTerminal("term")
+        expr = NonTerminal("expr")
+        term.rule = Or([number, Concat([Literal("("), expr, Literal(")")])])
+        expr.rule = Concat([term, Star(Concat([Literal("+"), term]))])
+        parse_table = build_parse_table(expr)
+        self.assertEqual({"INT", "("}, parse_table.first[parse_table.nonterminals["expr"]])
+        self.assertEqual({"EOF", ")"}, parse_table.follow[parse_table.nonterminals["expr"]])
+        self.assertEqual({"EOF", ")", "+"}, parse_table.follow[parse_table.nonterminals["term"]])
+
+    def test_conflict(self):
+        ident = NamedTerminal("IDENT")
+        statement = NonTerminal("statement")
+        statement.rule = Or([Concat([ident, Literal("=")]), Concat([ident, Literal("(")])])
+        with self.assertRaises(GrammarException):
+            build_parse_table(statement)
+
+    def test_mathscript_grammar_is_ll1(self):
+        parse_table = TableDrivenParser.PARSE_TABLE
+        self.assertEqual({"function", "procedure", "return", "IDENT", "if", "var"},
+                         parse_table.first[parse_table.nonterminals["scriptElement"]])
+
+
+class SameAstTest(unittest.TestCase):
+    def test_scripts(self):
+        for name in ["count_intersections", "fact7", "number_of_roots", "simplest", "sum_from_1_to_n"]:
+            with open('resources/%s.mas' % name) as file:
+                text = file.read()
+            for module in [TableDrivenParser, GeneratedParser]:
+                self.assertEqual(_parse(Parser, "parse_script", text), _parse(module, "parse_script", text))
+
+    def test_expressions(self):
+        for text in ["2*(1+3)", "a|b&c<d+e*-f-g", "1<2==3", "f(x, g(-y), (z))", "!(a) & -b * c", "f()"]:
+            for module in [TableDrivenParser, GeneratedParser]:
+                self.assertEqual(_parse(Parser, "parse_expr", text), _parse(module, "parse_expr", text))
+
+    def test_errors(self):
+        for rule, text in [("parse_expr", "(x>=)"), ("parse_statement", "x == 1;"), ("parse_block", "{ return 1 }"),
+                           ("parse_script", "function f() { function g() {} }"), ("parse_script", "else"),
+                           ("parse_script", "function f( { }"), ("parse_script", "return 1 +;"),
+                           ("parse_script", "function f(a, b { }"), ("parse_script", "f(== ;"),
+                           ("parse_script", "procedure p() { return }"), ("parse_script", "x = -;")]:
+            with self.assertRaises(Parser.ParserException) as expected:
+                _parse(Parser, rule, text)
+            for module in [TableDrivenParser, GeneratedParser]:
+                with self.assertRaises(Parser.ParserException) as actual:
+                    _parse(module, rule, text)
+                self.assertEqual(expected.exception, actual.exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,11 @@
+import io
+import mmap
+import tempfile
 import unittest
 
-from parsing.Tokenizer import Tokenizer, Token, UnexpectedCharException, IllegalRollbackException, Location
+from parsing.Tokenizer import Tokenizer, StreamTokenizer, Token, UnexpectedCharException, IllegalRollbackException, \
+    Location
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
 
 
 class TestBases:
@@ -323,5 +328,126 @@ class SimplestVariableDeclarationTest(TestBases.SuccessfulTokenizingTestBase):
                 Token(";", ";", Location(1, 10, 10))]
 
 
+
+class LongInputTest(TestBases.SuccessfulTokenizingTestBase):
+    def _get_input(self):
+        return "x1 = 2;\n" * 5000 + "\t\treturn 42"
+
+    def _get_expected(self):
+        expected = []
+        for line in range(1, 5001):
+            expected += [Token("IDENT", "x1", Location(line, 1, 2)),
+                         Token("=", "=", Location(line, 4, 4)),
+                         Token("INT", 2, Location(line, 6, 6)),
+                         Token(";", ";", Location(line, 7, 7))]
+        return expected + [Token("return", "return", Location(5001, 9, 14)),
+                           Token("INT", 42, Location(5001, 16, 17))]
+
+
+def _read_all_tokens(tokenizer):
+    tokens = [tokenizer.current()]
+    while tokenizer.current().type != "EOF":
+        tokenizer.advance()
+        tokens.append(tokenizer.current())
+    return tokens
+
+
+class StreamTokenizerTest(unittest.TestCase):
+    TEXT = "function fooBar(a1, b) {\n\tif a1 <= b { return 1024; }\n\treturn -b == 7 >= a1;\n}\n\nfooBar(1, 2);"
+
+    def test_text_stream(self):
+        expected = _read_all_tokens(Tokenizer(self.TEXT))
+        for chunk_size in range(1, 8):
+            self.assertEqual(expected, _read_all_tokens(StreamTokenizer(io.StringIO(self.TEXT), chunk_size)))
+
+    def test_bytes_stream(self):
+        text = "x = 1;\ny = x + 2;"
+        expected = _read_all_tokens(Tokenizer(text))
+        for chunk_size in range(1, 8):
+            self.assertEqual(expected, _read_all_tokens(StreamTokenizer(io.BytesIO(text.encode()), chunk_size)))
+
+    def test_mmap(self):
+        with tempfile.TemporaryFile() as file:
+            file.write(self.TEXT.encode())
+            file.flush()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                self.assertEqual(_read_all_tokens(Tokenizer(self.TEXT)), _read_all_tokens(StreamTokenizer(mapped, 5)))
+
+    def test_exception(self):
+        tokenizer = StreamTokenizer(io.StringIO("a  \n  #"), 2)
+        tokenizer.advance()
+        with self.assertRaises(UnexpectedCharException) as cm:
+            tokenizer.advance()
+        self.assertEqual(UnexpectedCharException('#', 2, 3), cm.exception)
+
+
+class BufferedTokenizerTest(unittest.TestCase):
+    def test_same_tokens(self):
+        text = StreamTokenizerTest.TEXT
+        self.assertEqual(_read_all_tokens(Tokenizer(text)), _read_all_tokens(BufferedTokenizer(tokenize(text))))
+
+    def test_compact_storage(self):
+        buffer = tokenize("a + a + 1 + 1")
+        self.assertEqual(9, len(buffer))
+        self.assertEqual(buffer.values[1], buffer.values[3])
+        self.assertEqual(buffer.values[5], buffer.values[7])
+        self.assertEqual(["SOF", "IDENT", "+", "IDENT", "+", "INT", "+", "INT", "EOF"],
+                         [buffer.type(index) for index in range(len(buffer))])
+        self.assertEqual(5, len(buffer.value_table))
+
+    def test_lookahead_and_rollback(self):
+        tokenizer = BufferedTokenizer(tokenize("if\nelse\n\n0 -10"))
+        self.assertEqual("if", tokenizer.peek())
+        self.assertEqual("INT", tokenizer.peek(3))
+        self.assertEqual("EOF", tokenizer.peek(100))
+        for _ in range(4):
+            tokenizer.advance()
+        self.assertEqual(Token("-", "-", Location(4, 3, 3)), tokenizer.current())
+        tokenizer.rollback(3)
+        self.assertEqual(Token("if", "if", Location(1, 1, 2)), tokenizer.current())
+        tokenizer.seek(5)
+        self.assertEqual(Token("INT", 10, Location(4, 4, 5)), tokenizer.current())
+        tokenizer.advance()
+        self.assertEqual(Token("EOF", "\0", Location(4, 6, 6)), tokenizer.current())
+        with self.assertRaises(EOFError):
+            tokenizer.advance()
+        with self.assertRaises(IllegalRollbackException):
+            tokenizer.rollback(7)
+
+    def test_exception(self):
+        tokenizer = BufferedTokenizer(tokenize("! \t#"))
+        tokenizer.advance()
+        self.assertEqual(Token("!", "!", Location(1, 1, 1)), tokenizer.current())
+        with self.assertRaises(UnexpectedCharException) as cm:
+            tokenizer.advance()
+        self.assertEqual(UnexpectedCharException('#', 1, 7), cm.exception)
+
+
+class NoLocationsTest(unittest.TestCase):
+    def test_tokenization(self):
+        tokenizer = Tokenizer("var x = 1;", locations=False)
+        self.assertIsNone(tokenizer.current().location)
+        for _ in range(6):
+            tokenizer.advance()
+            self.assertIsNone(tokenizer.current().location)
+        self.assertEqual("EOF", tokenizer.current().type)
+
+    def test_exception(self):
+        tokenizer = Tokenizer("x\n #", locations=False)
+        tokenizer.advance()
+        with self.assertRaises(UnexpectedCharException) as cm:
+            tokenizer.advance()
+        self.assertEqual(UnexpectedCharException('#', 2, 2), cm.exception)
+
+
+class OffsetLocationTest(unittest.TestCase):
+    def test_offsets(self):
+        tokenizer = Tokenizer("if\n\tfoo")
+        tokenizer.advance()
+        tokenizer.advance()
+        location = tokenizer.current().location
+        self.assertEqual((4, 6), (location.start, location.end))
+        self.assertEqual(Location(2, 5, 7), location)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from parsing.Tokenizer import Token, Location, UnexpectedCharException
+from parsing.TokenBuffer import tokenize, BufferedTokenizer
+from parsing.VectorizedTokenizer import tokenize_vectorized
+
+
+def _read_all_tokens(tokenizer):
+    tokens = [tokenizer.current()]
+    while tokenizer.current().type != "EOF":
+        tokenizer.advance()
+        tokens.append(tokenizer.current())
+    return tokens
+
+
+class TestBases:
+    class SameTokensTestBase(unittest.TestCase):
+        def _get_input(self):
+            raise NotImplementedError()
+
+        def test_tokenization(self):
+            text = self._get_input()
+            self.assertEqual(_read_all_tokens(BufferedTokenizer(tokenize(text))),
+                             _read_all_tokens(BufferedTokenizer(tokenize_vectorized(text))))
+
+
+class ScriptTest(TestBases.SameTokensTestBase):
+    def _get_input(self):
+        with open('resources/fact7.mas') as file:
+            return file.read()
+
+
+class ComparisonTest(TestBases.SameTokensTestBase):
+    def _get_input(self):
+        return "a < <= = == === ==== >= > <== >== =<= <<=="
+
+
+class IntsTest(TestBases.SameTokensTestBase):
+    def _get_input(self):
+        return "1 10 001 -03 - 2 1x x1 --3 12ab3c4 if1 1if else"
+
+
+class EmptyTest(TestBases.SameTokensTestBase):
+    def _get_input(self):
+        return ""
+
+
+class NonAsciiTest(TestBases.SameTokensTestBase):
+    def _get_input(self):
+        return "x = ٣٤;"
+
+
+class ExceptionTest(unittest.TestCase):
+    def test_tokenization(self):
+        tokenizer = BufferedTokenizer(tokenize_vectorized("foo\n\t<=#="))
+        tokenizer.advance()
+        tokenizer.advance()
+        self.assertEqual(Token("<=", "<=", Location(2, 5, 6)), tokenizer.current())
+        with self.assertRaises(UnexpectedCharException) as cm:
+            tokenizer.advance()
+        self.assertEqual(UnexpectedCharException('#', 2, 7), cm.exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
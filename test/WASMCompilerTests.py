@@ -71,3 +71,19 @@ class CountIntersectionsTest(TestBases.SuccessfulCompilationTestBase):
 
     def _get_expected(self):
         return 3
+
+
+class LocalsAfterParametersTest(TestBases.SuccessfulCompilationTestBase):
+    def _get_input(self):
+        return "function f(x) { var a = 3; if x > 0 { var b = 4; return x + a + b; } return a; } return f(1);"
+
+    def _get_expected(self):
+        return 8
+
+
+class EmptyReturnTest(TestBases.SuccessfulCompilationTestBase):
+    def _get_input(self):
+        return "var x = 1; procedure p() { if x > 0 { return; } x = 2; } p(); return x;"
+
+    def _get_expected(self):
+        return 1